@@ -1 +1,18 @@
 """han package for reading measure stream frm HAN-port of norwegian AMS-meters."""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from han.streaming import stream
+
+__all__ = ["stream"]
+
+
+def __getattr__(name: str) -> Any:
+    # import on first use, to not import the decoders and asyncio when only a submodule is used
+    if name == "stream":
+        from han import streaming  # pylint: disable=import-outside-toplevel
+
+        return streaming.stream
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -35,7 +35,11 @@ Element: construct.Struct = construct.Struct(
             "scaler_unit" / cosem.ScalerUnitField,
             "value"
             / construct.Computed(
-                construct.this.unscaled_value * construct.this.scaler_unit.scaler.scale
+                lambda ctx: ctx.unscaled_value
+                if ctx.unscaled_value == 0 or ctx.scaler_unit.scaler.exponent == 0
+                else cosem.scale_to_float(
+                    ctx.unscaled_value, ctx.scaler_unit.scaler.exponent
+                )
             ),
         ),
     ),
@@ -69,11 +73,7 @@ def _normalize_parsed_items(
             if hasattr(measure.content, "datetime"):
                 dictionary[element_name] = measure.content.datetime
             else:
-                dictionary[element_name] = (
-                    measure.content.unscaled_value
-                    if measure.content.unscaled_value == measure.content.value
-                    else float(measure.content.value)
-                )
+                dictionary[element_name] = measure.content.value
 
     return dictionary
 
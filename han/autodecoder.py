@@ -6,7 +6,7 @@ from typing import cast
 
 import construct  # type: ignore
 
-from han import aidon, dlde, kaifa, kamstrup
+from han import aidon, dlde, generic, kaifa, kamstrup
 from han.common import MeterMessageBase
 
 
@@ -16,6 +16,9 @@ class AutoDecoder:
 
     The class tries all decoders until success or no more decoders.
     The successful decoder is stored and tried as the first decoder next time.
+    The generic DLMS decoders are only tried when all meter specific decoders fail, and are
+    never stored as the successful decoder, as meter specific conventions (like implicit
+    scaling) are not known to them.
     """
 
     payload_decoder_functions = [
@@ -28,9 +31,27 @@ class AutoDecoder:
         ("Kamstrup_notification_body", kamstrup.decode_notification_body),
     ]
 
+    fallback_decoder_functions = [
+        ("Generic_frame", generic.decode_frame_content),
+        ("Generic_notification_body", generic.decode_notification_body),
+    ]
+
     def __init__(self) -> None:
-        """Initialize AutoDecoder."""
+        """
+        Initialize AutoDecoder.
+
+        Use one instance per meter, as decoders may keep meter specific decoding context.
+        """
         self.__previous_success: int | None = None
+        self._kamstrup_context = kamstrup.DecodingContext()
+        context_decoder_functions = {
+            kamstrup.decode_frame_content: self._kamstrup_context.decode_frame_content,
+            kamstrup.decode_notification_body: self._kamstrup_context.decode_notification_body,
+        }
+        self._decoder_functions = [
+            (name, context_decoder_functions.get(decoder, decoder))
+            for name, decoder in AutoDecoder.payload_decoder_functions
+        ]
 
     @property
     def previous_success_decoder(self) -> str | None:
@@ -59,7 +80,7 @@ class AutoDecoder:
             index = (i + previous_success_index) % len(
                 AutoDecoder.payload_decoder_functions
             )
-            _, decoder = AutoDecoder.payload_decoder_functions[index]
+            _, decoder = self._decoder_functions[index]
             try:
                 decoded = decoder(payload)
                 self.__previous_success = index
@@ -67,7 +88,7 @@ class AutoDecoder:
             except (construct.ConstructError, ValueError):
                 pass
 
-        return None
+        return self._decode_fallback(payload)
 
     def decode_message(
         self, message: MeterMessageBase
@@ -89,7 +110,7 @@ class AutoDecoder:
             index = (i + previous_success_index) % len(
                 AutoDecoder.payload_decoder_functions
             )
-            name, decoder = AutoDecoder.payload_decoder_functions[index]
+            name, decoder = self._decoder_functions[index]
             try:
                 decoded = (
                     dlde.decode_p1_readout(cast(dlde.DataReadout, message))
@@ -101,4 +122,17 @@ class AutoDecoder:
             except (construct.ConstructError, ValueError):
                 pass
 
+        if isinstance(message, dlde.DataReadout):
+            return None
+        return self._decode_fallback(message.payload)
+
+    @staticmethod
+    def _decode_fallback(
+        payload: bytes,
+    ) -> dict[str, str | int | float | datetime] | None:
+        for _, decoder in AutoDecoder.fallback_decoder_functions:
+            try:
+                return decoder(payload)
+            except (construct.ConstructError, ValueError):
+                pass
         return None
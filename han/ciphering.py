@@ -0,0 +1,252 @@
+"""
+Use this module to decrypt DLMS general-glo-ciphering APDUs.
+
+The APDUs are protected using AES-GCM with keys specific for each meter. The meter is
+identified by the system title sent in the APDU. This module requires the cryptography package.
+
+The decrypter is a standalone stage: no connection factory, meter reader or AutoDecoder
+decrypts APDUs. Decrypt the payloads (or messages) taken from the queue before decoding them.
+"""
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import Iterable, Mapping
+
+from cryptography.exceptions import InvalidTag  # type: ignore
+from cryptography.hazmat.primitives.ciphers import (  # type: ignore
+    Cipher,
+    algorithms,
+    modes,
+)
+
+from han import cosem
+from han.common import DlmsMessage, MeterMessageBase
+
+_LOGGER = logging.getLogger(__name__)
+
+# general-glo-ciphering APDU tag
+GENERAL_GLO_CIPHERING_TAG: int = 0xDB
+
+# Security control byte bits
+_SECURITY_AUTHENTICATION = 0x10
+_SECURITY_ENCRYPTION = 0x20
+_SECURITY_COMPRESSION = 0x80
+
+_SYSTEM_TITLE_LENGTH = 8
+_INVOCATION_COUNTER_LENGTH = 4
+_AUTHENTICATION_TAG_LENGTH = 12
+
+# Initial counter block of the encrypted data when GCM is used without authentication
+_FIRST_ENCRYPTION_COUNTER = b"\x00\x00\x00\x02"
+
+
+@dataclass(frozen=True)
+class MeterKeys:
+    """Keys of a meter."""
+
+    encryption_key: bytes
+    """Global unicast encryption key (EK)."""
+
+    authentication_key: bytes = b""
+    """Global authentication key (AK). Only needed for authenticated APDUs."""
+
+
+class _PreparedMeterKeys:
+    # pylint: disable=too-few-public-methods
+    """
+    Keys of one meter prepared for decryption.
+
+    Only the AES algorithm object (holding the key) and the additional authenticated data are
+    kept. No cipher context is kept: GCM and CTR decryptor contexts are single use, so a new
+    Cipher and decryptor, including the AES key expansion done by the backend, are created
+    for each APDU.
+    """
+
+    def __init__(self, keys: MeterKeys) -> None:
+        self.keys = keys
+        self._algorithm = algorithms.AES(keys.encryption_key)
+        self._additional_data: dict[int, bytes] = {}
+
+    def _get_additional_data(self, security_control: int) -> bytes:
+        additional_data = self._additional_data.get(security_control)
+        if additional_data is None:
+            additional_data = bytes((security_control,)) + self.keys.authentication_key
+            self._additional_data[security_control] = additional_data
+        return additional_data
+
+    def decrypt(
+        self,
+        security_control: int,
+        initialization_vector: bytes,
+        information: memoryview,
+    ) -> bytes:
+        """
+        Decrypt and/or authenticate information of ciphered APDU.
+
+        :param security_control: security control byte of the APDU.
+        :param initialization_vector: system title followed by invocation counter.
+        :param information: ciphered information, including authentication tag when authenticated.
+        :return: the plain information.
+        :raises ValueError: when the information is too short or authentication fails.
+        """
+        if security_control & _SECURITY_AUTHENTICATION:
+            if len(information) < _AUTHENTICATION_TAG_LENGTH:
+                raise ValueError("Ciphered APDU is too short for authentication tag.")
+            tag = bytes(information[-_AUTHENTICATION_TAG_LENGTH:])
+            data = information[:-_AUTHENTICATION_TAG_LENGTH]
+            decryptor = Cipher(
+                self._algorithm,
+                modes.GCM(
+                    initialization_vector,
+                    tag,
+                    min_tag_length=_AUTHENTICATION_TAG_LENGTH,
+                ),
+            ).decryptor()
+            decryptor.authenticate_additional_data(
+                self._get_additional_data(security_control)
+            )
+            if security_control & _SECURITY_ENCRYPTION:
+                plain = decryptor.update(data)
+            else:
+                # only authenticated: the data is not encrypted, but part of the tag
+                decryptor.authenticate_additional_data(data)
+                plain = bytes(data)
+            try:
+                decryptor.finalize()
+            except InvalidTag as ex:
+                raise ValueError("Authentication tag verification failed.") from ex
+            return plain
+
+        # only encrypted: GCM counter mode without authentication tag
+        ctr_decryptor = Cipher(
+            self._algorithm,
+            modes.CTR(initialization_vector + _FIRST_ENCRYPTION_COUNTER),
+        ).decryptor()
+        return ctr_decryptor.update(information) + ctr_decryptor.finalize()
+
+
+class GeneralGloCipheringDecrypter:
+    """
+    Decrypt general-glo-ciphering APDUs using keys from a key store.
+
+    The key store maps system title to meter keys, and can be updated while in use.
+    The AES algorithm object and additional authenticated data of each meter are prepared when
+    the meter is first seen, and reused until the keys of the meter are changed in the key
+    store. A new single use Cipher and decryptor is created for each APDU.
+
+    This is a standalone stage, and is not used by the connection factories, meter readers
+    or AutoDecoder. Decrypt payloads or messages before decoding them.
+    """
+
+    def __init__(self, key_store: Mapping[bytes, MeterKeys]) -> None:
+        """
+        Initialize GeneralGloCipheringDecrypter.
+
+        :param key_store: meter keys by system title.
+        """
+        self._key_store = key_store
+        self._prepared_keys: dict[bytes, _PreparedMeterKeys] = {}
+
+    def decrypt_apdu(self, apdu: bytes) -> bytes:
+        """
+        Decrypt general-glo-ciphering APDU.
+
+        :param apdu: general-glo-ciphering APDU.
+        :return: the decrypted APDU.
+        :raises ValueError: when not a valid APDU, keys are missing or authentication fails.
+        """
+        return self._decrypt(memoryview(apdu))
+
+    def decrypt_payload(self, payload: bytes) -> bytes:
+        """
+        Decrypt payload if it contains a general-glo-ciphering APDU.
+
+        :param payload: APDU, or LLC PDU (frame content) containing APDU.
+        :return: payload with decrypted APDU (keeping LLC header), or the payload as is when not ciphered.
+        :raises ValueError: when not a valid APDU, keys are missing or authentication fails.
+        """
+        position = (
+            cosem.LLC_HEADER_LENGTH
+            if payload[: cosem.LLC_HEADER_LENGTH] in cosem.LLC_HEADERS
+            else 0
+        )
+        if len(payload) <= position or payload[position] != GENERAL_GLO_CIPHERING_TAG:
+            return payload
+
+        apdu = self._decrypt(memoryview(payload)[position:])
+        return payload[:position] + apdu if position else apdu
+
+    def decrypt_payloads(self, payloads: Iterable[bytes]) -> list[bytes | None]:
+        """
+        Decrypt a batch of payloads, like a backlog of received payloads.
+
+        :param payloads: payloads as accepted by decrypt_payload.
+        :return: decrypted payloads in the same order. None for payloads that could not be decrypted.
+        """
+        decrypted: list[bytes | None] = []
+        for payload in payloads:
+            try:
+                decrypted.append(self.decrypt_payload(payload))
+            except ValueError as ex:
+                _LOGGER.debug("Could not decrypt payload: %s", ex)
+                decrypted.append(None)
+        return decrypted
+
+    def decrypt_message(self, message: MeterMessageBase) -> MeterMessageBase:
+        """
+        Decrypt message payload if it contains a general-glo-ciphering APDU.
+
+        :return: DlmsMessage with decrypted payload, or the message as is when not ciphered.
+        :raises ValueError: when not a valid APDU, keys are missing or authentication fails.
+        """
+        payload = message.payload
+        if not payload:
+            return message
+        decrypted = self.decrypt_payload(payload)
+        return message if decrypted is payload else DlmsMessage(decrypted)
+
+    def _get_prepared_keys(self, system_title: bytes) -> _PreparedMeterKeys:
+        keys = self._key_store.get(system_title)
+        if keys is None:
+            raise ValueError(f"No keys for system title {system_title.hex()}.")
+
+        prepared_keys = self._prepared_keys.get(system_title)
+        if prepared_keys is None or prepared_keys.keys is not keys:
+            prepared_keys = _PreparedMeterKeys(keys)
+            self._prepared_keys[system_title] = prepared_keys
+        return prepared_keys
+
+    def _decrypt(self, apdu: memoryview) -> bytes:
+        if len(apdu) < 2 or apdu[0] != GENERAL_GLO_CIPHERING_TAG:
+            raise ValueError("Not a general-glo-ciphering APDU.")
+
+        system_title_length = apdu[1]
+        if system_title_length != _SYSTEM_TITLE_LENGTH:
+            raise ValueError(f"Invalid system title length {system_title_length}.")
+        system_title = bytes(apdu[2 : 2 + _SYSTEM_TITLE_LENGTH])
+        position = 2 + _SYSTEM_TITLE_LENGTH
+
+        # A-XDR length of security control, invocation counter and information
+        if len(apdu) <= position:
+            raise ValueError("Ciphered APDU is too short.")
+        length, position = cosem.read_axdr_length(apdu, position)
+
+        if position + length != len(apdu) or length < 1 + _INVOCATION_COUNTER_LENGTH:
+            raise ValueError("Ciphered APDU length does not match length field.")
+
+        security_control = apdu[position]
+        if not security_control & (_SECURITY_AUTHENTICATION | _SECURITY_ENCRYPTION):
+            raise ValueError("Ciphered APDU is neither authenticated nor encrypted.")
+        if security_control & _SECURITY_COMPRESSION:
+            raise ValueError("Compressed APDU is not supported.")
+        position += 1
+
+        invocation_counter = bytes(
+            apdu[position : position + _INVOCATION_COUNTER_LENGTH]
+        )
+        position += _INVOCATION_COUNTER_LENGTH
+
+        return self._get_prepared_keys(system_title).decrypt(
+            security_control, system_title + invocation_counter, apdu[position:]
+        )
@@ -0,0 +1,351 @@
+"""
+Use this module to collect readings from many meters using several worker processes.
+
+Each worker process runs its own event loop with meter connections and AutoDecoder, and the
+decoded readings of all workers are published on one output queue. Workers share a listening
+port using SO_REUSEPORT (the kernel distributes inbound connections), or are assigned their
+share of outbound meter connections by rendezvous (consistent) hashing of the meter id.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import multiprocessing
+import os
+import queue
+import socket
+from asyncio import Queue
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Mapping, Tuple, Union
+
+from han.autodecoder import AutoDecoder
+from han.common import MeterMessageBase
+from han.meter_connection import (
+    DeliveryPolicy,
+    MeterHub,
+    MeterHubConnectionFactory,
+    MeterTransportProtocol,
+    SharedTaggedQueue,
+)
+from han.tcp_connection_factory import (
+    TcpMeterServer,
+    create_tcp_meter_server,
+    create_tcp_message_connection,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Source (peer host and port, or meter id) and decoded reading
+CollectorReading = Tuple[str, Dict[str, Union[str, int, float, datetime]]]
+
+# Time to wait for the output queue or stop event before checking for cancel or failure
+_POLL_INTERVAL_SEC = 0.5
+
+# Max number of sources to keep a decoder for in each worker. The decoder of the least
+# recently used source is forgotten first.
+_MAX_DECODERS = 10000
+
+
+def get_shard(key: str, shard_count: int) -> int:
+    """
+    Get shard of key using rendezvous hashing.
+
+    The shard is stable across processes, and only keys of one shard move when the
+    number of shards is changed by one.
+
+    :param key: key to get shard for, like meter id.
+    :param shard_count: number of shards.
+    :return: shard number from 0 to shard count - 1.
+    """
+    if shard_count < 1:
+        raise ValueError("Shard count must be positive.")
+    return max(
+        range(shard_count),
+        key=lambda shard: hashlib.blake2b(
+            f"{shard}:{key}".encode(), digest_size=8
+        ).digest(),
+    )
+
+
+@dataclass
+class CollectorLimits:
+    """Limits of pending messages and readings of ShardedCollector."""
+
+    max_pending_messages: int = 1000
+    """Max number of messages received and not yet decoded in each worker."""
+
+    max_pending_batches: int = 100
+    """
+    Max number of batches of readings published and not yet taken.
+
+    Workers wait for room, and stop reading from their connections while waiting.
+    """
+
+
+@dataclass
+class _WorkerConfig:
+    """Configuration of one worker process."""
+
+    worker_number: int
+    listen_address: tuple[str, int] | None
+    targets: dict[str, tuple[str, int]] = field(default_factory=dict)
+    max_pending_messages: int = 1000
+    reuse_port: bool = False
+
+
+class ShardedCollector:
+    """
+    Collect readings from many meters using several worker processes.
+
+    Pass a listen address to accept connections from meters and gateways in all workers
+    using SO_REUSEPORT, and/or targets (meter id to host and port) to connect to meters.
+    Each worker supervises its own connections, reconnecting lost connections. Readings
+    are published in batches as (source, reading) tuples, where source is the peer host
+    and port of accepted connections or the meter id of targets.
+
+    Each worker keeps one decoder for each source. An accepted connection that reconnects
+    gets a new peer port, and is decoded without the context kept by the previous decoder,
+    like the Kamstrup meter type, until the context is received again.
+    """
+
+    def __init__(
+        self,
+        worker_count: int | None = None,
+        listen_address: tuple[str, int] | None = None,
+        targets: Mapping[str, tuple[str, int]] | None = None,
+        limits: CollectorLimits | None = None,
+        mp_context: Any = None,
+    ) -> None:
+        """
+        Initialize ShardedCollector.
+
+        :param worker_count: number of worker processes. Default is number of CPUs.
+        :param listen_address: host and port to accept connections on. None to not accept connections.
+        :param targets: host and port of meters to connect to by meter id.
+        :param limits: limits of pending messages and readings. Default is default limits.
+        :param mp_context: multiprocessing context. Default is the default context.
+        """
+        worker_count = worker_count if worker_count else os.cpu_count() or 1
+        limits = limits if limits else CollectorLimits()
+        if worker_count < 1:
+            raise ValueError("Worker count must be positive.")
+        if limits.max_pending_messages < 1:
+            raise ValueError("Max pending messages must be positive.")
+        if limits.max_pending_batches < 1:
+            raise ValueError("Max pending batches must be positive.")
+        if listen_address is None and not targets:
+            raise ValueError("Listen address or targets must be given.")
+        if (
+            listen_address is not None
+            and worker_count > 1
+            and not hasattr(socket, "SO_REUSEPORT")
+        ):
+            raise ValueError("SO_REUSEPORT is not supported on this platform.")
+
+        self._context = mp_context if mp_context else multiprocessing.get_context()
+        self._worker_configs = [
+            _WorkerConfig(
+                number,
+                listen_address,
+                {},
+                limits.max_pending_messages,
+                # workers only share the listen port when there is more than one
+                worker_count > 1,
+            )
+            for number in range(worker_count)
+        ]
+        for meter_id, address in (targets or {}).items():
+            self._worker_configs[get_shard(meter_id, worker_count)].targets[
+                meter_id
+            ] = address
+
+        self._output: Any = self._context.Queue(limits.max_pending_batches)
+        self._stop_event: Any = self._context.Event()
+        self._processes: list[Any] = []
+
+    @property
+    def worker_count(self) -> int:
+        """Return number of worker processes."""
+        return len(self._worker_configs)
+
+    @property
+    def is_running(self) -> bool:
+        """Return True when worker processes are started and not stopped."""
+        return bool(self._processes)
+
+    def get_worker_targets(self, worker_number: int) -> dict[str, tuple[str, int]]:
+        """Return targets assigned to worker."""
+        return dict(self._worker_configs[worker_number].targets)
+
+    def start(self) -> None:
+        """Start worker processes."""
+        if self._processes:
+            raise RuntimeError("Collector is already started.")
+        self._stop_event.clear()
+        for config in self._worker_configs:
+            process = self._context.Process(
+                target=_run_worker,
+                args=(config, self._output, self._stop_event),
+                name=f"han-collector-{config.worker_number}",
+                daemon=True,
+            )
+            process.start()
+            self._processes.append(process)
+
+    def stop(self, timeout_sec: float = 5.0) -> None:
+        """
+        Stop worker processes.
+
+        :param timeout_sec: time to wait for each worker to close its connections before it is terminated.
+        """
+        self._stop_event.set()
+        for process in self._processes:
+            process.join(timeout_sec)
+            if process.is_alive():
+                _LOGGER.warning("Terminate worker %s", process.name)
+                process.terminate()
+                process.join()
+        self._processes = []
+
+    def get_readings(self, timeout_sec: float | None = None) -> list[CollectorReading]:
+        """
+        Get next batch of readings, waiting for readings when none are available.
+
+        :param timeout_sec: max time to wait. None to wait until readings are available.
+        :return: readings from one worker, or empty list when timed out.
+        """
+        try:
+            return self._output.get(timeout=timeout_sec)
+        except queue.Empty:
+            return []
+
+    async def readings(self) -> AsyncIterator[CollectorReading]:
+        """
+        Iterate over readings from all workers, waiting for readings in an executor thread.
+
+        The executor thread waits for a short time only, so the iteration can be cancelled
+        without leaving a thread blocked on the output queue.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            for reading in await loop.run_in_executor(
+                None, self.get_readings, _POLL_INTERVAL_SEC
+            ):
+                yield reading
+
+
+def _run_worker(config: _WorkerConfig, output: Any, stop_event: Any) -> None:
+    try:
+        asyncio.run(_run_worker_loop(config, output, stop_event))
+    except KeyboardInterrupt:
+        pass
+
+
+async def _run_worker_loop(config: _WorkerConfig, output: Any, stop_event: Any) -> None:
+    loop = asyncio.get_running_loop()
+    message_queue = SharedTaggedQueue(maxsize=config.max_pending_messages)
+
+    server: TcpMeterServer | None = None
+    if config.listen_address:
+        host, port = config.listen_address
+        server = await create_tcp_meter_server(
+            message_queue,
+            None,
+            None,
+            host,
+            port,
+            delivery_policy=DeliveryPolicy.PAUSE_READING,
+            reuse_port=config.reuse_port,
+        )
+
+    hub = MeterHub(message_queue)
+    for meter_id, (host, port) in config.targets.items():
+        hub.add_meter(meter_id, _create_target_connection_factory(host, port))
+    hub_task = loop.create_task(hub.run())
+
+    publish_task = loop.create_task(_publish_readings(message_queue, output))
+    _LOGGER.info(
+        "Worker %d started with %d targets",
+        config.worker_number,
+        len(config.targets),
+    )
+
+    while not await loop.run_in_executor(None, stop_event.wait, _POLL_INTERVAL_SEC):
+        if publish_task.done():
+            _LOGGER.error(
+                "Worker %d stopped publishing readings: %s",
+                config.worker_number,
+                publish_task.exception(),
+            )
+            break
+
+    publish_task.cancel()
+    hub.close()
+    if server:
+        server.close()
+        await server.wait_closed()
+    await asyncio.wait((hub_task, publish_task))
+    _LOGGER.info("Worker %d done", config.worker_number)
+
+
+def _create_target_connection_factory(
+    host: str, port: int
+) -> MeterHubConnectionFactory:
+    async def create_connection(meter_queue: Queue[Any]) -> MeterTransportProtocol:
+        return await create_tcp_message_connection(
+            meter_queue,
+            None,
+            None,
+            host,
+            port,
+            delivery_policy=DeliveryPolicy.PAUSE_READING,
+        )
+
+    return create_connection
+
+
+async def _publish_readings(
+    message_queue: Queue[tuple[str, MeterMessageBase]], output: Any
+) -> None:
+    loop = asyncio.get_running_loop()
+    decoders: dict[str, AutoDecoder] = {}
+    while True:
+        messages = [await message_queue.get()]
+        while not message_queue.empty():
+            messages.append(message_queue.get_nowait())
+
+        readings: list[CollectorReading] = []
+        for source, message in messages:
+            # move the decoder of source last, to keep decoders in least recently used order
+            decoder = decoders.pop(source, None)
+            if decoder is None:
+                if len(decoders) >= _MAX_DECODERS:
+                    # forget the decoder of the least recently used source
+                    del decoders[next(iter(decoders))]
+                decoder = AutoDecoder()
+            decoders[source] = decoder
+            try:
+                reading = decoder.decode_message(message)
+            except Exception as ex:  # pylint: disable=broad-except
+                _LOGGER.warning("Error decoding message from %s: %s", source, ex)
+                continue
+            if reading:
+                readings.append((source, reading))
+            else:
+                _LOGGER.debug("Could not decode message from %s", source)
+
+        # wait for room in the output queue, checking for cancel while waiting
+        while readings and not await loop.run_in_executor(
+            None, _put_readings, output, readings
+        ):
+            pass
+
+
+def _put_readings(output: Any, readings: list[CollectorReading]) -> bool:
+    try:
+        output.put(readings, timeout=_POLL_INTERVAL_SEC)
+    except queue.Full:
+        return False
+    return True
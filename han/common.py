@@ -13,6 +13,7 @@ class MeterMessageType(Enum):
     HDLC_DLMS = auto()
     DLMS = auto()
     P1 = auto()
+    MBUS = auto()
 
 
 class MeterMessageBase(ABC):
@@ -80,10 +81,22 @@ class MeterReaderBase(ABC, Generic[TMessage]):
         """Return True when reader is hunting for start of message."""
 
     @abstractmethod
-    def read(self, data_chunk: bytes) -> list[TMessage]:
+    def read(self, data_chunk: bytes | memoryview) -> list[TMessage]:
         """
         Call this function feed reader with chunks of bytes.
 
+        The chunk can be a memoryview of a receive buffer that is reused when read returns
+        (see BufferedReceiveMixin). It is only valid during the call, so readers must copy
+        the bytes they keep.
         :param data_chunk: next bytes to parsed.
         :return: complete messages received
         """
+
+    def idle(self) -> list[TMessage]:
+        """
+        Call this function when no bytes have been received for a while (idle gap).
+
+        Readers of messages delimited by idle gaps return the completed message.
+        :return: complete messages. Default is none.
+        """
+        return []
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 import datetime
-from decimal import Decimal
+import struct
 from typing import Any
 
 import construct  # type: ignore
@@ -62,81 +62,159 @@ OptionalDateTimeByte = construct.ExprAdapter(
     encoder=lambda obj, ctx: obj if obj is not None else 0xFF,
 )
 
-# See COSEM blue Book section 4.1.6.1 Date and time formats
-DateTime = construct.Struct(
-    construct.Const(0x0C, construct.Int8ub),  # expect length 12
-    "year" / construct.Int16ub,
-    "month" / construct.Int8ub,
-    "day_of_month" / construct.Int8ub,
-    "day_of_week" / construct.Int8ub,
-    "hour" / OptionalDateTimeByte,
-    "minute" / OptionalDateTimeByte,
-    "second" / OptionalDateTimeByte,
-    "hundredths_of_second" / OptionalDateTimeByte,
-    "deviation"
-    / construct.ExprAdapter(
-        construct.Int16sb,
-        decoder=lambda obj, ctx: obj if obj != -0x8000 else None,
-        encoder=lambda obj, ctx: obj if obj is not None else -0x8000,
-    )
-    * ("Range -720...+720 in minutes of local time to UTC. 0x8000 = not specified"),
-    "clock_status_byte" / construct.Peek(OptionalDateTimeByte),
-    "clock_status"
-    / construct.If(
-        construct.this.clock_status_byte != 0xFF,
-        construct.BitStruct(
-            "invalid_value"
-            / construct.BitsInteger(1)
-            * (
-                "Time could not be recovered after an incident. Detailed conditions are "
-                "manufacturer specific (for example after the power to the clock has been "
-                "interrupted). For a valid status, bit 0 shall not be set if bit 1 is set."
-            ),
-            "doubtful_value"
-            / construct.BitsInteger(1)
-            * (
-                "Time could be recovered after an incident but the value cannot be guaranteed. "
-                "Detailed conditions are manufacturer specific. For a valid status, bit 1 shall "
-                "not be set if bit 0 is set."
-            ),
-            "different_clock_base"
-            / construct.BitsInteger(1)
-            * (
-                "Bit is set if the basic timing information for the clock at the actual moment "
-                "is taken from a timing source different from the source specified in clock_base."
+
+class ClockStatus(int):
+    """
+    COSEM clock status.
+
+    The status is kept as the plain status byte, and the flags are only extracted when accessed.
+    """
+
+    @property
+    def invalid_value(self) -> int:
+        """
+        Time could not be recovered after an incident.
+
+        Detailed conditions are manufacturer specific (for example after the power to the clock has been
+        interrupted). For a valid status, bit 0 shall not be set if bit 1 is set.
+        """
+        return (self >> 7) & 0x01
+
+    @property
+    def doubtful_value(self) -> int:
+        """
+        Time could be recovered after an incident but the value cannot be guaranteed.
+
+        Detailed conditions are manufacturer specific. For a valid status, bit 1 shall
+        not be set if bit 0 is set.
+        """
+        return (self >> 6) & 0x01
+
+    @property
+    def different_clock_base(self) -> int:
+        """
+        Bit is set if the basic timing information for the clock at the actual moment is taken from a timing source.
+
+        The timing source is different from the source specified in clock_base.
+        """
+        return (self >> 5) & 0x01
+
+    @property
+    def invalid_clock_status(self) -> int:
+        """
+        This bit indicates that at least one bit of the clock status is invalid.
+
+        Some bits may be correct. The exact meaning shall be explained in the manufacturer's documentation.
+        """
+        return (self >> 4) & 0x01
+
+    @property
+    def daylight_saving_active(self) -> int:
+        """Flag set to true: the transmitted time contains the daylight saving deviation (summer time)."""
+        return self & 0x01
+
+
+_timezones: dict[int, datetime.timezone] = {}
+
+
+def _get_timezone(deviation: int) -> datetime.timezone:
+    """Get cached timezone for deviation (in minutes of local time to UTC)."""
+    timezone = _timezones.get(deviation)
+    if timezone is None:
+        timezone = datetime.timezone(datetime.timedelta(minutes=deviation * -1))
+        _timezones[deviation] = timezone
+    return timezone
+
+
+class _DateTime(construct.Construct):
+    """
+    COSEM date-time (octet-string of length 12) with length byte.
+
+    See COSEM blue Book section 4.1.6.1 Date and time formats.
+    The date-time is unpacked in one operation instead of field by field.
+    """
+
+    # length, year, month, day of month, day of week, hour, minute, second, hundredths, deviation, clock status
+    _struct = struct.Struct(">BHBBBBBBBhB")
+
+    def _parse(self, stream, context, path):  # pylint: disable=unused-argument
+        (
+            length,
+            year,
+            month,
+            day_of_month,
+            day_of_week,
+            hour,
+            minute,
+            second,
+            hundredths_of_second,
+            deviation,
+            clock_status_byte,
+        ) = self._struct.unpack(construct.stream_read(stream, 13, path))
+
+        if length != 0x0C:  # expect length 12
+            raise construct.ConstError(
+                f"parsing expected {0x0C!r} but parsed {length!r}", path=path
+            )
+
+        return construct.Container(
+            year=year,
+            month=month,
+            day_of_month=day_of_month,
+            day_of_week=day_of_week,
+            hour=hour if hour != 0xFF else None,
+            minute=minute if minute != 0xFF else None,
+            second=second if second != 0xFF else None,
+            hundredths_of_second=hundredths_of_second
+            if hundredths_of_second != 0xFF
+            else None,
+            # Range -720...+720 in minutes of local time to UTC. 0x8000 = not specified
+            deviation=deviation if deviation != -0x8000 else None,
+            clock_status_byte=clock_status_byte if clock_status_byte != 0xFF else None,
+            clock_status=ClockStatus(clock_status_byte)
+            if clock_status_byte != 0xFF
+            else None,
+            datetime=datetime.datetime(
+                year,
+                month,
+                day_of_month,
+                hour,
+                minute,
+                second,
+                hundredths_of_second * 10000 if hundredths_of_second != 0xFF else 0,
+                _get_timezone(deviation) if deviation != -0x8000 else None,
             ),
-            "invalid_clock_status"
-            / construct.BitsInteger(1)
-            * (
-                "This bit indicates that at least one bit of the clock status is invalid. "
-                "Some bits may be correct. The exact meaning shall be explained in the "
-                "manufacturer's documentation."
+        )
+
+    def _build(self, obj, stream, context, path):  # pylint: disable=unused-argument
+        def optional(value: int | None) -> int:
+            return value if value is not None else 0xFF
+
+        construct.stream_write(
+            stream,
+            self._struct.pack(
+                0x0C,
+                obj["year"],
+                obj["month"],
+                obj["day_of_month"],
+                obj["day_of_week"],
+                optional(obj.get("hour")),
+                optional(obj.get("minute")),
+                optional(obj.get("second")),
+                optional(obj.get("hundredths_of_second")),
+                obj["deviation"] if obj.get("deviation") is not None else -0x8000,
+                optional(obj.get("clock_status_byte")),
             ),
-            construct.BitsInteger(3),
-            "daylight_saving_active"
-            / construct.BitsInteger(1)
-            * "Flag set to true: the transmitted time contains the daylight saving deviation (summer time).",
-        ),
-    ),
-    construct.If(construct.this.clock_status_byte == 0xFF, construct.Int8ub),
-    "datetime"
-    / construct.Computed(
-        lambda ctx: datetime.datetime(
-            ctx.year,
-            ctx.month,
-            ctx.day_of_month,
-            ctx.hour,
-            ctx.minute,
-            ctx.second,
-            ctx.hundredths_of_second * 10000
-            if ctx.hundredths_of_second is not None
-            else 0,
-            datetime.timezone(datetime.timedelta(minutes=ctx.deviation * -1))
-            if ctx.deviation is not None
-            else None,
+            13,
+            path,
         )
-    ),
-)
+        return obj
+
+    def _sizeof(self, context, path):  # pylint: disable=unused-argument
+        return 13
+
+
+DateTime = _DateTime()  # pylint: disable=invalid-name
 
 NullData: construct.Struct = construct.Struct(
     "_null_peek" / construct.Peek(CommonDataTypes),
@@ -221,10 +299,41 @@ UnitField = construct.FocusedSeq(
     "value" / PhysicalUnits,
 )
 
+# Powers of ten for scaler exponents normally used by meters (-9...+9)
+_powers_of_ten: tuple[int, ...] = tuple(10**n for n in range(10))
+_scale_multipliers: dict[int, int | float] = {n: 10**n for n in range(-9, 10)}
+
+
+def scale_multiplier(exponent: int) -> int | float:
+    """
+    Return multiplication factor 10**exponent of scaler exponent.
+
+    The factor is an int for positive exponents and a float for negative exponents.
+    """
+    multiplier = _scale_multipliers.get(exponent)
+    return multiplier if multiplier is not None else 10**exponent
+
+
+def scale_to_float(value: int, exponent: int) -> float:
+    """
+    Return value multiplied by 10**exponent as float.
+
+    The result is the float nearest the exact decimal value, the same as converting
+    the exact Decimal product to float.
+    """
+    if exponent < 0:
+        return value / (
+            _powers_of_ten[-exponent] if exponent > -10 else 10**-exponent
+        )
+    return float(
+        value * (_powers_of_ten[exponent] if exponent < 10 else 10**exponent)
+    )
+
+
 Scaler = construct.Struct(
     "exponent"
     / IntegerField,  # This is the exponent (to the base of 10) of the multiplication factor.
-    "scale" / construct.Computed(lambda ctx: Decimal(10) ** ctx.exponent),
+    "scale" / construct.Computed(lambda ctx: scale_multiplier(ctx.exponent)),
 )
 
 ScalerUnitField = construct.Struct(
@@ -264,7 +373,9 @@ LongInvokeIdAndPriority = construct.BitStruct(
     "priority" / construct.Enum(construct.BitsInteger(1), Normal=0, High=1),
 )
 
-ApduTag = construct.Enum(construct.Int8ub, data_notification=0x0F)
+ApduTag = construct.Enum(
+    construct.Int8ub, data_notification=0x0F, general_block_transfer=0xE0
+)
 
 
 def _get_apdu_struct(notification_body: construct.Struct) -> construct.Struct:
@@ -293,3 +404,25 @@ def get_llc_pdu_struct(notification_body: construct.Struct) -> construct.Struct:
         "control" / construct.Int8ub,
         "information" / _get_apdu_struct(notification_body),
     )
+
+
+# LLC headers (dsap, ssap and control) used for the LLC sub-layer in DLMS/COSEM
+LLC_HEADERS = (b"\xe6\xe7\x00", b"\xe6\xe6\x00")
+LLC_HEADER_LENGTH = 3
+
+
+def read_axdr_length(data: bytes | memoryview, position: int) -> tuple[int, int]:
+    """
+    Read A-XDR encoded length at position.
+
+    :param data: data containing the length.
+    :param position: position of the length in data.
+    :return: the length and the position after the length.
+    """
+    length = data[position]
+    position += 1
+    if length & 0x80:
+        length_of_length = length & 0x7F
+        length = int.from_bytes(data[position : position + length_of_length], "big")
+        position += length_of_length
+    return length, position
@@ -23,6 +23,36 @@ _ident_pattern: Pattern = regex_compile(
     r"^\/(?P<MANID>[A-Z][A-Z][a-zA-Z])(?P<BAUDID>\d)((\\\w)*)(?P<ID>[ -~]{1,16})?(\r\n)?$"
 )
 
+# Optional address followed by one value with optional unit: address(value*unit)
+_data_set_value_pattern: Pattern = regex_compile(
+    rb"([^()\s]*)\(([^()*]*)(?:\*([^()]*))?\)"
+)
+
+
+def _compute_crc16_table() -> list[int]:
+    """Generate a CRC16 (polynomial x16 + x15 + x2 + 1) table."""
+    crc_table = []
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            if crc & 0x01:
+                crc = (crc >> 1) ^ 0xA001
+            else:
+                crc >>= 1
+        crc_table.append(crc)
+    return crc_table
+
+
+_crc16_table: list[int] = _compute_crc16_table()
+
+
+def _update_crc16(crc: int, data: bytes | bytearray) -> int:
+    """Update CRC16 value with data."""
+    table = _crc16_table
+    for byte in data:
+        crc = (crc >> 8) ^ table[(crc ^ byte) & 0xFF]
+    return crc
+
 
 @dataclass
 class DataSetValue:
@@ -57,47 +87,43 @@ class DataSet:
     unit of the succeeding values from the first value of a sequence.
     """
 
-    address: str
+    address: str | None
     """Identification number or address: 16 printable characters maximum with the exception of (, ), /, and !."""
 
     values: list[DataSetValue]
     """List of values."""
 
     @classmethod
-    def parse_data_block(cls, data: str) -> list[DataSet]:
-        """Parse data set line into list of data set."""
-
-        def get_address_and_values(line: str, from_pos: int):
-            address = None
-            values: list[DataSetValue] = []
-
-            address_end = line.find("(", from_pos)
-            if address_end > from_pos:
-                address = line[from_pos:address_end]
-                from_pos = address_end
-
-            while from_pos > 0:
-                value_end_pos = line.find(")", from_pos)
-                values.append(DataSetValue.parse(line[from_pos + 1 : value_end_pos]))
-                from_pos = value_end_pos + 1
-
-                if from_pos == len(line):  # end of line
-                    from_pos = -1
-                    break
-
-                if line[from_pos] != "(":  # end of address element(s)
-                    break
+    def parse_data_block(cls, data: bytes | bytearray | str) -> list[DataSet]:
+        """
+        Parse data block into list of data set.
 
-            return (from_pos if values else -1, address, values)
+        The data block is tokenized in a single pass at byte level. A value without
+        address directly following the previous value belongs to the same data set
+        (multiple values), while a value without address not directly following the
+        previous value is a data set with address omitted.
+        """
+        if isinstance(data, str):
+            data = data.encode("ascii")
 
         items: list[DataSet] = []
-        lines = [line for line in data.splitlines() if len(line.strip())]
-        for data_line in lines:
-            position = 0
-            while position > -1:
-                position, address, values = get_address_and_values(data_line, position)
-                if values:
-                    items.append(cls(address, values))
+        current: DataSet | None = None
+        previous_end = -1
+        for match in _data_set_value_pattern.finditer(data):
+            address, value, unit = match.groups()
+            if address or current is None or match.start() != previous_end:
+                current = cls(address.decode("ascii") if address else None, [])
+                items.append(current)
+
+            if unit is not None:
+                if b"*" in unit:
+                    raise ValueError("Found multiple value unit separators (*).")
+                current.values.append(
+                    DataSetValue(value.decode("ascii"), unit.decode("ascii"))
+                )
+            else:
+                current.values.append(DataSetValue(value.decode("ascii"), None))
+            previous_end = match.end()
 
         return items
 
@@ -139,8 +165,19 @@ class Ident:
 class DataReadout(MeterMessageBase):
     """Mode D data readout."""
 
-    def __init__(self, readout: bytes) -> None:
-        """Initialize DataReadout."""
+    def __init__(
+        self,
+        readout: bytes,
+        calculated_crc: int | None = None,
+        data_sets: list[DataSet] | None = None,
+    ) -> None:
+        """
+        Initialize DataReadout.
+
+        :param readout: readout bytes from start character to end line.
+        :param calculated_crc: CRC already calculated by reader, or None to calculate.
+        :param data_sets: data sets already parsed by reader, or None to parse when needed.
+        """
         self._readout = readout.lstrip()
         if self._readout[0] != START_CHARACTER_HEX:
             raise ValueError("Readout must start with '/' character")
@@ -155,7 +192,10 @@ class DataReadout(MeterMessageBase):
         # if self._data_pos < 1:
         #     raise ValueError("Data not found.")
 
-        self._calculated_crc = self._calculate_crc16()
+        self._calculated_crc = (
+            calculated_crc if calculated_crc is not None else self._calculate_crc16()
+        )
+        self._data_sets = data_sets
         self._ident: Ident | None = None
 
     def __len__(self) -> int:
@@ -228,6 +268,13 @@ class DataReadout(MeterMessageBase):
         data = self._readout[self._data_pos : self._end_pos]
         return [line for line in data.decode("ascii").splitlines() if len(line.strip())]
 
+    @property
+    def data_sets(self) -> list[DataSet]:
+        """Return data sets of data block. Data is parsed on first access unless parsed by reader."""
+        if self._data_sets is None:
+            self._data_sets = parse_p1_readout_content(self.payload)
+        return self._data_sets
+
     def __str__(self) -> str:
         """Return readout as text."""
         return self._readout.decode("ascii")
@@ -237,34 +284,139 @@ class DataReadout(MeterMessageBase):
         return str(self)
 
     def _calculate_crc16(self) -> int:
-        buf = self._readout[0 : self._end_pos + 1]
-        crc = 0x0000
-        for byte in buf:
-            crc ^= byte
-            for _ in range(8):
-                if crc & 0x01:
-                    crc >>= 1
-                    crc ^= 0xA001  # CRC16 polynomial x16 + x15 + x2 +1
-                else:
-                    crc >>= 1
-        return crc
+        return _update_crc16(0x0000, self._readout[0 : self._end_pos + 1])
 
 
-class ModeDReader(MeterReaderBase[DataReadout]):
-    """Direct Local Data Exchange mode D data reader."""
+@dataclass
+class ModeDReaderStatistics:
+    """Statistics of data discarded by ModeDReader."""
+
+    discarded_bytes: int = 0
+    """Number of bytes discarded while hunting for start of readout or discarding readouts."""
+
+    oversize_lines: int = 0
+    """Number of lines discarded for being longer than max line length."""
+
+    oversize_readouts: int = 0
+    """Number of readouts discarded for being longer than max readout length."""
+
+
+@dataclass(frozen=True)
+class ModeDReaderLimits:
+    """Line and readout length limits of ModeDReader."""
+
+    max_line_length: int
+    """Max length of a line including line ending."""
+
+    max_readout_length: int
+    """Max length of a readout from start character to end line."""
+
+
+class _PartialReadout:
+    """Raw data, checksum and parsed data sets of the readout being read by ModeDReader."""
 
     def __init__(self) -> None:
-        """Initialize ModeDReader."""
+        self.raw_data = bytearray()
+        self._crc = 0x0000
+        self._data_sets: list[DataSet] | None = None
+
+    def __len__(self) -> int:
+        """Bytes of readout read so far."""
+        return len(self.raw_data)
+
+    def start(self, ident_line: bytearray, parse_data_lines: bool) -> None:
+        """Start readout with ident line."""
+        self.raw_data.clear()
+        self.raw_data.extend(ident_line)
+        self._crc = _update_crc16(0x0000, ident_line)
+        self._data_sets = [] if parse_data_lines else None
+
+    def add_data_line(self, line: bytearray) -> None:
+        """Add data line, parsing it into data sets when data lines are parsed."""
+        self.raw_data.extend(line)
+        self._crc = _update_crc16(self._crc, line)
+        if self._data_sets is not None:
+            if line.isascii():
+                try:
+                    self._data_sets.extend(DataSet.parse_data_block(line))
+                    return
+                except ValueError:
+                    pass
+            # leave invalid data to be reported when readout is decoded
+            self._data_sets = None
+
+    def finish(self, end_line: bytearray) -> DataReadout:
+        """Add end line and return the complete readout."""
+        self.raw_data.extend(end_line)
+        readout = DataReadout(
+            bytes(self.raw_data),
+            _update_crc16(self._crc, end_line[:1]),
+            self._data_sets,
+        )
+        self.clear()
+        return readout
+
+    def clear(self) -> None:
+        """Clear readout."""
+        self.raw_data.clear()
+        self._data_sets = None
+
+
+class ModeDReader(MeterReaderBase[DataReadout]):
+    """
+    Direct Local Data Exchange mode D data reader.
+
+    The readout checksum is calculated line by line as data arrives. When parse_data_lines
+    is set, each data line is also parsed into data sets as soon as the line is complete,
+    and returned readouts are ready to be decoded without parsing the data block again.
+
+    Line and readout length are limited. Only the readout exceeding a limit is discarded,
+    and the reader continues hunting for start of the next readout.
+    """
+
+    DEFAULT_MAX_LINE_LENGTH: int = 1024
+    DEFAULT_MAX_READOUT_LENGTH: int = 8192
+
+    def __init__(
+        self,
+        parse_data_lines: bool = False,
+        max_line_length: int = DEFAULT_MAX_LINE_LENGTH,
+        max_readout_length: int = DEFAULT_MAX_READOUT_LENGTH,
+    ) -> None:
+        """
+        Initialize ModeDReader.
+
+        :param parse_data_lines: True to parse data lines into data sets while reading.
+        :param max_line_length: max length of a line including line ending.
+        :param max_readout_length: max length of a readout from start character to end line.
+        """
+        if max_line_length < 1 or max_readout_length < max_line_length:
+            raise ValueError(
+                "Max line length must be positive and not exceed max readout length."
+            )
         self._buffer = _ReaderBuffer()
-        self._raw_data = bytearray()
+        self._readout = _PartialReadout()
         self._is_int_hunt_mode = True
+        self._parse_data_lines = parse_data_lines
+        self._limits = ModeDReaderLimits(max_line_length, max_readout_length)
+        self._statistics = ModeDReaderStatistics()
 
     @property
     def is_in_hunt_mode(self) -> bool:
         """Return True when reader is hunting for start of readout."""
         return self._is_int_hunt_mode
 
-    def read(self, data_chunk: bytes) -> list[DataReadout]:
+    @property
+    def limits(self) -> ModeDReaderLimits:
+        """Return line and readout length limits."""
+        return self._limits
+
+    @property
+    def statistics(self) -> ModeDReaderStatistics:
+        """Return statistics of discarded data."""
+        return self._statistics
+
+    def read(self, data_chunk: bytes | memoryview) -> list[DataReadout]:
         """
         Call this function to read chunks of bytes.
 
@@ -273,79 +425,171 @@ class ModeDReader(MeterReaderBase[DataReadout]):
         """
         readouts_received: list[DataReadout] = []
 
-        if len(self._buffer) > 8191:
-            self._is_int_hunt_mode = True
-            self._buffer.trim_buffer_to_flag_or_end()
-
         self._buffer.extend(data_chunk)
 
         if self._is_int_hunt_mode:
-            self._buffer.trim_buffer_to_flag_or_end()
+            self._statistics.discarded_bytes += (
+                self._buffer.trim_buffer_to_flag_or_end()
+            )
 
         while True:
             line = self._buffer.pop()
             if line is None:
-                return readouts_received
-
-            if self.is_in_hunt_mode:
-                if line[0] == START_CHARACTER_HEX:
-                    line_str = line.decode("ascii")
-                    if Ident.is_ident_line(line_str):
-                        _LOGGER.debug("Ident line found: %s", line_str)
-                        self._is_int_hunt_mode = False
-                        self._raw_data.extend(line)
+                break
+
+            readout = self._read_line(line)
+            if readout is not None:
+                readouts_received.append(readout)
+
+        if self._buffer.incomplete_line_length > self._limits.max_line_length:
+            self._statistics.oversize_lines += 1
+            if self._is_int_hunt_mode:
+                self._statistics.discarded_bytes += self._buffer.discard_line()
+            else:
+                self._discard_readout(self._buffer.discard_line())
+
+        self._buffer.trim_buffer_to_current_position()
+        return readouts_received
+
+    def _read_line(self, line: bytearray) -> DataReadout | None:
+        """Read complete line. Return readout when the line is the end line of a readout."""
+        if len(line) > self._limits.max_line_length:
+            self._statistics.oversize_lines += 1
+            if self._is_int_hunt_mode:
+                self._discard_hunted_line(len(line))
             else:
-                self._raw_data.extend(line)
-                if line[0] == END_CHARACTER_HEX:
-                    readout = DataReadout(bytes(self._raw_data))
-                    readouts_received.append(readout)
-                    _LOGGER.debug("Readout received:\n%s", readout)
-                    self._raw_data.clear()
-                    self._is_int_hunt_mode = True
+                self._discard_readout(len(line))
+            return None
+
+        if line[0] == START_CHARACTER_HEX and self._try_start_readout(line):
+            return None
+
+        if self._is_int_hunt_mode:
+            self._discard_hunted_line(len(line))
+            return None
+
+        if len(self._readout) + len(line) > self._limits.max_readout_length:
+            self._statistics.oversize_readouts += 1
+            self._discard_readout(len(line))
+            return None
+
+        if line[0] != END_CHARACTER_HEX:
+            self._readout.add_data_line(line)
+            return None
+
+        readout = self._readout.finish(line)
+        _LOGGER.debug("Readout received:\n%s", readout)
+        self._is_int_hunt_mode = True
+        self._statistics.discarded_bytes += self._buffer.trim_buffer_to_flag_or_end()
+        return readout
+
+    def _try_start_readout(self, line: bytearray) -> bool:
+        if not line.isascii():
+            return False
+
+        line_str = line.decode("ascii")
+        if not Ident.is_ident_line(line_str):
+            return False
+
+        if not self._is_int_hunt_mode:
+            # start character is not allowed in data lines, so end line is missing
+            _LOGGER.debug(
+                "Ident line found before end line. Discard readout: %s",
+                self._readout.raw_data.hex(),
+            )
+            self._statistics.discarded_bytes += len(self._readout)
+
+        _LOGGER.debug("Ident line found: %s", line_str)
+        self._is_int_hunt_mode = False
+        self._readout.start(line, self._parse_data_lines)
+        return True
+
+    def _discard_hunted_line(self, line_length: int) -> None:
+        self._statistics.discarded_bytes += line_length
+        self._statistics.discarded_bytes += self._buffer.trim_buffer_to_flag_or_end()
+
+    def _discard_readout(self, bytes_not_in_readout: int) -> None:
+        _LOGGER.debug(
+            "Max readout or line length exceeded. Discard readout: %s",
+            self._readout.raw_data.hex(),
+        )
+        self._statistics.discarded_bytes += len(self._readout) + bytes_not_in_readout
+        self._readout.clear()
+        self._is_int_hunt_mode = True
+        self._statistics.discarded_bytes += self._buffer.trim_buffer_to_flag_or_end()
 
 
 class _ReaderBuffer:
-    """Buffer class used by ModeDReader."""
+    """
+    Buffer class used by ModeDReader.
+
+    Keeps track of how far the buffer has been searched for line end so that
+    no byte is searched more than once.
+    """
 
     def __init__(self) -> None:
         self._buffer = bytearray()
         self._buffer_pos = 0
+        self._search_pos = 0
 
     def __len__(self) -> int:
         """Bytes in buffer."""
         return len(self._buffer)
 
+    @property
+    def incomplete_line_length(self) -> int:
+        """Length of incomplete line at current position."""
+        return len(self._buffer) - self._buffer_pos
+
     def pop(self) -> bytearray | None:
         """Pop one line from buffer."""
-        if len(self._buffer) > self._buffer_pos:
-            lf_pos = self._buffer.find(LF_CHARACTER, self._buffer_pos)
+        if len(self._buffer) > self._search_pos:
+            lf_pos = self._buffer.find(LF_CHARACTER, self._search_pos)
             if lf_pos >= 0:
                 line = self._buffer[self._buffer_pos : lf_pos + 1]
-                self._buffer_pos += len(line)
+                self._buffer_pos = self._search_pos = lf_pos + 1
                 return line
+            self._search_pos = len(self._buffer)
 
         return None
 
-    def extend(self, data_chunk: bytes) -> None:
+    def extend(self, data_chunk: bytes | memoryview) -> None:
         """Add bytes to buffer."""
         self._buffer.extend(data_chunk)
 
     def trim_buffer_to_current_position(self) -> None:
         """Trim buffer to current position."""
-        self._buffer = self._buffer[self._buffer_pos :]
+        del self._buffer[: self._buffer_pos]
+        self._search_pos -= self._buffer_pos
         self._buffer_pos = 0
 
-    def trim_buffer_to_flag_or_end(self) -> None:
-        """Trim buffer to start character or end of buffer."""
-        self.trim_buffer_to_current_position()
-        flag_pos = self._buffer.find(START_CHARACTER_HEX)
+    def trim_buffer_to_flag_or_end(self) -> int:
+        """
+        Trim buffer to start character or end of buffer.
+
+        :return: number of bytes trimmed before start character.
+        """
+        return self._trim_to_flag_or_end_from(self._buffer_pos)
+
+    def discard_line(self) -> int:
+        """
+        Discard incomplete line at current position and trim buffer to next start character or end of buffer.
+
+        :return: number of bytes discarded.
+        """
+        return self._trim_to_flag_or_end_from(self._buffer_pos + 1)
+
+    def _trim_to_flag_or_end_from(self, position: int) -> int:
+        flag_pos = self._buffer.find(START_CHARACTER_HEX, position)
         if flag_pos == -1:
             # start character not found
-            self._buffer.clear()
-        if flag_pos > 0:
-            # trim data before flag sequence
-            self._buffer = self._buffer[flag_pos:]
+            flag_pos = len(self._buffer)
+        trimmed = flag_pos - self._buffer_pos
+        del self._buffer[:flag_pos]
         self._buffer_pos = 0
+        # bytes already searched for line end are not searched again
+        self._search_pos = max(self._search_pos - flag_pos, 0)
+        return trimmed
 
 
 def _parse_p1_datetime(value: str) -> datetime:
@@ -364,7 +608,7 @@ def parse_p1_readout(
     readout: DataReadout,
 ) -> list[DataSet]:
     """Parse data readout content."""
-    return parse_p1_readout_content(readout.payload)
+    return readout.data_sets
 
 
 def parse_p1_readout_content(
@@ -373,7 +617,7 @@ def parse_p1_readout_content(
     """Parse data readout content."""
     if not content.isascii():
         raise ValueError("Readout must be ascii.")
-    return DataSet.parse_data_block(content.decode("ascii"))
+    return DataSet.parse_data_block(content)
 
 
 def _decode_parsed(
@@ -382,7 +626,7 @@ def _decode_parsed(
     decoded: dict[str, str | int | float | datetime] = {}
 
     for item in parsed:
-        if len(item.values) == 1:
+        if len(item.values) == 1 and item.address:
             obis = Obis.from_string(item.address)
 
             obis_group_cdr = obis.to_group_cdr_str()
@@ -0,0 +1,311 @@
+"""Use this module to reassemble DLMS general-block-transfer (GBT) blocks to one APDU."""
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+from han import cosem
+from han.common import DlmsMessage, MeterMessageBase, MeterReaderBase
+
+_LOGGER = logging.getLogger(__name__)
+
+# general-block-transfer APDU tag
+GENERAL_BLOCK_TRANSFER_TAG: int = 0xE0
+
+# Block control bits
+_LAST_BLOCK = 0x80
+
+# Length of tag, block-control, block-number and block-number-ack
+_BLOCK_HEADER_LENGTH = 6
+
+
+@dataclass
+class GeneralBlockTransferStatistics:
+    """Statistics of blocks dropped or received out of order by GeneralBlockTransferReassembler."""
+
+    dropped_blocks: int = 0
+    """Number of blocks dropped without being part of a reassembled APDU."""
+
+    out_of_order_blocks: int = 0
+    """Number of blocks received before a block with lower block number."""
+
+    duplicate_blocks: int = 0
+    """Number of blocks received more than once."""
+
+    incomplete_apdus: int = 0
+    """Number of APDUs dropped because of missing blocks."""
+
+    timeouts: int = 0
+    """Number of incomplete APDUs dropped for too long time between blocks."""
+
+    oversize_apdus: int = 0
+    """Number of APDUs dropped for being longer than max APDU length."""
+
+
+class _ApduBlocks:
+    """Blocks of one APDU being reassembled, by block number."""
+
+    def __init__(self, llc_header: bytes) -> None:
+        self.llc_header = llc_header
+        self.blocks: dict[int, memoryview] = {}
+        self.length = 0
+        self.highest_block_number = 0
+        self.last_block_number: int | None = None
+
+    @property
+    def is_complete(self) -> bool:
+        """Return True when the last block and all blocks before it have been received."""
+        return (
+            self.last_block_number is not None
+            and len(self.blocks) >= self.last_block_number
+        )
+
+    def add(self, block_number: int, block_data: memoryview, is_last: bool) -> bool:
+        """Add block data. Return True when received after a block with higher number."""
+        is_out_of_order = block_number < self.highest_block_number
+        self.highest_block_number = max(self.highest_block_number, block_number)
+        self.blocks[block_number] = block_data
+        self.length += len(block_data)
+        if is_last:
+            self.last_block_number = block_number
+        return is_out_of_order
+
+    def join(self) -> bytes:
+        """Join LLC header and block data of complete APDU."""
+        assert self.last_block_number is not None
+        apdu_parts: list[bytes | memoryview] = [self.llc_header]
+        apdu_parts.extend(
+            self.blocks[number] for number in range(1, self.last_block_number + 1)
+        )
+        return b"".join(apdu_parts)
+
+
+class GeneralBlockTransferReassembler:
+    """
+    Reassemble DLMS general-block-transfer blocks to one APDU.
+
+    Block data is collected by block number, starting at block number 1. When the last block
+    and all blocks before it have been received, the block data is joined once and returned as
+    one DlmsMessage. The LLC header of the first block is kept, so the message payload can be
+    decoded as frame content.
+
+    Messages not containing a general-block-transfer APDU are passed on as is. Use one instance
+    per connection, as the collected block data is limited by max APDU length. An incomplete
+    APDU is dropped when the next block is not received within the block timeout.
+    """
+
+    DEFAULT_MAX_APDU_LENGTH: int = 65536
+    DEFAULT_BLOCK_TIMEOUT_SEC: float = 5.0
+
+    def __init__(
+        self,
+        max_apdu_length: int = DEFAULT_MAX_APDU_LENGTH,
+        block_timeout_sec: float = DEFAULT_BLOCK_TIMEOUT_SEC,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize GeneralBlockTransferReassembler.
+
+        :param max_apdu_length: max length of the reassembled APDU.
+        :param block_timeout_sec: max time between two blocks of an APDU.
+        :param clock: clock in seconds used for block timeout.
+        """
+        if max_apdu_length < 1 or block_timeout_sec <= 0:
+            raise ValueError("Max APDU length and block timeout must be positive.")
+        self._max_apdu_length = max_apdu_length
+        self._block_timeout_sec = block_timeout_sec
+        self._clock = clock
+        self._last_block_time = 0.0
+        self._apdu: _ApduBlocks | None = None
+        self._is_skipping_blocks = False
+        self._statistics = GeneralBlockTransferStatistics()
+
+    @property
+    def is_reassembling(self) -> bool:
+        """Return True when blocks of an incomplete APDU have been received."""
+        return self._apdu is not None and len(self._apdu.blocks) > 0
+
+    @property
+    def statistics(self) -> GeneralBlockTransferStatistics:
+        """Return statistics of dropped and out of order blocks."""
+        return self._statistics
+
+    def add(self, message: MeterMessageBase) -> MeterMessageBase | None:
+        """
+        Add message.
+
+        :param message: message read by a meter reader.
+        :return: the message when not a general-block-transfer block, a DlmsMessage with the
+        reassembled APDU when the APDU is complete, or None when more blocks are expected or
+        the block is dropped.
+        """
+        payload = message.payload
+        if not payload or not message.is_valid:
+            return message
+
+        position = 0
+        if payload[: cosem.LLC_HEADER_LENGTH] in cosem.LLC_HEADERS:
+            position = cosem.LLC_HEADER_LENGTH
+        if len(payload) <= position or payload[position] != GENERAL_BLOCK_TRANSFER_TAG:
+            return message
+
+        block = _parse_block(payload, position)
+        if block is None:
+            _LOGGER.debug("Invalid general-block-transfer block: %s", payload.hex())
+            self._statistics.dropped_blocks += 1
+            return None
+
+        self._check_block_timeout()
+
+        block_control, block_number, block_data = block
+        if block_number == 1:
+            self._drop_incomplete_apdu()
+            self._is_skipping_blocks = False
+            self._apdu = _ApduBlocks(payload[:position])
+
+        apdu = self._add_block(
+            block_number, block_data, (block_control & _LAST_BLOCK) == _LAST_BLOCK
+        )
+        if apdu is None:
+            return None
+
+        reassembled = DlmsMessage(apdu.join())
+        self._clear()
+        return reassembled
+
+    def _add_block(
+        self, block_number: int, block_data: memoryview, is_last_block: bool
+    ) -> _ApduBlocks | None:
+        """Add block to current APDU. Return the APDU when complete."""
+        apdu = self._apdu
+        if self._is_skipping_blocks or apdu is None:
+            _LOGGER.debug("Drop block %d without first block.", block_number)
+            self._statistics.dropped_blocks += 1
+            return None
+
+        if block_number in apdu.blocks:
+            self._statistics.duplicate_blocks += 1
+            return None
+
+        if apdu.length + len(block_data) > self._max_apdu_length:
+            _LOGGER.debug(
+                "Max APDU length %d exceeded. Drop APDU.", self._max_apdu_length
+            )
+            self._statistics.oversize_apdus += 1
+            self._statistics.dropped_blocks += len(apdu.blocks) + 1
+            self._clear()
+            self._is_skipping_blocks = not is_last_block
+            return None
+
+        if apdu.add(block_number, block_data, is_last_block):
+            self._statistics.out_of_order_blocks += 1
+
+        if not apdu.is_complete:
+            return None
+
+        assert apdu.last_block_number is not None
+        if apdu.highest_block_number > apdu.last_block_number:
+            self._drop_incomplete_apdu()
+            return None
+
+        return apdu
+
+    def _check_block_timeout(self) -> None:
+        now = self._clock()
+        if (
+            self.is_reassembling
+            and now - self._last_block_time > self._block_timeout_sec
+        ):
+            _LOGGER.debug("Timeout waiting for next block. Drop APDU.")
+            self._statistics.timeouts += 1
+            self._drop_incomplete_apdu()
+        self._last_block_time = now
+
+    def _drop_incomplete_apdu(self) -> None:
+        if self._apdu is not None and self._apdu.blocks:
+            _LOGGER.debug("Drop incomplete APDU of %d blocks.", len(self._apdu.blocks))
+            self._statistics.incomplete_apdus += 1
+            self._statistics.dropped_blocks += len(self._apdu.blocks)
+        self._clear()
+
+    def _clear(self) -> None:
+        self._apdu = None
+
+
+def _parse_block(payload: bytes, position: int) -> tuple[int, int, memoryview] | None:
+    """Parse block at position. Return block-control, block-number and block-data."""
+    if len(payload) < position + _BLOCK_HEADER_LENGTH + 1:
+        return None
+
+    block_control = payload[position + 1]
+    block_number = int.from_bytes(payload[position + 2 : position + 4], "big")
+    position += _BLOCK_HEADER_LENGTH
+
+    # block-data is an A-XDR octet-string
+    length, position = cosem.read_axdr_length(payload, position)
+
+    if block_number == 0 or position + length != len(payload):
+        return None
+
+    return block_control, block_number, memoryview(payload)[position:]
+
+
+class GeneralBlockTransferReader(MeterReaderBase[MeterMessageBase]):
+    """
+    Use this class to reassemble general-block-transfer blocks read by another meter reader.
+
+    Messages not containing general-block-transfer blocks are returned as is.
+    """
+
+    def __init__(
+        self,
+        message_reader: MeterReaderBase,
+        reassembler: GeneralBlockTransferReassembler | None = None,
+    ) -> None:
+        """
+        Initialize GeneralBlockTransferReader.
+
+        :param message_reader: reader of messages containing the blocks.
+        :param reassembler: block reassembler. Default is reassembler with default limit.
+        """
+        self._message_reader = message_reader
+        self._reassembler = (
+            reassembler if reassembler else GeneralBlockTransferReassembler()
+        )
+
+    @property
+    def is_in_hunt_mode(self) -> bool:
+        """Return True when reader is hunting for start of message."""
+        return self._message_reader.is_in_hunt_mode
+
+    @property
+    def reassembler(self) -> GeneralBlockTransferReassembler:
+        """Return block reassembler."""
+        return self._reassembler
+
+    def read(self, data_chunk: bytes | memoryview) -> list[MeterMessageBase]:
+        """
+        Call this function to read chunks of bytes.
+
+        :param data_chunk: next bytes to parsed.
+        :return: messages and reassembled APDUs when complete.
+        """
+        return self._reassemble(self._message_reader.read(data_chunk))
+
+    def idle(self) -> list[MeterMessageBase]:
+        """
+        Call this function when no bytes have been received for a while (idle gap).
+
+        :return: messages and reassembled APDUs completed by the idle gap.
+        """
+        return self._reassemble(self._message_reader.idle())
+
+    def _reassemble(self, messages: list[MeterMessageBase]) -> list[MeterMessageBase]:
+        reassembled_messages: list[MeterMessageBase] = []
+        for message in messages:
+            reassembled = self._reassembler.add(message)
+            if reassembled is not None:
+                reassembled_messages.append(reassembled)
+        return reassembled_messages
@@ -0,0 +1,239 @@
+"""
+Generic decoding support for meters sending self-describing DLMS data notifications.
+
+The notification body is a tree of A-XDR encoded COSEM data. The tree is walked once,
+and each OBIS code is paired with the following value and optional scaler and unit.
+No meter specific layout is needed, but meter specific conventions (like scaling
+that is not part of the data) are not applied.
+"""
+from __future__ import annotations
+
+import struct
+from datetime import datetime
+from typing import Any, Tuple
+
+import construct  # type: ignore
+
+from han import cosem, obis_map
+
+# COSEM common data type codes. See COSEM blue Book table 2 (Common data types).
+_NULL_DATA = 0
+_ARRAY = 1
+_STRUCTURE = 2
+_BIT_STRING = 4
+_OCTET_STRING = 9
+_VISIBLE_STRING = 10
+_UTF8_STRING = 12
+_INTEGER = 15
+_ENUM = 22
+
+# Fixed length data types
+_fixed_length_types: dict[int, struct.Struct] = {
+    3: struct.Struct(">?"),  # boolean
+    5: struct.Struct(">i"),  # double-long
+    6: struct.Struct(">I"),  # double-long-unsigned
+    13: struct.Struct(">B"),  # bcd
+    15: struct.Struct(">b"),  # integer
+    16: struct.Struct(">h"),  # long
+    17: struct.Struct(">B"),  # unsigned
+    18: struct.Struct(">H"),  # long-unsigned
+    20: struct.Struct(">q"),  # long64
+    21: struct.Struct(">Q"),  # long64-unsigned
+    22: struct.Struct(">B"),  # enum
+    23: struct.Struct(">f"),  # float32
+    24: struct.Struct(">d"),  # float64
+}
+
+# Data types without length prefix that are kept as bytes: date-time, date and time
+_fixed_length_octet_types: dict[int, int] = {25: 12, 26: 5, 27: 4}
+
+_APDU_TAG_DATA_NOTIFICATION = 0x0F
+_OBIS_CODE_LENGTH = 6
+_DATE_TIME_LENGTH = 12
+
+# Pseudo type code of scaler-unit structure (scaler exponent, unit)
+_SCALER_UNIT = -1
+
+# Data type code and value of a leaf in the data tree
+_Leaf = Tuple[int, Any]
+
+# Max nesting depth of arrays and structures. Meters nest a few levels only.
+_MAX_DEPTH = 16
+
+
+def _is_scaler_unit(data: bytes, position: int) -> bool:
+    """Return True when the structure of two at position is a scaler and unit."""
+    return data[position] == _INTEGER and data[position + 2] == _ENUM
+
+
+def _read_data(data: bytes, position: int, leaves: list[_Leaf], depth: int = 0) -> int:
+    """Read data at position and append leaves of data tree. Return position after data."""
+    type_code = data[position]
+    position += 1
+
+    fixed_length_type = _fixed_length_types.get(type_code)
+    if fixed_length_type is not None:
+        leaves.append((type_code, fixed_length_type.unpack_from(data, position)[0]))
+        return position + fixed_length_type.size
+
+    if type_code in (_ARRAY, _STRUCTURE):
+        count, position = cosem.read_axdr_length(data, position)
+        if type_code == _STRUCTURE and count == 2 and _is_scaler_unit(data, position):
+            leaves.append(
+                (
+                    _SCALER_UNIT,
+                    (
+                        struct.unpack_from(">b", data, position + 1)[0],
+                        data[position + 3],
+                    ),
+                )
+            )
+            return position + 4
+        if depth >= _MAX_DEPTH:
+            raise ValueError(
+                f"Data nested deeper than {_MAX_DEPTH} levels at position {position}."
+            )
+        for _ in range(count):
+            position = _read_data(data, position, leaves, depth + 1)
+        return position
+
+    if type_code in (_OCTET_STRING, _VISIBLE_STRING, _UTF8_STRING, _BIT_STRING):
+        length, position = cosem.read_axdr_length(data, position)
+        if type_code == _BIT_STRING:
+            length = (length + 7) // 8
+        end = position + length
+        if end > len(data):
+            raise ValueError(f"Data of type {type_code} ends after end of data.")
+        leaves.append((type_code, data[position:end]))
+        return end
+
+    octet_length = _fixed_length_octet_types.get(type_code)
+    if octet_length is not None:
+        leaves.append((type_code, data[position : position + octet_length]))
+        return position + octet_length
+
+    if type_code == _NULL_DATA:
+        return position
+
+    raise ValueError(f"Unsupported data type {type_code} at position {position - 1}.")
+
+
+def _convert_value(
+    type_code: int, value: Any, scaler_unit: tuple[int, int] | None
+) -> Any:
+    if type_code == _OCTET_STRING:
+        if len(value) == _DATE_TIME_LENGTH:
+            try:
+                return cosem.DateTime.parse(
+                    bytes((_DATE_TIME_LENGTH,)) + value
+                ).datetime
+            except (ValueError, construct.ConstructError):
+                # not a date-time, but other octet-string of the same length
+                pass
+        try:
+            return value.decode("ascii")
+        except UnicodeDecodeError:
+            return value.hex()
+
+    if type_code in (_VISIBLE_STRING, _UTF8_STRING):
+        return value.decode("ascii" if type_code == _VISIBLE_STRING else "utf-8")
+
+    if scaler_unit is not None and isinstance(value, int):
+        exponent = scaler_unit[0]
+        if exponent != 0 and value != 0:
+            return cosem.scale_to_float(value, exponent)
+
+    return value
+
+
+def _pair_leaves(
+    leaves: list[_Leaf],
+) -> dict[str, str | int | float | datetime]:
+    """Pair OBIS codes with the following value and scaler-unit."""
+    dictionary: dict[str, str | int | float | datetime] = {}
+
+    obis: bytes | None = None
+    value: _Leaf | None = None
+    scaler_unit: tuple[int, int] | None = None
+
+    def add_pair() -> None:
+        if obis is not None and value is not None:
+            dictionary[obis_map.get_element_name(obis)] = _convert_value(
+                value[0], value[1], scaler_unit
+            )
+
+    for leaf in leaves:
+        type_code, leaf_value = leaf
+        if type_code == _SCALER_UNIT:
+            scaler_unit = leaf_value
+        elif (
+            type_code == _OCTET_STRING
+            and len(leaf_value) == _OBIS_CODE_LENGTH
+            and (obis is None or value is not None)
+        ):
+            add_pair()
+            obis, value, scaler_unit = leaf_value, None, None
+        elif obis is None:
+            # list version identifier is sent without OBIS code by some meters
+            if type_code == _VISIBLE_STRING and not dictionary:
+                dictionary[obis_map.FIELD_OBIS_LIST_VER_ID] = _convert_value(
+                    type_code, leaf_value, None
+                )
+        elif value is None:
+            value = leaf
+
+    add_pair()
+
+    if not dictionary:
+        raise ValueError("No OBIS code and value pairs found.")
+
+    return dictionary
+
+
+def _decode_data(data: bytes, position: int) -> dict[str, str | int | float | datetime]:
+    leaves: list[_Leaf] = []
+    try:
+        _read_data(data, position, leaves)
+    except (IndexError, struct.error) as ex:
+        raise ValueError("Unexpected end of data.") from ex
+    return _pair_leaves(leaves)
+
+
+def decode_notification_body(
+    notification_body: bytes,
+) -> dict[str, str | int | float | datetime]:
+    """Decode APDU notification body as a dictionary."""
+    return _decode_data(notification_body, 0)
+
+
+def decode_apdu(apdu: bytes) -> dict[str, str | int | float | datetime]:
+    """Decode data-notification APDU as a dictionary."""
+    if len(apdu) < 6 or apdu[0] != _APDU_TAG_DATA_NOTIFICATION:
+        raise ValueError("Not a data-notification APDU.")
+
+    # skip tag and long-invoke-id-and-priority
+    position = 5
+    date_time: datetime | None = None
+    if apdu[position] == _NULL_DATA:
+        position += 1
+    else:
+        if apdu[position] == _OCTET_STRING:
+            position += 1
+        try:
+            date_time = cosem.DateTime.parse(apdu[position : position + 13]).datetime
+        except construct.ConstructError as ex:
+            raise ValueError("Invalid data-notification date-time.") from ex
+        position += 13
+
+    dictionary = _decode_data(apdu, position)
+    if date_time is not None and obis_map.FIELD_METER_DATETIME not in dictionary:
+        dictionary[obis_map.FIELD_METER_DATETIME] = date_time
+    return dictionary
+
+
+def decode_frame_content(
+    frame_content: bytes,
+) -> dict[str, str | int | float | datetime]:
+    """Decode LLC PDU frame content as a dictionary."""
+    # skip LLC: dsap, ssap, control
+    return decode_apdu(frame_content[3:])
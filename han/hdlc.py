@@ -2,7 +2,9 @@
 from __future__ import annotations
 
 import logging
-from typing import cast
+import time
+from dataclasses import dataclass
+from typing import Callable, cast
 
 from han import fastframecheck
 from han.common import MeterMessageBase, MeterMessageType, MeterReaderBase
@@ -278,6 +280,19 @@ class HdlcFrame(MeterMessageBase):
             return bytes(self._frame_data[info_position:-2])
         return None
 
+    @property
+    def information(self) -> memoryview | None:
+        """
+        Information field as a view of the frame data when the field has been read.
+
+        No data is copied. Only use this for complete frames, as the frame data can not be
+        appended while the view is in use.
+        """
+        info_position = self._header.information_position
+        if info_position is not None and len(self._frame_data) > info_position:
+            return memoryview(self._frame_data)[info_position:-2]
+        return None
+
 
 class HdlcFrameReader(MeterReaderBase[HdlcFrame]):
     """Use this class to HDLC-frames as stream of bytes."""
@@ -314,7 +329,7 @@ class HdlcFrameReader(MeterReaderBase[HdlcFrame]):
         """Return True when reader is hunting for start of frame."""
         return self._frame is None
 
-    def read(self, data_chunk: bytes) -> list[HdlcFrame]:
+    def read(self, data_chunk: bytes | memoryview) -> list[HdlcFrame]:
         """
         Call this function to read chunks of bytes.
 
@@ -435,6 +450,276 @@ class HdlcFrameReader(MeterReaderBase[HdlcFrame]):
         self._buffer.trim_buffer_to_flag_or_end()
 
 
+class HdlcSegmentedMessage(MeterMessageBase):
+    """Message reassembled from the information fields of segmented HDLC frames."""
+
+    def __init__(self, frames: list[HdlcFrame], payload: bytes) -> None:
+        """
+        Initialize HdlcSegmentedMessage.
+
+        Used by HdlcSegmentReassembler.
+        """
+        super().__init__()
+        self._frames = frames
+        self._payload = payload
+
+    @property
+    def message_type(self) -> MeterMessageType:
+        """Return MeterMessageType of message."""
+        return MeterMessageType.HDLC_DLMS
+
+    @property
+    def is_valid(self) -> bool:
+        """Return True, as only valid frames are reassembled."""
+        return True
+
+    @property
+    def as_bytes(self) -> bytes:
+        """Return data bytes of all frames."""
+        return b"".join(frame.as_bytes for frame in self._frames)
+
+    @property
+    def payload(self) -> bytes:
+        """Information fields of all frames (the payload)."""
+        return self._payload
+
+    @property
+    def frames(self) -> list[HdlcFrame]:
+        """Frames of message."""
+        return self._frames
+
+
+@dataclass
+class HdlcSegmentReassemblerStatistics:
+    """Statistics of segments discarded by HdlcSegmentReassembler."""
+
+    discarded_segments: int = 0
+    """Number of segmented frames discarded without being part of a reassembled message."""
+
+    timeouts: int = 0
+    """Number of incomplete messages discarded for too long time between segments."""
+
+    oversize_messages: int = 0
+    """Number of messages discarded for being longer than max message length."""
+
+    interrupted_messages: int = 0
+    """Number of incomplete messages discarded by invalid frame or frame from other address."""
+
+
+class _MessageSegments:
+    """Frames and information fields of one segmented message being reassembled."""
+
+    def __init__(self) -> None:
+        self.frames: list[HdlcFrame] = []
+        self.segments: list[memoryview] = []
+        self.length = 0
+
+    def add(self, frame: HdlcFrame, information: memoryview | None) -> None:
+        """Add frame and its information field."""
+        self.frames.append(frame)
+        if information is not None:
+            self.segments.append(information)
+            self.length += len(information)
+
+    def join(self) -> HdlcSegmentedMessage:
+        """Join information fields of complete message."""
+        return HdlcSegmentedMessage(self.frames, b"".join(self.segments))
+
+
+class HdlcSegmentReassembler:
+    """
+    Reassemble segmented HDLC frames to one message.
+
+    Frames having the segmentation flag set are collected until the frame without the flag,
+    and the information fields are joined once when the message is complete.
+    Frames that are not segmented are passed on as is.
+
+    Message length and time between segments are limited. An incomplete message is
+    discarded when a limit is exceeded, when an invalid frame is received, or when a frame
+    from another address is received. The segment timeout is checked when the next frame
+    is added and by check_timeout(), so call check_timeout() (like HdlcSegmentReassemblingReader
+    does at idle gaps) to not keep an incomplete message of a silent link.
+    """
+
+    DEFAULT_MAX_MESSAGE_LENGTH: int = 65536
+    DEFAULT_SEGMENT_TIMEOUT_SEC: float = 5.0
+
+    def __init__(
+        self,
+        max_message_length: int = DEFAULT_MAX_MESSAGE_LENGTH,
+        segment_timeout_sec: float = DEFAULT_SEGMENT_TIMEOUT_SEC,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize HdlcSegmentReassembler.
+
+        :param max_message_length: max length of the reassembled information fields.
+        :param segment_timeout_sec: max time between two segments of a message.
+        :param clock: clock in seconds used for segment timeout.
+        """
+        if max_message_length < 1 or segment_timeout_sec <= 0:
+            raise ValueError("Max message length and segment timeout must be positive.")
+        self._max_message_length = max_message_length
+        self._segment_timeout_sec = segment_timeout_sec
+        self._clock = clock
+        self._message = _MessageSegments()
+        self._last_segment_time = 0.0
+        self._is_skipping_segments = False
+        self._statistics = HdlcSegmentReassemblerStatistics()
+
+    @property
+    def is_reassembling(self) -> bool:
+        """Return True when segments of an incomplete message have been received."""
+        return len(self._message.frames) > 0
+
+    @property
+    def statistics(self) -> HdlcSegmentReassemblerStatistics:
+        """Return statistics of discarded segments."""
+        return self._statistics
+
+    def check_timeout(self) -> None:
+        """Discard incomplete message when the next segment has not been received in time."""
+        self._check_timeout(self._clock())
+
+    def add(self, frame: HdlcFrame) -> MeterMessageBase | None:
+        """
+        Add complete frame.
+
+        :param frame: frame read by HdlcFrameReader.
+        :return: the frame when not segmented, the reassembled message when the last segment
+        is added, or None when more segments are expected or the frame is discarded.
+        """
+        now = self._clock()
+        self._check_timeout(now)
+
+        is_segmented = bool(frame.header.segmentation)
+
+        if not (frame.is_good_ffc and frame.is_expected_length):
+            if self.is_reassembling:
+                self._statistics.interrupted_messages += 1
+                self._discard_message()
+            self._is_skipping_segments = False
+            return frame
+
+        if self._is_skipping_segments:
+            self._statistics.discarded_segments += 1
+            self._is_skipping_segments = is_segmented
+            return None
+
+        if self.is_reassembling and not self._is_same_addresses(
+            self._message.frames[0], frame
+        ):
+            _LOGGER.debug("Got frame from other address. Discard message.")
+            self._statistics.interrupted_messages += 1
+            self._discard_message()
+
+        if not is_segmented and not self.is_reassembling:
+            return frame
+
+        information = frame.information
+        information_length = len(information) if information is not None else 0
+        if self._message.length + information_length > self._max_message_length:
+            _LOGGER.debug(
+                "Max message length %d exceeded. Discard message.",
+                self._max_message_length,
+            )
+            self._statistics.oversize_messages += 1
+            self._statistics.discarded_segments += 1
+            self._discard_message()
+            self._is_skipping_segments = is_segmented
+            return None
+
+        self._message.add(frame, information)
+        self._last_segment_time = now
+
+        if is_segmented:
+            return None
+
+        message = self._message.join()
+        self._message = _MessageSegments()
+        return message
+
+    def _check_timeout(self, now: float) -> None:
+        if (
+            self.is_reassembling
+            and now - self._last_segment_time > self._segment_timeout_sec
+        ):
+            _LOGGER.debug("Timeout waiting for next segment. Discard message.")
+            self._statistics.timeouts += 1
+            self._discard_message()
+
+    @staticmethod
+    def _is_same_addresses(first: HdlcFrame, other: HdlcFrame) -> bool:
+        return (
+            first.header.destination_address == other.header.destination_address
+            and first.header.source_address == other.header.source_address
+        )
+
+    def _discard_message(self) -> None:
+        self._statistics.discarded_segments += len(self._message.frames)
+        self._message = _MessageSegments()
+
+
+class HdlcSegmentReassemblingReader(MeterReaderBase[MeterMessageBase]):
+    """
+    Use this class to read HDLC-frames as stream of bytes and reassemble segmented frames.
+
+    Frames that are not segmented are returned as is, while segmented frames are returned
+    as one HdlcSegmentedMessage when the last segment has been read.
+    """
+
+    def __init__(
+        self,
+        frame_reader: HdlcFrameReader | None = None,
+        reassembler: HdlcSegmentReassembler | None = None,
+    ) -> None:
+        """
+        Initialize HdlcSegmentReassemblingReader.
+
+        :param frame_reader: frame reader. Default is reader without octet stuffing.
+        :param reassembler: segment reassembler. Default is reassembler with default limits.
+        """
+        self._frame_reader = frame_reader if frame_reader else HdlcFrameReader()
+        self._reassembler = reassembler if reassembler else HdlcSegmentReassembler()
+
+    @property
+    def is_in_hunt_mode(self) -> bool:
+        """Return True when reader is hunting for start of frame."""
+        return self._frame_reader.is_in_hunt_mode
+
+    @property
+    def reassembler(self) -> HdlcSegmentReassembler:
+        """Return segment reassembler."""
+        return self._reassembler
+
+    def read(self, data_chunk: bytes | memoryview) -> list[MeterMessageBase]:
+        """
+        Call this function to read chunks of bytes.
+
+        :param data_chunk: next bytes to parsed.
+        :return: frames and reassembled messages when complete.
+        """
+        return self._reassemble(self._frame_reader.read(data_chunk))
+
+    def idle(self) -> list[MeterMessageBase]:
+        """
+        Call this function when no bytes have been received for a while (idle gap).
+
+        An incomplete message is discarded when the segment timeout has passed.
+        :return: frames and reassembled messages completed by the idle gap.
+        """
+        self._reassembler.check_timeout()
+        return self._reassemble(self._frame_reader.idle())
+
+    def _reassemble(self, frames: list[HdlcFrame]) -> list[MeterMessageBase]:
+        messages: list[MeterMessageBase] = []
+        for frame in frames:
+            message = self._reassembler.add(frame)
+            if message is not None:
+                messages.append(message)
+        return messages
+
+
 class _ReaderBuffer:
     """Buffer class used by HdlcFrameReader."""
 
@@ -453,7 +738,7 @@ class _ReaderBuffer:
         self._buffer_pos += 1
         return byte
 
-    def extend(self, data_chunk: bytes) -> None:
+    def extend(self, data_chunk: bytes | memoryview) -> None:
         """Add bytes to buffer."""
         self._buffer.extend(data_chunk)
 
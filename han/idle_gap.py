@@ -0,0 +1,106 @@
+"""Use this module to read messages delimited by idle gaps (silence) in the stream of bytes."""
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+
+from han.common import DlmsMessage, MeterReaderBase
+
+_LOGGER = logging.getLogger(__name__)
+
+# Start bit, 8 data bits, parity bit and stop bit
+DEFAULT_BITS_PER_CHARACTER: int = 11
+
+
+def get_idle_gap_sec(
+    baudrate: int,
+    characters: float,
+    bits_per_character: int = DEFAULT_BITS_PER_CHARACTER,
+) -> float:
+    """
+    Get idle gap in seconds from number of character times at baudrate.
+
+    :param baudrate: serial line baudrate.
+    :param characters: number of character times of silence.
+    :param bits_per_character: bits sent per character, including start, parity and stop bits.
+    """
+    return characters * bits_per_character / baudrate
+
+
+@dataclass
+class IdleGapReaderStatistics:
+    """Statistics of data discarded by IdleGapReader."""
+
+    oversize_messages: int = 0
+    """Number of messages discarded for being longer than max message length."""
+
+
+class IdleGapReader(MeterReaderBase[DlmsMessage]):
+    """
+    Use this class to read messages delimited by idle gaps (silence).
+
+    Bytes are collected until idle() is called to signal that the stream has been idle,
+    and the collected bytes are returned as one DlmsMessage. SmartMeterBaseProtocol calls
+    idle() when created with an idle gap.
+    """
+
+    DEFAULT_MAX_MESSAGE_LENGTH: int = 8192
+
+    def __init__(self, max_message_length: int = DEFAULT_MAX_MESSAGE_LENGTH) -> None:
+        """
+        Initialize IdleGapReader.
+
+        :param max_message_length: max length of a message.
+        """
+        if max_message_length < 1:
+            raise ValueError("Max message length must be positive.")
+        self._max_message_length = max_message_length
+        self._buffer = bytearray()
+        self._is_discarding = False
+        self._statistics = IdleGapReaderStatistics()
+
+    @property
+    def is_in_hunt_mode(self) -> bool:
+        """Return True when no bytes have been received since previous idle gap."""
+        return not self._buffer and not self._is_discarding
+
+    @property
+    def statistics(self) -> IdleGapReaderStatistics:
+        """Return statistics of discarded data."""
+        return self._statistics
+
+    def read(self, data_chunk: bytes | memoryview) -> list[DlmsMessage]:
+        """
+        Call this function to read chunks of bytes.
+
+        :param data_chunk: next bytes to parsed.
+        :return: always empty list, as messages are complete when idle() is called.
+        """
+        if self._is_discarding:
+            return []
+
+        self._buffer.extend(data_chunk)
+        if len(self._buffer) > self._max_message_length:
+            _LOGGER.debug(
+                "Max message length %d exceeded. Discard message.",
+                self._max_message_length,
+            )
+            self._statistics.oversize_messages += 1
+            self._buffer.clear()
+            self._is_discarding = True
+
+        return []
+
+    def idle(self) -> list[DlmsMessage]:
+        """
+        Call this function when the stream has been idle for the idle gap.
+
+        :return: message of bytes received since previous idle gap.
+        """
+        self._is_discarding = False
+        if not self._buffer:
+            return []
+
+        message = DlmsMessage(bytes(self._buffer))
+        self._buffer.clear()
+        return [message]
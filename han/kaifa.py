@@ -4,11 +4,12 @@ from __future__ import annotations
 
 from datetime import datetime
 from enum import Enum
+from functools import partial
+from typing import Any, Callable, Optional, Tuple
 
 import construct  # type: ignore
 
 from han import cosem, obis_map
-from han.obis import Obis
 
 
 class KaifaBodyType(Enum):
@@ -52,12 +53,34 @@ NotificationBodyObisElements: construct.Struct = construct.Struct(
     ),  # expect structure
     "_fields" / construct.Int8ub,
     "length" / construct.Computed(lambda ctx: int(ctx._fields / 2)),
-    "list_items" / construct.GreedyRange(Element),
+    "list_items" / construct.Array(construct.this.length, Element),
     "_length_check"
     / construct.Check(lambda ctx: (ctx._fields / 2) == len(ctx.list_items)),
     "type" / construct.Computed(lambda _: KaifaBodyType.OBIS_ELEMENTS),
 )
 
+
+# OBIS code element start: octet-string (9) of length 6
+_OBIS_CODE_ELEMENT_START = b"\x09\x06"
+
+
+def _is_obis_elements_body(first_bytes: bytes | None) -> bool:
+    """Return True when first element of body is an OBIS code."""
+    return first_bytes is not None and first_bytes[2:4] == _OBIS_CODE_ELEMENT_START
+
+
+NotificationBody: construct.Struct = construct.FocusedSeq(
+    "body",
+    # structure tag, structure length, and type and length of first element
+    "_first_bytes" / construct.Peek(construct.Bytes(4)),
+    "body"
+    / construct.IfThenElse(
+        lambda ctx: _is_obis_elements_body(ctx._first_bytes),
+        NotificationBodyObisElements,
+        NotificationBodyValueElements,
+    ),
+)
+
 LlcPduNotificationBodyObisElements = cosem.get_llc_pdu_struct(
     NotificationBodyObisElements
 )
@@ -66,13 +89,7 @@ LlcPduNotificationBodyValueElements = cosem.get_llc_pdu_struct(
     NotificationBodyValueElements
 )
 
-LlcPdu: construct.Struct = construct.Select(
-    LlcPduNotificationBodyObisElements, LlcPduNotificationBodyValueElements
-)
-
-NotificationBody: construct.Struct = construct.Select(
-    NotificationBodyObisElements, NotificationBodyValueElements
-)
+LlcPdu: construct.Struct = cosem.get_llc_pdu_struct(NotificationBody)
 
 
 def _get_field_lists() -> list[list[str]]:
@@ -116,8 +133,6 @@ def _get_field_lists() -> list[list[str]]:
     ]
 
 
-_field_order_lists: list[list[str]] = _get_field_lists()
-
 _FIELD_SCALING = {
     obis_map.FIELD_CURRENT_L1: -3,
     obis_map.FIELD_CURRENT_L2: -3,
@@ -127,6 +142,37 @@ _FIELD_SCALING = {
     obis_map.FIELD_VOLTAGE_L3: -1,
 }
 
+# Field name and value converter (None when value is used as is)
+_FieldPlan = Tuple[str, Optional[Callable[[Any], Any]]]
+
+
+def _datetime_value(value: Any) -> datetime:
+    return value.datetime
+
+
+# Field plans of scaled fields by field name
+_scaled_field_plans: dict[str, _FieldPlan] = {
+    element_name: (element_name, partial(cosem.scale_to_float, exponent=scale))
+    for element_name, scale in _FIELD_SCALING.items()
+}
+
+
+def _get_scaled_field_plan(element_name: str) -> _FieldPlan:
+    plan = _scaled_field_plans.get(element_name)
+    return plan if plan else (element_name, None)
+
+
+def _get_value_element_plan(element_name: str) -> _FieldPlan:
+    if element_name == obis_map.FIELD_METER_DATETIME:
+        return (element_name, _datetime_value)
+    return _get_scaled_field_plan(element_name)
+
+
+# Field plans of value element lists by number of elements
+_value_element_plans: dict[int, list[_FieldPlan]] = {
+    len(field_list): [_get_value_element_plan(name) for name in field_list]
+    for field_list in _get_field_lists()
+}
 
 def _normalize_parsed_value_elements(
     parsed: construct.Struct,
@@ -143,22 +189,12 @@ def _normalize_parsed_value_elements(
 
     list_items = notification_body.list_items
 
-    current_list_names: list[str] = next(
-        (x for x in _field_order_lists if len(x) == len(list_items)), []
-    )
+    field_plans = _value_element_plans.get(len(list_items))
+    if field_plans is None:
+        raise ValueError(f"Unexpected number of list elements: {len(list_items)}")
 
-    for measure in list_items:
-        element_name = current_list_names[measure.index]
-
-        if element_name == obis_map.FIELD_METER_DATETIME:
-            dictionary[element_name] = measure.value.datetime
-        else:
-            scale = _FIELD_SCALING.get(element_name, None)
-            if scale:
-                scaled_value = round(measure.value * (10**scale), abs(scale))
-                dictionary[element_name] = scaled_value
-            else:
-                dictionary[element_name] = measure.value
+    for (element_name, convert), measure in zip(field_plans, list_items):
+        dictionary[element_name] = convert(measure.value) if convert else measure.value
 
     return dictionary
 
@@ -176,21 +212,15 @@ def _normalize_parsed_obis_elements(
         list_items = parsed.list_items
 
     for measure in list_items:
-        obis_group_cdr = Obis.from_string(measure.obis).to_group_cdr_str()
-        if obis_group_cdr in obis_map.obis_name_map:
-            element_name = obis_map.obis_name_map[obis_group_cdr]
-        else:
-            element_name = obis_group_cdr
-
+        element_name, convert = _get_scaled_field_plan(
+            obis_map.get_element_name(measure.obis)
+        )
         if hasattr(measure.value, "datetime"):
             dictionary[element_name] = measure.value.datetime
         else:
-            scale = _FIELD_SCALING.get(element_name, None)
-            if scale:
-                scaled_value = round(measure.value * (10**scale), abs(scale))
-                dictionary[element_name] = scaled_value
-            else:
-                dictionary[element_name] = measure.value
+            dictionary[element_name] = (
+                convert(measure.value) if convert else measure.value
+            )
 
     return dictionary
 
@@ -3,11 +3,11 @@
 from __future__ import annotations
 
 from datetime import datetime
+from typing import Any
 
 import construct  # type: ignore
 
 from han import cosem, obis_map
-from han.obis import Obis
 
 Element: construct.Struct = construct.Struct(
     "_element_type" / construct.Peek(cosem.CommonDataTypes),
@@ -23,15 +23,61 @@ Element: construct.Struct = construct.Struct(
         cosem.DateTimeField,
         cosem.Field,
     ),
-    "_NullData" / cosem.NullData,  # trim null-data between elements
 )
 
+_NULL_DATA = 0  # type code of null-data
+
+
+class _StructureElements(construct.Construct):
+    """
+    Elements of a structure with a known number of fields.
+
+    An element is an optional OBIS code field followed by a value field, and null-data
+    fields between elements are skipped. Elements are parsed until the number of fields
+    of the structure has been read. Building writes the elements only, without null-data.
+    """
+
+    def __init__(self, field_count: Any) -> None:
+        super().__init__()
+        self.field_count = field_count
+
+    def _parse(self, stream, context, path):
+        field_count = construct.evaluate(self.field_count, context)
+        list_items = construct.ListContainer()
+        fields_read = 0
+        while fields_read < field_count:
+            if construct.stream_read(stream, 1, path)[0] == _NULL_DATA:
+                fields_read += 1
+                continue
+            construct.stream_seek(stream, -1, 1, path)
+
+            element = Element._parsereport(stream, context, path)
+            list_items.append(element)
+            fields_read += 1 if element.obis is None else 2
+
+        if fields_read != field_count:
+            raise construct.ValidationError(
+                f"element crosses end of structure of {field_count} fields", path=path
+            )
+
+        return list_items
+
+    def _build(self, obj, stream, context, path):
+        list_items = construct.ListContainer()
+        for element in obj:
+            list_items.append(Element._build(element, stream, context, path))
+        return list_items
+
+    def _sizeof(self, context, path):
+        raise construct.SizeofError(path=path)
+
+
 NotificationBody: construct.Struct = construct.Struct(
     construct.Const(
         cosem.CommonDataTypes.structure, cosem.CommonDataTypes
     ),  # expect structure
     "length" / construct.Int8ub,
-    "list_items" / construct.GreedyRange(Element),
+    "list_items" / _StructureElements(construct.this.length),
 )
 
 LlcPdu: construct.Struct = cosem.get_llc_pdu_struct(NotificationBody)
@@ -57,67 +103,144 @@ _field_scaling_ct_meter = {
 }
 
 
-def _normalize_parsed_items(
-    list_items: construct.ListContainer,
-) -> dict[str, str | int | float | datetime]:
-    dictionary: dict[str, str | int | float | datetime] = {
-        obis_map.FIELD_METER_MANUFACTURER: "Kamstrup",
-    }
-
-    meter_type = next((x for x in list_items if x.obis == "1.1.96.1.1.256"), None)
-    is_ct_meter = meter_type is not None and meter_type.startswith("685")
-    field_scaling = _field_scaling_ct_meter if is_ct_meter else _field_scaling_standard
-
-    for measure in list_items:
-        # list version is the only element without obis code
-        element_name = (
-            obis_map.obis_name_map[Obis.from_string(measure.obis).to_group_cdr_str()]
-            if measure.obis
-            else obis_map.FIELD_OBIS_LIST_VER_ID
+# Scale multipliers by OBIS code for standard and CT meters
+_field_multipliers_standard = {
+    obis: cosem.scale_multiplier(scale)
+    for obis, scale in _field_scaling_standard.items()
+}
+_field_multipliers_ct_meter = {
+    obis: cosem.scale_multiplier(scale)
+    for obis, scale in _field_scaling_ct_meter.items()
+}
+
+_METER_TYPE_OBIS = "1.1.96.1.1.255"
+
+
+class DecodingContext:
+    """
+    Decoding context of one Kamstrup meter.
+
+    The meter type is only part of list 2 and 3, and never changes for a meter. The context
+    remembers whether the meter is a CT meter, so that frames without meter type (list 1)
+    are scaled correctly. Frames are only searched for the meter type until it has been
+    received, so later frames are not examined.
+    Use one context per meter connection.
+    """
+
+    def __init__(self) -> None:
+        """Initialize DecodingContext."""
+        self._meter_type: str | None = None
+        self._is_ct_meter = False
+
+    @property
+    def meter_type(self) -> str | None:
+        """Return meter type when received, or None."""
+        return self._meter_type
+
+    @property
+    def is_ct_meter(self) -> bool:
+        """Return True when meter type of a CT meter has been received."""
+        return self._is_ct_meter
+
+    def update_meter_type(self, meter_type: str) -> None:
+        """Update context with meter type received from meter."""
+        if meter_type != self._meter_type:
+            self._meter_type = meter_type
+            self._is_ct_meter = meter_type.startswith("685")
+
+    def normalize_parsed_items(
+        self, list_items: construct.ListContainer
+    ) -> dict[str, str | int | float | datetime]:
+        """Convert list items to a dictionary with common key names."""
+        if self._meter_type is None:
+            for measure in list_items:
+                if measure.obis == _METER_TYPE_OBIS and isinstance(measure.value, str):
+                    self.update_meter_type(measure.value)
+                    break
+
+        multipliers = (
+            _field_multipliers_ct_meter
+            if self._is_ct_meter
+            else _field_multipliers_standard
         )
 
-        if element_name == obis_map.FIELD_METER_DATETIME:
-            dictionary[element_name] = measure.value.datetime
-        else:
-            if isinstance(measure.value, int):
-                scale = field_scaling.get(measure.obis, None)
-                if scale:
-                    dictionary[element_name] = measure.value * (10**scale)
-                else:
-                    dictionary[element_name] = measure.value
+        dictionary: dict[str, str | int | float | datetime] = {
+            obis_map.FIELD_METER_MANUFACTURER: "Kamstrup",
+        }
+
+        for measure in list_items:
+            obis = measure.obis
+            if obis:
+                element_name = obis_map.get_element_name(obis)
+                multiplier = multipliers.get(obis)
+            else:
+                # list version is the only element without obis code
+                element_name = obis_map.FIELD_OBIS_LIST_VER_ID
+                multiplier = None
+            value = measure.value
+            if element_name == obis_map.FIELD_METER_DATETIME:
+                dictionary[element_name] = value.datetime
+            elif multiplier is not None and isinstance(value, int):
+                dictionary[element_name] = value * multiplier
             else:
-                dictionary[element_name] = measure.value
+                dictionary[element_name] = value
+
+        return dictionary
 
-    return dictionary
+    def normalize_parsed_frame(
+        self, frame: construct.Struct
+    ) -> dict[str, str | int | float | datetime]:
+        """Convert data from meters construct structure to a dictionary with common key names."""
+        dictionary = self.normalize_parsed_items(
+            frame.information.notification_body.list_items
+        )
+        dictionary[obis_map.FIELD_METER_DATETIME] = frame.information.DateTime.datetime
+        return dictionary
+
+    def normalize_parsed_notification(
+        self, notification: construct.Struct
+    ) -> dict[str, str | int | float | datetime]:
+        """Convert data from meters construct structure to a dictionary with common key names."""
+        return self.normalize_parsed_items(notification.list_items)
+
+    def decode_frame_content(
+        self, frame_content: bytes
+    ) -> dict[str, str | int | float | datetime]:
+        """Decode meter LLC PDU frame content as a dictionary."""
+        return self.normalize_parsed_frame(LlcPdu.parse(frame_content))
+
+    def decode_notification_body(
+        self, notification_body: bytes
+    ) -> dict[str, str | int | float | datetime]:
+        """Decode meter APDU notification body as a dictionary."""
+        return self.normalize_parsed_notification(
+            NotificationBody.parse(notification_body)
+        )
 
 
 def normalize_parsed_frame(
     frame: construct.Struct,
 ) -> dict[str, str | int | float | datetime]:
     """Convert data from meters construct structure to a dictionary with common key names."""
-    dictionary = _normalize_parsed_items(frame.information.notification_body.list_items)
-    dictionary[obis_map.FIELD_METER_DATETIME] = frame.information.DateTime.datetime
-    return dictionary
+    return DecodingContext().normalize_parsed_frame(frame)
 
 
 def normalize_parsed_notification(
     notification: construct.Struct,
 ) -> dict[str, str | int | float | datetime]:
     """Convert data from meters construct structure to a dictionary with common key names."""
-    return _normalize_parsed_items(notification.list_items)
+    return DecodingContext().normalize_parsed_notification(notification)
 
 
 def decode_frame_content(
     frame_content: bytes,
 ) -> dict[str, str | int | float | datetime]:
     """Decode meter LLC PDU frame content as a dictionary."""
-    parsed = LlcPdu.parse(frame_content)
-    return normalize_parsed_frame(parsed)
+    return DecodingContext().decode_frame_content(frame_content)
 
 
 def decode_notification_body(
     notification_body: bytes,
 ) -> dict[str, str | int | float | datetime]:
     """Decode meter APDU notification body as a dictionary."""
-    parsed = NotificationBody.parse(notification_body)
-    return normalize_parsed_notification(parsed)
+    return DecodingContext().decode_notification_body(notification_body)
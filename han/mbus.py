@@ -0,0 +1,199 @@
+"""Use this module to read M-Bus long frames (EN 13757-2)."""
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+
+from han.common import MeterMessageBase, MeterMessageType, MeterReaderBase
+
+_LOGGER = logging.getLogger(__name__)
+
+# Start of long frame: start, L-field, L-field (repeated), start
+_START = 0x68
+_STOP = 0x16
+_HEADER_LENGTH = 4
+
+# Control, address and control information fields following the header
+_CONTROL_POSITION = 4
+_ADDRESS_POSITION = 5
+_CONTROL_INFORMATION_POSITION = 6
+_USER_DATA_POSITION = 7
+
+# Length of header, checksum and stop
+_FRAMING_LENGTH = 6
+
+# Minimum L-field value: control, address and control information
+_MIN_LENGTH = 3
+
+
+class MBusFrame(MeterMessageBase):
+    """M-Bus long frame."""
+
+    def __init__(self, frame_data: bytes) -> None:
+        """
+        Initialize MBusFrame.
+
+        Used by MBusFrameReader.
+        """
+        super().__init__()
+        self._frame_data = frame_data
+        self._is_good_checksum = self.checksum == _calculate_checksum(frame_data)
+
+    def __len__(self) -> int:
+        """Return frame length including start and stop."""
+        return len(self._frame_data)
+
+    @property
+    def message_type(self) -> MeterMessageType:
+        """Return MeterMessageType of message."""
+        return MeterMessageType.MBUS
+
+    @property
+    def is_valid(self) -> bool:
+        """Return True when checksum is correct."""
+        if self.is_good_checksum:
+            return True
+
+        _LOGGER.warning("Got invalid frame (bad checksum): %s", self._frame_data.hex())
+        return False
+
+    @property
+    def is_good_checksum(self) -> bool:
+        """Return True when the checksum is the same as the sum of control field to end of user data."""
+        return self._is_good_checksum
+
+    @property
+    def as_bytes(self) -> bytes:
+        """Return frame data bytes."""
+        return self._frame_data
+
+    @property
+    def length(self) -> int:
+        """Return L-field value: length of control field to end of user data."""
+        return self._frame_data[1]
+
+    @property
+    def control(self) -> int:
+        """Return control field (C-field)."""
+        return self._frame_data[_CONTROL_POSITION]
+
+    @property
+    def address(self) -> int:
+        """Return address field (A-field)."""
+        return self._frame_data[_ADDRESS_POSITION]
+
+    @property
+    def control_information(self) -> int:
+        """Return control information field (CI-field)."""
+        return self._frame_data[_CONTROL_INFORMATION_POSITION]
+
+    @property
+    def checksum(self) -> int:
+        """Return checksum field."""
+        return self._frame_data[-2]
+
+    @property
+    def payload(self) -> bytes:
+        """User data (the payload) following the control information field."""
+        return self._frame_data[_USER_DATA_POSITION:-2]
+
+
+def _calculate_checksum(frame_data: bytes) -> int:
+    """Calculate arithmetic sum (modulo 256) of control field to end of user data."""
+    return sum(frame_data[_CONTROL_POSITION:-2]) & 0xFF
+
+
+@dataclass
+class MBusFrameReaderStatistics:
+    """Statistics of data discarded by MBusFrameReader."""
+
+    discarded_bytes: int = 0
+    """Number of bytes discarded while hunting for start of frame."""
+
+
+class MBusFrameReader(MeterReaderBase[MBusFrame]):
+    """
+    Use this class to read M-Bus long frames from a stream of bytes.
+
+    Frames are located by the start character and the repeated L-field of the header.
+    The stop character must follow at the position given by the L-field, and the checksum
+    is calculated when the complete frame has been received. Single characters, short frames
+    and data between frames are discarded.
+    """
+
+    def __init__(self) -> None:
+        """Initialize MBusFrameReader."""
+        self._buffer = bytearray()
+        self._is_in_hunt_mode = True
+        self._statistics = MBusFrameReaderStatistics()
+
+    @property
+    def is_in_hunt_mode(self) -> bool:
+        """Return True when reader is hunting for start of frame."""
+        return self._is_in_hunt_mode
+
+    @property
+    def statistics(self) -> MBusFrameReaderStatistics:
+        """Return statistics of discarded data."""
+        return self._statistics
+
+    def read(self, data_chunk: bytes | memoryview) -> list[MBusFrame]:
+        """
+        Call this function to read chunks of bytes.
+
+        :param data_chunk: next bytes to parsed.
+        :return: frame when a frame is complete (both with correct and incorrect checksum).
+        """
+        frames_received: list[MBusFrame] = []
+        self._buffer.extend(data_chunk)
+
+        position = 0
+        frame_bytes = 0
+        buffer = self._buffer
+        while True:
+            start = buffer.find(_START, position)
+            if start == -1:
+                position = len(buffer)
+                self._is_in_hunt_mode = True
+                break
+
+            if len(buffer) < start + _HEADER_LENGTH:
+                position = start
+                self._is_in_hunt_mode = True
+                break
+
+            length = buffer[start + 1]
+            if (
+                buffer[start + 2] != length
+                or buffer[start + 3] != _START
+                or length < _MIN_LENGTH
+            ):
+                position = start + 1
+                continue
+
+            self._is_in_hunt_mode = False
+            end = start + length + _FRAMING_LENGTH
+            if len(buffer) < end:
+                position = start
+                break
+
+            if buffer[end - 1] != _STOP:
+                _LOGGER.debug("Missing stop character. Hunt for next frame.")
+                position = start + 1
+                continue
+
+            frame = MBusFrame(bytes(buffer[start:end]))
+            _LOGGER.debug(
+                "Frame of length %d received with %s checksum.",
+                len(frame),
+                "good" if frame.is_good_checksum else "bad",
+            )
+            frames_received.append(frame)
+            frame_bytes += len(frame)
+            position = end
+
+        if position > 0:
+            self._statistics.discarded_bytes += position - frame_bytes
+            del buffer[:position]
+
+        return frames_received
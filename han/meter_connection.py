@@ -3,27 +3,43 @@ from __future__ import annotations
 
 import datetime
 import logging
+import random
+import time
 from abc import ABCMeta, abstractmethod
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum, auto
+from heapq import heappop, heappush
 from asyncio import (
-    FIRST_COMPLETED,
     BaseTransport,
-    CancelledError,
+    BufferedProtocol,
     Event,
     Future,
     Protocol,
     Queue,
+    QueueEmpty,
+    ReadTransport,
+    Task,
+    TimerHandle,
     iscoroutinefunction,
-    sleep,
     wait,
-    create_task,
     ensure_future,
+    get_running_loop,
 )
-from typing import Awaitable, Callable, ClassVar, Sequence, Tuple
+from typing import Any, Awaitable, Callable, ClassVar, Sequence, Tuple, cast
 
 from han.common import MeterMessageBase, MeterReaderBase
+from han.dlde import ModeDReader
+from han.gbt import GeneralBlockTransferReader
+from han.hdlc import HdlcFrameReader, HdlcSegmentReassemblingReader
+from han.idle_gap import IdleGapReader
+from han.mbus import MBusFrameReader
 
 _LOGGER = logging.getLogger(__name__)
 
+# Weight of new interval in smoothed interval between received messages
+_MESSAGE_INTERVAL_SMOOTHING = 0.25
+
 
 class BackOffStrategy(metaclass=ABCMeta):
     """
@@ -44,7 +60,7 @@ class BackOffStrategy(metaclass=ABCMeta):
 
     @property
     @abstractmethod
-    def current_delay_sec(self) -> int:
+    def current_delay_sec(self) -> float:
         """Return current back-off delay in seconds."""
 
 
@@ -72,11 +88,270 @@ class ExponentialBackOff(BackOffStrategy):
         return self._delay if self._delay < self.max_delay else self.max_delay
 
 
+class FullJitterBackOff(BackOffStrategy):
+    """
+    Exponential back-off strategy with full jitter.
+
+    The delay is random between zero and the exponential delay, so connections failing at
+    the same time do not retry in lock-step.
+    """
+
+    def __init__(
+        self,
+        base_delay_sec: float = 1.0,
+        max_delay_sec: float = BackOffStrategy.DEFAULT_MAX_DELAY_SEC,
+        rng: random.Random | None = None,
+    ) -> None:
+        """
+        Initialize FullJitterBackOff.
+
+        :param base_delay_sec: max delay after first failure.
+        :param max_delay_sec: max delay.
+        :param rng: random number generator. Default is a new random.Random.
+        """
+        self.base_delay_sec = base_delay_sec
+        self.max_delay_sec = max_delay_sec
+        self._random = rng if rng else random.Random()
+        self._failures = 0
+        self._delay = 0.0
+
+    def failure(self) -> None:
+        """Call this after a failure."""
+        self._failures += 1
+        exponential_delay = self.base_delay_sec * 2 ** min(self._failures - 1, 32)
+        self._delay = self._random.uniform(
+            0, min(self.max_delay_sec, exponential_delay)
+        )
+
+    def reset(self) -> None:
+        """Call this after success to reset."""
+        self._failures = 0
+        self._delay = 0.0
+
+    @property
+    def current_delay_sec(self) -> float:
+        """Return current back-off delay in seconds."""
+        return self._delay
+
+
+class DecorrelatedJitterBackOff(BackOffStrategy):
+    """
+    Back-off strategy with decorrelated jitter.
+
+    The delay is random between the base delay and three times the previous delay, so the
+    delay grows while connections failing at the same time spread out.
+    """
+
+    def __init__(
+        self,
+        base_delay_sec: float = 1.0,
+        max_delay_sec: float = BackOffStrategy.DEFAULT_MAX_DELAY_SEC,
+        rng: random.Random | None = None,
+    ) -> None:
+        """
+        Initialize DecorrelatedJitterBackOff.
+
+        :param base_delay_sec: min delay after a failure.
+        :param max_delay_sec: max delay.
+        :param rng: random number generator. Default is a new random.Random.
+        """
+        self.base_delay_sec = base_delay_sec
+        self.max_delay_sec = max_delay_sec
+        self._random = rng if rng else random.Random()
+        self._delay = 0.0
+
+    def failure(self) -> None:
+        """Call this after a failure."""
+        previous_delay = max(self._delay, self.base_delay_sec)
+        self._delay = min(
+            self.max_delay_sec,
+            self._random.uniform(self.base_delay_sec, previous_delay * 3),
+        )
+
+    def reset(self) -> None:
+        """Call this after success to reset."""
+        self._delay = 0.0
+
+    @property
+    def current_delay_sec(self) -> float:
+        """Return current back-off delay in seconds."""
+        return self._delay
+
+
+class ReconnectRateLimiter:
+    # reserve() is the only operation of a token bucket
+    # pylint: disable=too-few-public-methods
+    """
+    Token bucket limiting the rate of connection attempts.
+
+    Share one instance between connection managers (or use with MeterHub) to spread the
+    reconnects of many connections over time, like when a gateway with many meter
+    connections reboots. A burst of connection attempts is allowed before attempts are
+    limited to the rate. Attempts reserve their token in advance, and no task or timer
+    is used by the limiter.
+    """
+
+    def __init__(
+        self,
+        rate_per_sec: float,
+        burst: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize ReconnectRateLimiter.
+
+        :param rate_per_sec: number of connection attempts per second.
+        :param burst: number of connection attempts allowed at the same time (bucket size).
+        :param clock: clock function. Must be the same clock as used by the event loop.
+        """
+        if rate_per_sec <= 0:
+            raise ValueError("Rate must be positive.")
+        if burst < 1:
+            raise ValueError("Burst must be positive.")
+        self._interval = 1 / rate_per_sec
+        self._burst_tolerance = (burst - 1) * self._interval
+        self._clock = clock
+        # time when the bucket is full again (theoretical arrival time)
+        self._full_time = 0.0
+
+    def reserve(self, delay_sec: float = 0.0) -> float:
+        """
+        Reserve token for a connection attempt.
+
+        :param delay_sec: delay until the attempt, like a back-off delay.
+        :return: delay until the attempt is allowed. Never less than delay_sec.
+        """
+        now = self._clock()
+        attempt_time = now + delay_sec
+        allowed_time = max(attempt_time, self._full_time - self._burst_tolerance)
+        self._full_time = max(self._full_time, attempt_time) + self._interval
+        return allowed_time - now
+
+
+class DeliveryPolicy(Enum):
+    """Policy used when a message is received and the destination queue is full."""
+
+    DROP_NEWEST = auto()
+    """Drop the received message."""
+
+    DROP_OLDEST = auto()
+    """
+    Remove the oldest message from the queue to make room for the received message.
+
+    With a TaggedQueue (MeterHub and TcpMeterServer), only the oldest message of the same
+    connection is removed, and the received message is dropped when the shared queue has
+    no message of the connection.
+    """
+
+    COALESCE_LATEST = auto()
+    """Keep the latest received message of the connection until the queue has room for it."""
+
+    PAUSE_READING = auto()
+    """Pause reading from the transport until the queue has room for the received messages."""
+
+
+@dataclass
+class DeliveryStatistics:
+    """Statistics of messages delivered to and dropped from the destination queue of a connection."""
+
+    delivered_messages: int = 0
+    """Number of messages put on the queue."""
+
+    dropped_messages: int = 0
+    """Number of messages dropped because the queue was full."""
+
+    paused_reading: int = 0
+    """Number of times reading from the transport has been paused because the queue was full."""
+
+
+class _IdleGapTimer:
+    """
+    Loop timer calling back when no data has been received for an idle gap.
+
+    The timer is only rescheduled when it expires before the idle gap has passed since the
+    last data was received.
+    """
+
+    def __init__(self, idle_gap_sec: float, callback: Callable[[bool], None]) -> None:
+        """
+        Initialize _IdleGapTimer.
+
+        :param idle_gap_sec: time without data before callback is called.
+        :param callback: called with True at the first idle gap, and False at later gaps.
+        """
+        self._idle_gap_sec = idle_gap_sec
+        self._callback = callback
+        self._timer: TimerHandle | None = None
+        self._last_data_time = 0.0
+        self._is_idle_gap_seen = False
+
+    def data_received(self) -> None:
+        """Restart the idle gap as data is received."""
+        loop = get_running_loop()
+        self._last_data_time = loop.time()
+        if self._timer is None:
+            self._timer = loop.call_at(
+                self._last_data_time + self._idle_gap_sec, self._timeout
+            )
+
+    def cancel(self) -> None:
+        """Cancel the timer."""
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+
+    def _timeout(self) -> None:
+        loop = get_running_loop()
+        idle_gap_end = self._last_data_time + self._idle_gap_sec
+        if loop.time() < idle_gap_end:
+            # data received since timer was started
+            self._timer = loop.call_at(idle_gap_end, self._timeout)
+            return
+
+        self._timer = None
+        is_first_idle_gap = not self._is_idle_gap_seen
+        self._is_idle_gap_seen = True
+        self._callback(is_first_idle_gap)
+
+
+class _MessageCadence:
+    # pylint: disable=too-few-public-methods
+    """Time of last received messages and smoothed interval between them."""
+
+    def __init__(self) -> None:
+        self.last_message_time: float | None = None
+        self.message_interval_sec: float | None = None
+
+    def update(self, now: float) -> None:
+        """Update cadence as messages are received."""
+        if self.last_message_time is not None:
+            interval = now - self.last_message_time
+            self.message_interval_sec = (
+                interval
+                if self.message_interval_sec is None
+                else self.message_interval_sec
+                + _MESSAGE_INTERVAL_SMOOTHING * (interval - self.message_interval_sec)
+            )
+        self.last_message_time = now
+
+
 class SmartMeterBaseProtocol(Protocol, metaclass=ABCMeta):
+    # reader selection, delivery and timer state of one connection
+    # pylint: disable=too-many-instance-attributes
     """
     Network protocol base class that reads smart meter messages from a stream.
 
     Sub classes must implement message_received().
+
+    When created with an idle gap, the readers are notified by idle() when no data has been
+    received for the idle gap. One loop timer is used, and it is only rescheduled when it
+    expires before the idle gap has passed since the last data was received. The first
+    burst of data may start in the middle of a message, so messages returned by idle() at
+    the first idle gap are discarded when there are more than one reader candidate.
+
+    Sub classes delivering messages to a queue use deliver() to apply the delivery policy
+    when the queue is bounded and full. The queue is never waited on for more than one
+    message of each connection at a time.
     """
 
     # Total number of this class that has been created.
@@ -86,19 +361,36 @@ class SmartMeterBaseProtocol(Protocol, metaclass=ABCMeta):
     def __init__(
         self,
         reader_candidates: Sequence[MeterReaderBase],
+        idle_gap_sec: float | None = None,
+        delivery_policy: DeliveryPolicy = DeliveryPolicy.DROP_NEWEST,
     ) -> None:
         """
         Initialize SmartMeterProtocol.
 
         :param reader_candidates: message reader candidates.
+        :param idle_gap_sec: time without data before readers are notified by idle(). None to disable.
+        :param delivery_policy: policy used when the destination queue is full.
         """
         super().__init__()
+        if idle_gap_sec is not None and idle_gap_sec <= 0:
+            raise ValueError("Idle gap must be positive.")
         self._done: Future[None] = Future()
         self.instance_id: int = SmartMeterBaseProtocol.total_instance_counter
         self._reader_candidates = list(reader_candidates)
         self._selected_reader: MeterReaderBase | None = None
         self._transport: BaseTransport | None = None
         self._transport_info: str | None = None
+        self._idle_gap_timer = (
+            _IdleGapTimer(idle_gap_sec, self._idle_gap_timeout)
+            if idle_gap_sec is not None
+            else None
+        )
+        self._delivery_policy = delivery_policy
+        self._delivery_statistics = DeliveryStatistics()
+        self._pending_delivery: deque[Any] = deque()
+        self._delivery_task: Task[None] | None = None
+        self._is_reading_paused = False
+        self._message_cadence = _MessageCadence()
         SmartMeterBaseProtocol.total_instance_counter += 1
 
     @property
@@ -106,6 +398,39 @@ class SmartMeterBaseProtocol(Protocol, metaclass=ABCMeta):
         """Return Awaitable that can be used to wait for connection to be lost or closed."""
         return self._done
 
+    @property
+    def last_message_time(self) -> float | None:
+        """Return event loop time when messages were last received, or None if no messages have been received."""
+        return self._message_cadence.last_message_time
+
+    @property
+    def time_since_last_message_sec(self) -> float | None:
+        """Return seconds since messages were last received, or None if no messages have been received."""
+        last_message_time = self._message_cadence.last_message_time
+        if last_message_time is None:
+            return None
+        return get_running_loop().time() - last_message_time
+
+    @property
+    def message_interval_sec(self) -> float | None:
+        """Return smoothed interval between received messages, or None if less than two messages have been received."""
+        return self._message_cadence.message_interval_sec
+
+    @property
+    def selected_reader(self) -> MeterReaderBase | None:
+        """Return reader selected from the reader candidates, or None if not selected yet."""
+        return self._selected_reader
+
+    @property
+    def delivery_policy(self) -> DeliveryPolicy:
+        """Return policy used when the destination queue is full."""
+        return self._delivery_policy
+
+    @property
+    def delivery_statistics(self) -> DeliveryStatistics:
+        """Return statistics of messages delivered to and dropped from the destination queue."""
+        return self._delivery_statistics
+
     def _set_transport_info(self) -> None:
         if self._transport:
             if hasattr(self._transport, "serial"):
@@ -172,17 +497,52 @@ class SmartMeterBaseProtocol(Protocol, metaclass=ABCMeta):
                     ex,
                 )
 
+        if self._idle_gap_timer:
+            self._idle_gap_timer.cancel()
+
+        if self._delivery_task:
+            self._delivery_task.cancel()
+            self._delivery_task = None
+        if self._pending_delivery:
+            self._delivery_statistics.dropped_messages += len(self._pending_delivery)
+            self._pending_delivery.clear()
+
         self._done.set_result(None)
 
-    def data_received(self, data: bytes) -> None:
-        """Receive data from the transport and put messages(s) on the queue if messages(s) are ready."""
+    def data_received(self, data: bytes | memoryview) -> None:
+        """
+        Receive data from the transport and put messages(s) on the queue if messages(s) are ready.
+
+        The data is a memoryview of a reused receive buffer when received by a protocol with
+        BufferedReceiveMixin, and is only valid during the call.
+        """
+        if self._idle_gap_timer:
+            self._idle_gap_timer.data_received()
+        self._read_messages(lambda reader: reader.read(data))
+
+    def _idle_gap_timeout(self, is_first_idle_gap: bool) -> None:
+        if (
+            is_first_idle_gap
+            and not self._selected_reader
+            and len(self._reader_candidates) > 1
+        ):
+            # the burst may have started mid message and must not select a reader
+            for reader in self._reader_candidates:
+                reader.idle()
+        else:
+            self._read_messages(lambda reader: reader.idle())
+
+    def _read_messages(
+        self, read: Callable[[MeterReaderBase], list[MeterMessageBase]]
+    ) -> None:
         if self._selected_reader:
-            messages = self._selected_reader.read(data)
-            for msg in messages:
-                self.message_received(msg)
+            messages = read(self._selected_reader)
+            if messages:
+                self._message_cadence.update(get_running_loop().time())
+                self.messages_received(messages)
         else:
             for reader in self._reader_candidates:
-                messages = reader.read(data)
+                messages = read(reader)
                 for msg in messages:
                     if msg.is_valid:
                         self._selected_reader = reader
@@ -190,14 +550,106 @@ class SmartMeterBaseProtocol(Protocol, metaclass=ABCMeta):
                         _LOGGER.info("Reader %s selected.", reader)
                         break
                 if self._selected_reader:
-                    for msg in messages:
-                        self.message_received(msg)
+                    self._message_cadence.update(get_running_loop().time())
+                    self.messages_received(messages)
                     break
 
+    def messages_received(self, messages: list[MeterMessageBase]) -> None:
+        """
+        Messages are received from the transport.
+
+        Called once for the messages read from each chunk of data received. The default
+        implementation calls message_received() for each message.
+        """
+        for msg in messages:
+            self.message_received(msg)
+
     @abstractmethod
     def message_received(self, message: MeterMessageBase) -> None:
         """Message is received from the transport."""
 
+    def deliver(self, queue: Queue[Any], item: Any) -> None:
+        """
+        Put item on the destination queue, applying the delivery policy when the queue is full.
+
+        :param queue: destination queue.
+        :param item: item to put on the queue.
+        """
+        if self._delivery_task is None and not queue.full():
+            queue.put_nowait(item)
+            self._delivery_statistics.delivered_messages += 1
+            return
+
+        policy = self._delivery_policy
+        if policy == DeliveryPolicy.PAUSE_READING:
+            self._pending_delivery.append(item)
+            self._pause_reading()
+            self._start_delivery_task(queue)
+            _LOGGER.debug(
+                "%s: Queue is full (%s). Reading paused.",
+                self._instance_id(),
+                policy.name,
+            )
+            return
+
+        if policy == DeliveryPolicy.DROP_OLDEST:
+            try:
+                queue.get_nowait()
+            except QueueEmpty:
+                # no message of this connection in a shared queue to remove
+                self._delivery_statistics.dropped_messages += 1
+            else:
+                queue.task_done()
+                queue.put_nowait(item)
+                self._delivery_statistics.delivered_messages += 1
+                self._delivery_statistics.dropped_messages += 1
+        elif policy == DeliveryPolicy.COALESCE_LATEST:
+            if self._pending_delivery:
+                # replace the pending message, also when it is waiting for room in the queue
+                if self._delivery_task:
+                    self._delivery_task.cancel()
+                    self._delivery_task = None
+                self._pending_delivery.clear()
+                self._delivery_statistics.dropped_messages += 1
+            self._pending_delivery.append(item)
+            self._start_delivery_task(queue)
+        else:
+            self._delivery_statistics.dropped_messages += 1
+
+        _LOGGER.debug(
+            "%s: Queue is full (%s). %d messages dropped.",
+            self._instance_id(),
+            policy.name,
+            self._delivery_statistics.dropped_messages,
+        )
+
+    def _start_delivery_task(self, queue: Queue[Any]) -> None:
+        if self._delivery_task is None:
+            self._delivery_task = get_running_loop().create_task(
+                self._deliver_pending(queue)
+            )
+
+    async def _deliver_pending(self, queue: Queue[Any]) -> None:
+        while self._pending_delivery:
+            # the message is kept pending until it is put on the queue, so it can be replaced
+            # while waiting for room, and is counted as dropped if the connection is lost.
+            await queue.put(self._pending_delivery[0])
+            self._pending_delivery.popleft()
+            self._delivery_statistics.delivered_messages += 1
+        self._delivery_task = None
+        self._resume_reading()
+
+    def _pause_reading(self) -> None:
+        if self._transport and not self._is_reading_paused:
+            cast(ReadTransport, self._transport).pause_reading()
+            self._is_reading_paused = True
+            self._delivery_statistics.paused_reading += 1
+
+    def _resume_reading(self) -> None:
+        if self._transport and self._is_reading_paused:
+            cast(ReadTransport, self._transport).resume_reading()
+        self._is_reading_paused = False
+
     def eof_received(self) -> bool:
         """
         Return False to close the transport.
@@ -233,19 +685,23 @@ class SmartMeterMessageProtocol(SmartMeterBaseProtocol):
         self,
         destination_queue: Queue[MeterMessageBase],
         reader_candidates: Sequence[MeterReaderBase],
+        idle_gap_sec: float | None = None,
+        delivery_policy: DeliveryPolicy = DeliveryPolicy.DROP_NEWEST,
     ) -> None:
         """
         Initialize SmartMeterMessageProtocol.
 
         :param destination_queue: destination queue for received messages.
         :param reader_candidates: message reader candidates.
+        :param idle_gap_sec: time without data before readers are notified by idle(). None to disable.
+        :param delivery_policy: policy used when the destination queue is full.
         """
-        super().__init__(reader_candidates)
+        super().__init__(reader_candidates, idle_gap_sec, delivery_policy)
         self.queue: Queue[MeterMessageBase] = destination_queue
 
     def message_received(self, message: MeterMessageBase) -> None:
         """Received message is passed on to the queue."""
-        self.queue.put_nowait(message)
+        self.deliver(self.queue, message)
 
 
 class SmartMeterMessagePayloadProtocol(SmartMeterBaseProtocol):
@@ -264,14 +720,18 @@ class SmartMeterMessagePayloadProtocol(SmartMeterBaseProtocol):
         self,
         destination_queue: Queue[bytes],
         reader_candidates: Sequence[MeterReaderBase],
+        idle_gap_sec: float | None = None,
+        delivery_policy: DeliveryPolicy = DeliveryPolicy.DROP_NEWEST,
     ) -> None:
         """
         Initialize SmartMeterMessagePayloadProtocol.
 
         :param destination_queue: destination queue for received messages payloads.
         :param reader_candidates: message reader candidates.
+        :param idle_gap_sec: time without data before readers are notified by idle(). None to disable.
+        :param delivery_policy: policy used when the destination queue is full.
         """
-        super().__init__(reader_candidates)
+        super().__init__(reader_candidates, idle_gap_sec, delivery_policy)
         self.queue: Queue[bytes] = destination_queue
 
     def message_received(self, message: MeterMessageBase) -> None:
@@ -283,7 +743,7 @@ class SmartMeterMessagePayloadProtocol(SmartMeterBaseProtocol):
         payload = message.payload
         if message.is_valid:
             if payload is not None and len(payload) > 0:
-                self.queue.put_nowait(payload)
+                self.deliver(self.queue, payload)
             else:
                 _LOGGER.debug("Got empty message.")
         else:
@@ -293,17 +753,296 @@ class SmartMeterMessagePayloadProtocol(SmartMeterBaseProtocol):
             )
 
 
+class BufferedReceiveMixin:
+    """
+    Mix in to reuse one receive buffer of each connection for all reads.
+
+    Put the mixin first and asyncio.BufferedProtocol last in the base classes of a
+    SmartMeterBaseProtocol sub class. BufferedProtocol must come after SmartMeterBaseProtocol
+    in the method resolution order to not hide its eof_received().
+    The transport reads data into the reused receive buffer, and data_received() and the
+    readers are passed a memoryview of the received bytes, avoiding a new bytes object for each
+    read. This is not zero-copy: the readers still copy the data into their own buffers, so only
+    the allocation of the transport is saved, not the copy. The buffer is allocated when the transport first requests
+    it, and reused for all reads, so the memoryview is only valid during the call
+    (see MeterReaderBase.read).
+    """
+
+    DEFAULT_RECEIVE_BUFFER_SIZE: int = 4096
+
+    receive_buffer_size: int = DEFAULT_RECEIVE_BUFFER_SIZE
+    _receive_buffer: memoryview | None = None
+
+    # implemented by SmartMeterBaseProtocol
+    data_received: Callable[[bytes | memoryview], None]
+
+    def get_buffer(self, sizehint: int) -> memoryview:
+        # pylint: disable=unused-argument
+        """Return the receive buffer to read data into."""
+        if self._receive_buffer is None:
+            self._receive_buffer = memoryview(bytearray(self.receive_buffer_size))
+        return self._receive_buffer
+
+    def buffer_updated(self, nbytes: int) -> None:
+        """Pass received bytes in the receive buffer on to data_received()."""
+        receive_buffer = cast(memoryview, self._receive_buffer)
+        # not copied: the memoryview is only valid until the buffer is reused
+        self.data_received(receive_buffer[:nbytes])
+
+
+class SmartMeterBufferedMessageProtocol(
+    BufferedReceiveMixin, SmartMeterMessageProtocol, BufferedProtocol
+):
+    """SmartMeterMessageProtocol reusing the receive buffer (asyncio.BufferedProtocol)."""
+
+
+class SmartMeterBufferedMessagePayloadProtocol(
+    BufferedReceiveMixin, SmartMeterMessagePayloadProtocol, BufferedProtocol
+):
+    """SmartMeterMessagePayloadProtocol reusing the receive buffer (asyncio.BufferedProtocol)."""
+
+
+class SmartMeterMessageBatchProtocol(SmartMeterBaseProtocol):
+    """
+    Network protocol that reads smart meter messages from a stream and forwards them to a queue in batches.
+
+    All messages read from one chunk of received data are put on the queue as one list,
+    so the consumer is woken once for a burst of messages, like when a gateway sends its
+    backlog after a reconnect. Use get_message_batches() to get all messages of the
+    batches available on the queue. The delivery policy is applied to batches.
+
+    Example:
+        await loop.create_connection(lambda: SmartMeterMessageBatchProtocol(queue, [HdlcFrameReader()]), "192.168.1.1", 1234)
+    """
+
+    def __init__(
+        self,
+        destination_queue: Queue[list[MeterMessageBase]],
+        reader_candidates: Sequence[MeterReaderBase],
+        idle_gap_sec: float | None = None,
+        delivery_policy: DeliveryPolicy = DeliveryPolicy.DROP_NEWEST,
+    ) -> None:
+        """
+        Initialize SmartMeterMessageBatchProtocol.
+
+        :param destination_queue: destination queue for batches of received messages.
+        :param reader_candidates: message reader candidates.
+        :param idle_gap_sec: time without data before readers are notified by idle(). None to disable.
+        :param delivery_policy: policy used when the destination queue is full.
+        """
+        super().__init__(reader_candidates, idle_gap_sec, delivery_policy)
+        self.queue: Queue[list[MeterMessageBase]] = destination_queue
+
+    def messages_received(self, messages: list[MeterMessageBase]) -> None:
+        """Received messages are passed on to the queue as one batch."""
+        self.deliver(self.queue, messages)
+
+    def message_received(self, message: MeterMessageBase) -> None:
+        """Received message is passed on to the queue as a batch of one message."""
+        self.deliver(self.queue, [message])
+
+
+async def get_message_batches(
+    queue: Queue[list[MeterMessageBase]],
+) -> list[MeterMessageBase]:
+    """
+    Get messages from queue of message batches.
+
+    Wait for a batch when the queue is empty, and get all batches available without waiting.
+
+    :param queue: queue of SmartMeterMessageBatchProtocol.
+    :return: messages of the batches in the order received.
+    """
+    messages = list(await queue.get())
+    while not queue.empty():
+        messages.extend(queue.get_nowait())
+    return messages
+
+
+def create_default_readers(
+    parse_data_lines: bool = True, use_idle_gap: bool = False
+) -> list[MeterReaderBase]:
+    """
+    Create the readers used by the connection factories when no readers are given.
+
+    :param parse_data_lines: parse data lines of P1 readouts (ModeDReader).
+    :param use_idle_gap: add IdleGapReader reading messages ended by an idle gap.
+    :return: new readers, to be used by one connection.
+    """
+    readers: list[MeterReaderBase] = [
+        GeneralBlockTransferReader(
+            HdlcSegmentReassemblingReader(
+                HdlcFrameReader(use_octet_stuffing=False, use_abort_sequence=True)
+            )
+        ),
+        ModeDReader(parse_data_lines=parse_data_lines),
+        MBusFrameReader(),
+    ]
+    if use_idle_gap:
+        readers.append(IdleGapReader())
+    return readers
+
+
 MeterTransportProtocol = Tuple[BaseTransport, SmartMeterBaseProtocol]
 
 AsyncConnectionFactory = Callable[[], Awaitable[MeterTransportProtocol]]
 
 
+class ConnectionState(Enum):
+    """Connection state of a meter connection."""
+
+    BACKING_OFF = auto()
+    CONNECTING = auto()
+    CONNECTED = auto()
+    CLOSING = auto()
+
+
+@dataclass
+class ConnectionWatchdogStatistics:
+    """Statistics of ConnectionWatchdog."""
+
+    timeouts: int = 0
+    """Number of connections closed for not receiving messages."""
+
+
+class _WatchedConnection:
+    # pylint: disable=too-few-public-methods
+    """Connection watched by ConnectionWatchdog."""
+
+    __slots__ = ("transport", "protocol", "watch_time")
+
+    def __init__(self, connection: MeterTransportProtocol, watch_time: float) -> None:
+        self.transport, self.protocol = connection
+        self.watch_time = watch_time
+
+
+class ConnectionWatchdog:
+    """
+    Close connections not receiving messages, like half-open TCP connections.
+
+    The connection is closed when no messages have been received for a multiple of the
+    interval between messages learned from received messages, and the connection manager
+    reconnects. The initial timeout is used until the interval has been learned.
+
+    One instance can watch many connections using one loop timer and a heap of deadlines.
+    The deadline of a connection is checked when it expires, and then moved according to
+    the last message received, so receiving data does not touch the timer.
+    """
+
+    DEFAULT_TIMEOUT_MULTIPLE: float = 5.0
+    DEFAULT_MIN_TIMEOUT_SEC: float = 10.0
+    DEFAULT_INITIAL_TIMEOUT_SEC: float = 60.0
+
+    def __init__(
+        self,
+        timeout_multiple: float = DEFAULT_TIMEOUT_MULTIPLE,
+        min_timeout_sec: float = DEFAULT_MIN_TIMEOUT_SEC,
+        initial_timeout_sec: float = DEFAULT_INITIAL_TIMEOUT_SEC,
+    ) -> None:
+        """
+        Initialize ConnectionWatchdog.
+
+        :param timeout_multiple: timeout as multiple of the interval between messages.
+        :param min_timeout_sec: min timeout when the interval has been learned.
+        :param initial_timeout_sec: timeout until the interval has been learned.
+        """
+        if timeout_multiple <= 0 or min_timeout_sec <= 0 or initial_timeout_sec <= 0:
+            raise ValueError("Timeouts must be positive.")
+        self._timeout_multiple = timeout_multiple
+        self._min_timeout_sec = min_timeout_sec
+        self._initial_timeout_sec = initial_timeout_sec
+        self._deadlines: list[tuple[float, int, _WatchedConnection]] = []
+        self._deadline_counter = 0
+        self._timer: TimerHandle | None = None
+        self._statistics = ConnectionWatchdogStatistics()
+
+    @property
+    def watched_count(self) -> int:
+        """Return number of watched connections, including connections lost since last check."""
+        return len(self._deadlines)
+
+    @property
+    def statistics(self) -> ConnectionWatchdogStatistics:
+        """Return statistics of closed connections."""
+        return self._statistics
+
+    def get_timeout_sec(self, protocol: SmartMeterBaseProtocol) -> float:
+        """Return current timeout of connection using protocol."""
+        interval = protocol.message_interval_sec
+        if interval is None:
+            return self._initial_timeout_sec
+        return max(self._min_timeout_sec, interval * self._timeout_multiple)
+
+    def watch(self, connection: MeterTransportProtocol) -> None:
+        """
+        Watch connection until it is lost or closed.
+
+        :param connection: transport and protocol of connection.
+        """
+        now = get_running_loop().time()
+        watched = _WatchedConnection(connection, now)
+        self._push(now + self.get_timeout_sec(watched.protocol), watched)
+
+    def close(self) -> None:
+        """Stop watching all connections."""
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+        self._deadlines.clear()
+
+    def _push(self, deadline: float, watched: _WatchedConnection) -> None:
+        self._deadline_counter += 1
+        heappush(self._deadlines, (deadline, self._deadline_counter, watched))
+        if self._deadlines[0][2] is watched:
+            self._schedule_timer()
+
+    def _schedule_timer(self) -> None:
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+        if self._deadlines:
+            self._timer = get_running_loop().call_at(
+                self._deadlines[0][0], self._check_deadlines
+            )
+
+    def _check_deadlines(self) -> None:
+        self._timer = None
+        now = get_running_loop().time()
+        while self._deadlines and self._deadlines[0][0] <= now:
+            _, _, watched = heappop(self._deadlines)
+            protocol = watched.protocol
+            if cast(Future, protocol.done).done():
+                continue
+
+            last_time = protocol.last_message_time
+            if last_time is None or last_time < watched.watch_time:
+                last_time = watched.watch_time
+            timeout = self.get_timeout_sec(protocol)
+            deadline = last_time + timeout
+            if deadline > now:
+                self._deadline_counter += 1
+                heappush(self._deadlines, (deadline, self._deadline_counter, watched))
+                continue
+
+            _LOGGER.warning(
+                "No messages received for %.1f sec. Close connection.", now - last_time
+            )
+            self._statistics.timeouts += 1
+            watched.transport.close()
+
+        self._schedule_timer()
+
+
 class ConnectionManager:
     # pylint: disable=too-many-instance-attributes
     """
     Maintain connection and reconnect if connection is lost.
 
     Reconnecting uses a back-off retry strategy, and has a simple circuit breaker for connection lost.
+
+    The connect loop is a state machine (backing off, connecting, connected and closing), and
+    uses at most one pending task: the connect task while connecting. Back-off, connection lost
+    and close() resume the loop through one future, completed by a loop timer or callback.
     """
 
     DEFAULT_CONNECTION_LOST_BACK_OFF_THRESHOLD: int = 5
@@ -324,8 +1063,12 @@ class ConnectionManager:
         self._connection_factory: AsyncConnectionFactory = connection_factory
         self._connection: MeterTransportProtocol | None = None
         self._is_closing: Event = Event()
+        self._state: ConnectionState = ConnectionState.BACKING_OFF
+        self._wakeup: Future[None] | None = None
 
         self.back_off_connect_error: BackOffStrategy = ExponentialBackOff()
+        self.reconnect_rate_limiter: ReconnectRateLimiter | None = None
+        self.watchdog: ConnectionWatchdog | None = None
 
         self.connection_lost_back_off_threshold: int = (
             ConnectionManager.DEFAULT_CONNECTION_LOST_BACK_OFF_SLEEP_SEC
@@ -336,6 +1079,11 @@ class ConnectionManager:
         self._connection_lost_last_time: datetime.datetime | None = None
         self._connection_lost_sleep_before_reconnect: bool = False
 
+    @property
+    def state(self) -> ConnectionState:
+        """Return current state of connect loop."""
+        return self._state
+
     def close(self) -> None:
         """Close current connection, if any, and stop reconnecting."""
         self._is_closing.set()
@@ -344,6 +1092,7 @@ class ConnectionManager:
             transport, _ = self._connection
             transport.close()
             self._connection = None
+        self._wake()
 
     async def connect_loop(self) -> None:
         """
@@ -351,34 +1100,108 @@ class ConnectionManager:
 
         The connection is not reconnected on connection loss if close() was called on this instance.
         """
+        self._state = ConnectionState.BACKING_OFF
         while not self._is_closing.is_set():
-            connect_task = create_task(self._try_connect())
-            closing_task = create_task(self._is_closing.wait())
-            await wait(
-                (connect_task, closing_task),
-                return_when=FIRST_COMPLETED,
-            )
-
-            if self._connection:
-                _, protocol = self._connection
-                done_task = ensure_future(protocol.done)
-                closing_task2 = create_task(self._is_closing.wait())
-                await wait(
-                    (done_task, closing_task2),
-                    return_when=FIRST_COMPLETED,
-                )
+            if self._state == ConnectionState.BACKING_OFF:
+                await self._back_off()
+            elif self._state == ConnectionState.CONNECTING:
+                await self._connect()
+            elif self._state == ConnectionState.CONNECTED:
+                await self._wait_for_connection_lost()
 
-                if not self._is_closing.is_set():
-                    _LOGGER.warning("Connection lost")
-                    self._update_connection_lost_circuit_breaker()
-
-                self._connection = None
+        self._state = ConnectionState.CLOSING
 
         # done closing if that was the case of connection loss
         self._is_closing.clear()
 
         _LOGGER.info("Connect loop done")
 
+    def _wake(self, _: object = None) -> None:
+        """Resume connect loop waiting for wakeup."""
+        if self._wakeup is not None and not self._wakeup.done():
+            self._wakeup.set_result(None)
+
+    async def _wait_for_wakeup(self) -> None:
+        try:
+            await cast(Future, self._wakeup)
+        finally:
+            self._wakeup = None
+
+    async def _back_off(self) -> None:
+        sleep_time = self._get_back_off_time()
+        if self.reconnect_rate_limiter:
+            sleep_time = self.reconnect_rate_limiter.reserve(sleep_time)
+        if sleep_time > 0:
+            loop = get_running_loop()
+            self._wakeup = loop.create_future()
+            timer = loop.call_later(sleep_time, self._wake)
+            try:
+                await self._wait_for_wakeup()
+            finally:
+                timer.cancel()
+
+        self._state = ConnectionState.CONNECTING
+
+    async def _connect(self) -> None:
+        loop = get_running_loop()
+        self._wakeup = loop.create_future()
+        _LOGGER.debug("Try to connect")
+        connect_task: Future[MeterTransportProtocol] = ensure_future(
+            self._connection_factory()
+        )
+        connect_task.add_done_callback(self._wake)
+        try:
+            await self._wait_for_wakeup()
+        finally:
+            connect_task.remove_done_callback(self._wake)
+            if not connect_task.done():
+                connect_task.cancel()
+
+        if not connect_task.done():
+            # closing: wait for cancelled connect task to not leave it pending
+            await wait((connect_task,))
+
+        if connect_task.cancelled():
+            _LOGGER.debug("The operation was cancelled")
+            self._state = ConnectionState.BACKING_OFF
+            return
+
+        ex = connect_task.exception()
+        if ex:
+            self.back_off_connect_error.failure()
+            _LOGGER.warning("Error connecting: %s", ex)
+            self._state = ConnectionState.BACKING_OFF
+            return
+
+        connection = connect_task.result()
+        if self._is_closing.is_set():
+            transport, _ = connection
+            transport.close()
+            return
+
+        self._connection = connection
+        self.back_off_connect_error.reset()
+        if self.watchdog:
+            self.watchdog.watch(connection)
+        self._state = ConnectionState.CONNECTED
+
+    async def _wait_for_connection_lost(self) -> None:
+        _, protocol = cast(MeterTransportProtocol, self._connection)
+        done = ensure_future(protocol.done)
+        self._wakeup = get_running_loop().create_future()
+        done.add_done_callback(self._wake)
+        try:
+            await self._wait_for_wakeup()
+        finally:
+            done.remove_done_callback(self._wake)
+
+        if not self._is_closing.is_set():
+            _LOGGER.warning("Connection lost")
+            self._update_connection_lost_circuit_breaker()
+
+        self._connection = None
+        self._state = ConnectionState.BACKING_OFF
+
     def _update_connection_lost_circuit_breaker(self) -> None:
         now = datetime.datetime.utcnow()
         if self._connection_lost_last_time:
@@ -388,8 +1211,8 @@ class ConnectionManager:
             )
         self._connection_lost_last_time = now
 
-    def _get_back_off_time(self) -> int:
-        sleep_time = 0
+    def _get_back_off_time(self) -> float:
+        sleep_time: float = 0
         current_connect_error_delay = self.back_off_connect_error.current_delay_sec
         if (
             current_connect_error_delay > 0
@@ -403,26 +1226,446 @@ class ConnectionManager:
             sleep_time = max(current_connect_error_delay, reconnect_sleep)
 
             _LOGGER.info(
-                "Back-off for %d sec before reconnecting",
+                "Back-off for %.1f sec before reconnecting",
                 sleep_time,
             )
         return sleep_time
 
-    async def _try_connect(self) -> None:
-        sleep_time = self._get_back_off_time()
-        if sleep_time > 0:
-            await sleep(sleep_time)
 
-        if not self._is_closing.is_set():
+MeterHubConnectionFactory = Callable[["Queue[Any]"], Awaitable[MeterTransportProtocol]]
+
+
+class _SharedQueueEntry:
+    # slotted record of one item, marked instead of removed from the middle of the queue
+    # pylint: disable=too-few-public-methods
+    """Tagged item on a SharedTaggedQueue."""
+
+    __slots__ = ("tagged_item", "is_removed")
+
+    def __init__(self, tagged_item: tuple[str, Any]) -> None:
+        self.tagged_item = tagged_item
+        self.is_removed = False
+
+
+class SharedTaggedQueue(Queue):
+    """
+    Queue of (tag, item) tuples shared by the TaggedQueue of many connections.
+
+    The items of each tag are also kept in order by tag, so the oldest item of a tag can be
+    removed without searching the queue. A removed item is only marked, and skipped when
+    reached by get. Marked items are compacted away when they outnumber the items left.
+    """
+
+    def _init(self, maxsize: int) -> None:
+        self._queue: deque[_SharedQueueEntry] = deque()
+        self._entries_by_tag: dict[str, deque[_SharedQueueEntry]] = {}
+        self._item_count = 0
+        self._removed_count = 0
+
+    def _put(self, item: tuple[str, Any]) -> None:
+        entry = _SharedQueueEntry(item)
+        self._queue.append(entry)
+        tag_entries = self._entries_by_tag.get(item[0])
+        if tag_entries is None:
+            tag_entries = self._entries_by_tag[item[0]] = deque()
+        tag_entries.append(entry)
+        self._item_count += 1
+
+    def _get(self) -> tuple[str, Any]:
+        entry = self._queue.popleft()
+        while entry.is_removed:
+            self._removed_count -= 1
+            entry = self._queue.popleft()
+        self._pop_tag_entry(entry.tagged_item[0])
+        self._item_count -= 1
+        return entry.tagged_item
+
+    def qsize(self) -> int:
+        """Return number of items in the queue."""
+        return self._item_count
+
+    def empty(self) -> bool:
+        """Return True if the queue is empty."""
+        return self._item_count == 0
+
+    def remove_oldest(self, tag: str) -> Any:
+        """
+        Remove and return the oldest item of tag without blocking.
+
+        Raise QueueEmpty when the queue has no item of tag. The removed item is still counted
+        as unfinished, so call task_done() for it.
+        """
+        if tag not in self._entries_by_tag:
+            raise QueueEmpty()
+        entry = self._pop_tag_entry(tag)
+        entry.is_removed = True
+        self._item_count -= 1
+        self._removed_count += 1
+        if self._removed_count > self._item_count:
+            self._queue = deque(
+                queued for queued in self._queue if not queued.is_removed
+            )
+            self._removed_count = 0
+        self._wakeup_next(self._putters)  # type: ignore
+        return entry.tagged_item[1]
+
+    def _pop_tag_entry(self, tag: str) -> _SharedQueueEntry:
+        tag_entries = self._entries_by_tag[tag]
+        entry = tag_entries.popleft()
+        if not tag_entries:
+            del self._entries_by_tag[tag]
+        return entry
+
+
+class TaggedQueue(Queue):
+    """
+    Queue passed to the protocol of one meter connection.
+
+    Messages are put on a shared queue as (tag, message) tuples, like (meter id, message)
+    tuples by MeterHub. The queue holds no items itself, and the checks used by the delivery
+    policies are forwarded to the shared queue. The drop oldest delivery policy only
+    removes messages of the same tag, so a busy connection can not evict the messages of
+    other connections.
+    """
+
+    def __init__(self, tag: str, shared_queue: SharedTaggedQueue) -> None:
+        """
+        Initialize TaggedQueue.
+
+        :param tag: tag of messages, like meter id.
+        :param shared_queue: destination queue for (tag, message) tuples.
+        """
+        super().__init__()
+        self._tag = tag
+        self._shared_queue = shared_queue
+
+    @property
+    def tag(self) -> str:
+        """Return tag of messages."""
+        return self._tag
+
+    def qsize(self) -> int:
+        """Return number of items in the shared queue."""
+        return self._shared_queue.qsize()
+
+    def empty(self) -> bool:
+        """Return True if the shared queue is empty."""
+        return self._shared_queue.empty()
+
+    def full(self) -> bool:
+        """Return True if the shared queue is full."""
+        return self._shared_queue.full()
+
+    def put_nowait(self, item: Any) -> None:
+        """Put tagged item on the shared queue without blocking."""
+        self._shared_queue.put_nowait((self._tag, item))
+
+    async def put(self, item: Any) -> None:
+        """Put tagged item on the shared queue, waiting for a free slot if full."""
+        await self._shared_queue.put((self._tag, item))
+
+    def get_nowait(self) -> Any:
+        """
+        Remove and return oldest item of this tag from the shared queue.
+
+        Used when dropping the oldest message. Raise QueueEmpty when the shared queue has no
+        item of this tag.
+        """
+        return self._shared_queue.remove_oldest(self._tag)
+
+    def task_done(self) -> None:
+        """Indicate that an item taken from the shared queue is done."""
+        self._shared_queue.task_done()
+
+
+class _HubMeter:
+    # slotted state record of one meter, updated by MeterHub
+    # pylint: disable=too-few-public-methods,too-many-instance-attributes
+    """Connection and reconnect state of one meter in MeterHub."""
+
+    __slots__ = (
+        "meter_id",
+        "connection_factory",
+        "queue",
+        "state",
+        "connection",
+        "next_attempt_time",
+        "back_off",
+        "connection_lost_last_time",
+        "has_reconnect_token",
+    )
+
+    def __init__(
+        self,
+        meter_id: str,
+        connection_factory: MeterHubConnectionFactory,
+        queue: TaggedQueue,
+        back_off: BackOffStrategy,
+    ) -> None:
+        self.meter_id = meter_id
+        self.connection_factory = connection_factory
+        self.queue = queue
+        self.state = ConnectionState.BACKING_OFF
+        self.connection: MeterTransportProtocol | None = None
+        self.next_attempt_time = 0.0
+        self.back_off = back_off
+        self.connection_lost_last_time: float | None = None
+        self.has_reconnect_token = False
+
+
+class MeterHub:
+    # pylint: disable=too-many-instance-attributes
+    """
+    Maintain connections to many meters and reconnect connections that are lost.
+
+    All reconnects are driven by one scheduler task using a heap of next attempt times, and
+    messages from all meters are put on one queue as (meter id, message) tuples.
+    No task is used for a meter while it is connected or waiting to reconnect. A task is
+    only used while connecting, and the number of concurrent connection attempts is limited.
+
+    Reconnecting uses a back-off retry strategy per meter, and has the same simple circuit
+    breaker for connection lost as ConnectionManager. The rate of connection attempts of all
+    meters can be limited by a ReconnectRateLimiter.
+    """
+
+    DEFAULT_MAX_CONCURRENT_CONNECTS: int = 100
+
+    def __init__(
+        self,
+        queue: SharedTaggedQueue | None = None,
+        max_concurrent_connects: int = DEFAULT_MAX_CONCURRENT_CONNECTS,
+        back_off_factory: Callable[[], BackOffStrategy] = ExponentialBackOff,
+        reconnect_rate_limiter: ReconnectRateLimiter | None = None,
+        watchdog: ConnectionWatchdog | None = None,
+    ) -> None:
+        """
+        Initialize MeterHub.
+
+        :param queue: destination queue for (meter id, message) tuples. A new queue is created when None.
+        :param max_concurrent_connects: max number of concurrent connection attempts.
+        :param back_off_factory: factory of connect error back-off strategy for each meter.
+        :param reconnect_rate_limiter: limiter of connection attempt rate. None to not limit the rate.
+        :param watchdog: watchdog closing connections not receiving messages. None to not watch connections.
+        """
+        if max_concurrent_connects < 1:
+            raise ValueError("Max concurrent connects must be positive.")
+        self.queue = queue if queue is not None else SharedTaggedQueue()
+        self._max_concurrent_connects = max_concurrent_connects
+        self._back_off_factory = back_off_factory
+        self._reconnect_rate_limiter = reconnect_rate_limiter
+        self._watchdog = watchdog
+        self._meters: dict[str, _HubMeter] = {}
+        self._schedule: list[tuple[float, int, str]] = []
+        self._schedule_counter = 0
+        self._connecting_count = 0
+        self._connect_tasks: set[Task[None]] = set()
+        self._is_closing = False
+        self._is_running = False
+        self._wakeup: Future[None] | None = None
+
+        self.connection_lost_back_off_threshold: int = (
+            ConnectionManager.DEFAULT_CONNECTION_LOST_BACK_OFF_THRESHOLD
+        )
+        self.connection_lost_back_off_sleep_sec: int = (
+            ConnectionManager.DEFAULT_CONNECTION_LOST_BACK_OFF_SLEEP_SEC
+        )
+
+    @property
+    def meter_ids(self) -> list[str]:
+        """Return id of all meters."""
+        return list(self._meters)
+
+    @property
+    def connected_count(self) -> int:
+        """Return number of connected meters."""
+        return sum(
+            1
+            for meter in self._meters.values()
+            if meter.state == ConnectionState.CONNECTED
+        )
+
+    def get_state(self, meter_id: str) -> ConnectionState:
+        """Return connection state of meter."""
+        return self._meters[meter_id].state
+
+    def add_meter(
+        self, meter_id: str, connection_factory: MeterHubConnectionFactory
+    ) -> None:
+        """
+        Add meter to be connected.
+
+        :param meter_id: id used to tag messages from the meter.
+        :param connection_factory: factory function that is passed the destination queue of
+        the meter and returns a Transport and SmartMeterProtocol tuple.
+        """
+        if meter_id in self._meters:
+            raise ValueError(f"Meter {meter_id} is already added.")
+        meter = _HubMeter(
+            meter_id,
+            connection_factory,
+            TaggedQueue(meter_id, self.queue),
+            self._back_off_factory(),
+        )
+        self._meters[meter_id] = meter
+        self._schedule_attempt(meter, 0)
+
+    def remove_meter(self, meter_id: str) -> None:
+        """Remove meter and close its connection, if any."""
+        meter = self._meters.pop(meter_id)
+        meter.state = ConnectionState.CLOSING
+        self._close_meter_connection(meter)
+
+    def close(self) -> None:
+        """Close all connections and stop reconnecting."""
+        self._is_closing = True
+        for meter in self._meters.values():
+            meter.state = ConnectionState.CLOSING
+            self._close_meter_connection(meter)
+        for task in self._connect_tasks:
+            task.cancel()
+        self._wake_scheduler()
+
+    async def run(self) -> None:
+        """
+        Connect to meters and keep reconnecting lost connections until close() is called.
+
+        Returns at once when close() has been called before run(). The hub can be run again
+        after run() has returned.
+        """
+        loop = get_running_loop()
+        self._is_running = True
+        if not self._is_closing:
+            self._reschedule_closed_meters()
+
+        while not self._is_closing:
+            now = loop.time()
+            while (
+                self._schedule
+                and self._schedule[0][0] <= now
+                and self._connecting_count < self._max_concurrent_connects
+            ):
+                attempt_time, _, meter_id = heappop(self._schedule)
+                due_meter = self._meters.get(meter_id)
+                if (
+                    due_meter is not None
+                    and due_meter.state == ConnectionState.BACKING_OFF
+                    and due_meter.next_attempt_time == attempt_time
+                ):
+                    if (
+                        self._reconnect_rate_limiter
+                        and not due_meter.has_reconnect_token
+                    ):
+                        rate_limit_delay = self._reconnect_rate_limiter.reserve()
+                        if rate_limit_delay > 0:
+                            self._schedule_attempt(due_meter, rate_limit_delay)
+                            due_meter.has_reconnect_token = True
+                            continue
+                    due_meter.has_reconnect_token = False
+                    due_meter.state = ConnectionState.CONNECTING
+                    self._connecting_count += 1
+                    connect_task = loop.create_task(self._connect(due_meter))
+                    self._connect_tasks.add(connect_task)
+                    connect_task.add_done_callback(self._connect_tasks.discard)
+
+            self._wakeup = loop.create_future()
+            timer: TimerHandle | None = None
+            if (
+                self._schedule
+                and self._connecting_count < self._max_concurrent_connects
+            ):
+                timer = loop.call_at(self._schedule[0][0], self._wake_scheduler)
             try:
-                _LOGGER.debug("Try to connect")
-                self._connection = await self._connection_factory()
+                await self._wakeup
+            finally:
+                self._wakeup = None
+                if timer:
+                    timer.cancel()
+
+        if self._connect_tasks:
+            for task in self._connect_tasks:
+                task.cancel()
+            await wait(self._connect_tasks)
+        self._is_running = False
+
+        # done closing, so the hub can be run again
+        self._is_closing = False
+
+        _LOGGER.info("Meter hub done")
+
+    def _reschedule_closed_meters(self) -> None:
+        """Schedule connection attempts of meters closed when the hub was last closed."""
+        for meter in self._meters.values():
+            if meter.state == ConnectionState.CLOSING:
+                meter.state = ConnectionState.BACKING_OFF
+                self._schedule_attempt(meter, 0)
+
+    def _wake_scheduler(self) -> None:
+        if self._wakeup is not None and not self._wakeup.done():
+            self._wakeup.set_result(None)
+
+    def _schedule_attempt(self, meter: _HubMeter, delay_sec: float) -> None:
+        meter.state = ConnectionState.BACKING_OFF
+        meter.has_reconnect_token = False
+        # meters added before the hub is running are due when started
+        meter.next_attempt_time = (
+            get_running_loop().time() + delay_sec if self._is_running else 0.0
+        )
+        self._schedule_counter += 1
+        heappush(
+            self._schedule,
+            (meter.next_attempt_time, self._schedule_counter, meter.meter_id),
+        )
+        self._wake_scheduler()
+
+    async def _connect(self, meter: _HubMeter) -> None:
+        try:
+            _LOGGER.debug("Try to connect meter %s", meter.meter_id)
+            connection = await meter.connection_factory(meter.queue)
+        except Exception as ex:  # pylint: disable=broad-except
+            meter.back_off.failure()
+            _LOGGER.warning("Error connecting meter %s: %s", meter.meter_id, ex)
+            if meter.state == ConnectionState.CONNECTING:
+                self._schedule_attempt(meter, meter.back_off.current_delay_sec)
+            return
+        finally:
+            self._connecting_count -= 1
+            self._wake_scheduler()
+
+        meter.back_off.reset()
+        if meter.state != ConnectionState.CONNECTING:
+            # meter removed or hub closed while connecting
+            connection[0].close()
+            return
+
+        meter.connection = connection
+        meter.state = ConnectionState.CONNECTED
+        if self._watchdog:
+            self._watchdog.watch(connection)
+        ensure_future(connection[1].done).add_done_callback(
+            lambda _: self._connection_lost(meter)
+        )
 
-                self.back_off_connect_error.reset()
-            except CancelledError:
-                _LOGGER.debug("The operation was cancelled")
-                raise
-            except Exception as ex:  # pylint: disable=broad-except
-                self._connection = None
-                self.back_off_connect_error.failure()
-                _LOGGER.warning("Error connecting: %s", ex)
+    def _connection_lost(self, meter: _HubMeter) -> None:
+        meter.connection = None
+        if meter.state != ConnectionState.CONNECTED:
+            return
+
+        _LOGGER.warning("Connection to meter %s lost", meter.meter_id)
+        now = get_running_loop().time()
+        sleep_before_reconnect = (
+            meter.connection_lost_last_time is not None
+            and now - meter.connection_lost_last_time
+            < self.connection_lost_back_off_threshold
+        )
+        meter.connection_lost_last_time = now
+        self._schedule_attempt(
+            meter,
+            self.connection_lost_back_off_sleep_sec if sleep_before_reconnect else 0,
+        )
+
+    @staticmethod
+    def _close_meter_connection(meter: _HubMeter) -> None:
+        if meter.connection:
+            transport, _ = meter.connection
+            transport.close()
+            meter.connection = None
@@ -1,6 +1,8 @@
 """Mappings between OBIS codes and keys used in decoded data."""
 from __future__ import annotations
 
+from han.obis import Obis
+
 FIELD_OBIS_LIST_VER_ID = "list_ver_id"
 FIELD_METER_ID = "meter_id"
 FIELD_METER_TYPE = "meter_type"
@@ -76,3 +78,30 @@ obis_name_map: dict[str, str] = {}
 for name, obis_values in name_obis_map.items():
     for obis in obis_values:
         obis_name_map[obis] = name
+
+
+# Element names of known OBIS codes by OBIS code, as string or bytes. Added when a known
+# OBIS code is first seen. Unknown OBIS codes from meter payloads are not cached, to keep
+# the cache bounded.
+_element_names: dict[str | bytes, str] = {}
+
+
+def get_element_name(obis_code: str | bytes) -> str:
+    """
+    Get element name of OBIS code.
+
+    :param obis_code: OBIS code as string (like "1.0.1.7.0.255") or 6 bytes.
+    :return: the name of a known OBIS code, or group C, D and E of the code (like "1.7.0").
+    """
+    element_name = _element_names.get(obis_code)
+    if element_name is None:
+        obis_group_cdr = (
+            Obis.from_string(obis_code)
+            if isinstance(obis_code, str)
+            else Obis(tuple(obis_code))  # type: ignore
+        ).to_group_cdr_str()
+        element_name = obis_name_map.get(obis_group_cdr)
+        if element_name is None:
+            return obis_group_cdr
+        _element_names[obis_code] = element_name
+    return element_name
@@ -9,12 +9,12 @@ import serial_asyncio  # type: ignore
 
 from han.common import MeterMessageBase  # pylint: disable=unused-import
 from han.common import MeterReaderBase
-from han.dlde import ModeDReader
-from han.hdlc import HdlcFrameReader
 from han.meter_connection import (
+    DeliveryPolicy,
     MeterTransportProtocol,
     SmartMeterMessagePayloadProtocol,
     SmartMeterMessageProtocol,
+    create_default_readers,
 )
 
 
@@ -23,6 +23,8 @@ async def create_serial_message_connection(
     loop: AbstractEventLoop | None,
     readers: Sequence[MeterReaderBase] | None,
     *args,
+    idle_gap_sec: float | None = None,
+    delivery_policy: DeliveryPolicy = DeliveryPolicy.DROP_NEWEST,
     **kwargs,
 ) -> MeterTransportProtocol:
     """
@@ -31,6 +33,8 @@ async def create_serial_message_connection(
     :param queue: Queue for received data readouts
     :param loop: The event handler
     :param readers: message reader(s). Passing None means all.
+    :param idle_gap_sec: time without data that ends a message read by IdleGapReader. None to disable.
+    :param delivery_policy: policy used when the queue is full.
     :param args: Passed to serial_asyncio.create_serial_connection and further to serial.Serial init function
     :param kwargs: Passed to serial_asyncio.create_serial_connection and further the serial.Serial init function
     :return: Tuple of transport and protocol
@@ -43,10 +47,11 @@ async def create_serial_message_connection(
                 queue,
                 readers
                 if readers
-                else [
-                    HdlcFrameReader(use_octet_stuffing=False, use_abort_sequence=True),
-                    ModeDReader(),
-                ],
+                else create_default_readers(
+                    parse_data_lines=True, use_idle_gap=idle_gap_sec is not None
+                ),
+                idle_gap_sec,
+                delivery_policy,
             ),
             *args,
             **kwargs,
@@ -59,6 +64,8 @@ async def create_serial_message_payload_connection(
     loop: AbstractEventLoop | None,
     readers: Sequence[MeterReaderBase] | None,
     *args,
+    idle_gap_sec: float | None = None,
+    delivery_policy: DeliveryPolicy = DeliveryPolicy.DROP_NEWEST,
     **kwargs,
 ) -> MeterTransportProtocol:
     """Create serial connection using SmartMeterMessagePayloadProtocol.
@@ -66,6 +73,8 @@ async def create_serial_message_payload_connection(
     :param queue: Queue for received data readout content
     :param loop: The event handler
     :param readers: message reader(s). Passing None means all.
+    :param idle_gap_sec: time without data that ends a message read by IdleGapReader. None to disable.
+    :param delivery_policy: policy used when the queue is full.
     :param args: Passed to serial_asyncio.create_serial_connection and further to serial.Serial init function
     :param kwargs: Passed to serial_asyncio.create_serial_connection and further the serial.Serial init function
     :return: Tuple of transport and protocol
@@ -78,10 +87,11 @@ async def create_serial_message_payload_connection(
                 queue,
                 readers
                 if readers
-                else [
-                    HdlcFrameReader(use_octet_stuffing=False, use_abort_sequence=True),
-                    ModeDReader(),
-                ],
+                else create_default_readers(
+                    parse_data_lines=False, use_idle_gap=idle_gap_sec is not None
+                ),
+                idle_gap_sec,
+                delivery_policy,
             ),
             *args,
             **kwargs,
@@ -0,0 +1,78 @@
+"""Use this module to iterate over decoded readings from a meter connection."""
+from __future__ import annotations
+
+import logging
+from asyncio import Queue, get_running_loop
+from datetime import datetime
+from typing import Any  # pylint: disable=unused-import
+from typing import AsyncIterator, Awaitable, Callable
+
+from han.autodecoder import AutoDecoder
+from han.common import MeterMessageBase
+from han.meter_connection import ConnectionManager, MeterTransportProtocol
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_MAX_PENDING_MESSAGES: int = 100
+
+StreamConnectionFactory = Callable[["Queue[Any]"], Awaitable[MeterTransportProtocol]]
+
+
+async def stream(
+    connection_factory: StreamConnectionFactory,
+    decoder: AutoDecoder | None = None,
+    max_pending_messages: int = DEFAULT_MAX_PENDING_MESSAGES,
+) -> AsyncIterator[dict[str, str | int | float | datetime]]:
+    """
+    Connect to meter and iterate over decoded readings, reconnecting when connection is lost.
+
+    The connection factory is passed the queue to use for the connection, and can be any of the
+    message or message payload connection factories. The queue is bounded by max pending messages,
+    and the delivery policy of the connection decides what to do when the consumer cannot keep up.
+    The messages are decoded when taken from the queue. Messages that cannot be decoded, or
+    make the decoder fail, are skipped.
+
+    The connection is closed when the iteration is stopped and the generator is closed.
+
+    Example:
+        async for reading in han.stream(lambda queue: create_tcp_message_payload_connection(queue, None, None, host, port)):
+            print(reading)
+
+    :param connection_factory: factory function creating a connection putting messages or payloads on the queue.
+    :param decoder: decoder of the messages. Default is a new AutoDecoder.
+    :param max_pending_messages: max number of messages received and not yet decoded.
+    :return: async iterator of decoded readings.
+    """
+    if max_pending_messages < 1:
+        raise ValueError("Max pending messages must be positive.")
+
+    decoder = decoder if decoder else AutoDecoder()
+    queue: Queue[MeterMessageBase | bytes] = Queue(maxsize=max_pending_messages)
+
+    async def create_connection() -> MeterTransportProtocol:
+        return await connection_factory(queue)
+
+    connection_manager = ConnectionManager(create_connection)
+    connect_loop = get_running_loop().create_task(connection_manager.connect_loop())
+    try:
+        while True:
+            message = await queue.get()
+            try:
+                if isinstance(message, MeterMessageBase):
+                    reading = decoder.decode_message(message)
+                else:
+                    reading = decoder.decode_message_payload(message)
+            except Exception as ex:  # pylint: disable=broad-except
+                _LOGGER.warning("Error decoding message: %s", ex)
+                continue
+
+            if reading:
+                yield reading
+            else:
+                _LOGGER.debug(
+                    "Could not decode message: %s",
+                    message.hex() if isinstance(message, bytes) else message,
+                )
+    finally:
+        connection_manager.close()
+        await connect_loop
@@ -1,26 +1,46 @@
 """TCP/IP connection factory."""
 from __future__ import annotations
 
+import logging
 from asyncio import Queue  # pylint: disable=unused-import
-from asyncio import AbstractEventLoop, BaseProtocol, get_event_loop
-from typing import Sequence, cast
+from asyncio import (
+    AbstractEventLoop,
+    AbstractServer,
+    BaseProtocol,
+    BaseTransport,
+    get_event_loop,
+)
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Sequence, cast
 
 from han.common import MeterMessageBase  # pylint: disable=unused-import
 from han.common import MeterReaderBase
-from han.dlde import ModeDReader
-from han.hdlc import HdlcFrameReader
 from han.meter_connection import (
+    DeliveryPolicy,
     MeterTransportProtocol,
+    SharedTaggedQueue,
+    TaggedQueue,
+    SmartMeterBufferedMessagePayloadProtocol,
+    SmartMeterBufferedMessageProtocol,
     SmartMeterMessagePayloadProtocol,
     SmartMeterMessageProtocol,
+    create_default_readers,
 )
 
+_LOGGER = logging.getLogger(__name__)
+
+# Max number of peer hosts to keep a pinned reader for in TcpMeterServer
+_MAX_PINNED_READERS = 10000
+
 
 async def create_tcp_message_connection(
     queue: "Queue[MeterMessageBase]",
     loop: AbstractEventLoop | None,
     readers: Sequence[MeterReaderBase] | None,
     *args,
+    delivery_policy: DeliveryPolicy = DeliveryPolicy.DROP_NEWEST,
+    buffered: bool = False,
     **kwargs,
 ) -> MeterTransportProtocol:
     """
@@ -29,26 +49,25 @@ async def create_tcp_message_connection(
     :param queue: Queue for received data readouts
     :param loop: The event handler
     :param readers: message reader(s).
+    :param delivery_policy: policy used when the queue is full.
+    :param buffered: reuse the receive buffer of the connection (asyncio.BufferedProtocol).
     :param args: Passed to the loop.create_connection
     :param kwargs: Passed to the loop.create_connection
     :return: Tuple of transport and protocol
     """
     loop = loop if loop else get_event_loop()
+    protocol_class = (
+        SmartMeterBufferedMessageProtocol if buffered else SmartMeterMessageProtocol
+    )
     return cast(
         MeterTransportProtocol,
         await loop.create_connection(
             lambda: cast(
                 BaseProtocol,
-                SmartMeterMessageProtocol(
+                protocol_class(
                     queue,
-                    readers
-                    if readers
-                    else [
-                        HdlcFrameReader(
-                            use_octet_stuffing=False, use_abort_sequence=True
-                        ),
-                        ModeDReader(),
-                    ],
+                    readers if readers else create_default_readers(),
+                    delivery_policy=delivery_policy,
                 ),
             ),
             *args,
@@ -62,6 +81,8 @@ async def create_tcp_message_payload_connection(
     loop: AbstractEventLoop | None,
     readers: Sequence[MeterReaderBase] | None,
     *args,
+    delivery_policy: DeliveryPolicy = DeliveryPolicy.DROP_NEWEST,
+    buffered: bool = False,
     **kwargs,
 ) -> MeterTransportProtocol:
     """
@@ -70,29 +91,336 @@ async def create_tcp_message_payload_connection(
     :param queue: Queue for received data readout content
     :param loop: The event handler
     :param readers: message reader(s).
+    :param delivery_policy: policy used when the queue is full.
+    :param buffered: reuse the receive buffer of the connection (asyncio.BufferedProtocol).
     :param args: Passed to the loop.create_connection
     :param kwargs: Passed to the loop.create_connection
     :return: Tuple of transport and protocol
     """
     loop = loop if loop else get_event_loop()
+    protocol_class = (
+        SmartMeterBufferedMessagePayloadProtocol
+        if buffered
+        else SmartMeterMessagePayloadProtocol
+    )
     return cast(
         MeterTransportProtocol,
         await loop.create_connection(
             lambda: cast(
                 BaseProtocol,
-                SmartMeterMessagePayloadProtocol(
+                protocol_class(
                     queue,
                     readers
                     if readers
-                    else [
-                        HdlcFrameReader(
-                            use_octet_stuffing=False, use_abort_sequence=True
-                        ),
-                        ModeDReader(),
-                    ],
+                    else create_default_readers(parse_data_lines=False),
+                    delivery_policy=delivery_policy,
                 ),
             ),
             *args,
             **kwargs,
         ),
     )
+
+
+@dataclass
+class TcpMeterServerStatistics:
+    """Statistics of connections accepted by TcpMeterServer."""
+
+    accepted_connections: int = 0
+    """Number of connections accepted."""
+
+    rejected_connections: int = 0
+    """Number of connections closed when accepted because max connections was reached."""
+
+    replaced_connections: int = 0
+    """Number of connections closed because the peer made a new connection exceeding max connections per peer."""
+
+    unpinned_readers: int = 0
+    """Number of times the pinned reader of a peer host has been unpinned for not reading valid messages."""
+
+
+class _TcpMeterServerProtocol(SmartMeterMessageProtocol):
+    # pylint: disable=too-many-instance-attributes
+    """SmartMeterMessageProtocol of a connection accepted by TcpMeterServer."""
+
+    def __init__(
+        self,
+        server: TcpMeterServer,
+        readers_factory: Callable[[], Sequence[MeterReaderBase]],
+        delivery_policy: DeliveryPolicy,
+    ) -> None:
+        # the queue is replaced by a queue tagged with the peer when the connection is made
+        super().__init__(
+            TaggedQueue("", server.queue),
+            readers_factory(),
+            delivery_policy=delivery_policy,
+        )
+        self._server = server
+        self._readers_factory = readers_factory
+        self._readers = list(self._reader_candidates)
+        self._is_reader_pinned = False
+        self._bytes_without_message = 0
+        self.peer_host: str | None = None
+
+    def connection_made(self, transport: BaseTransport) -> None:
+        super().connection_made(transport)
+        peer_name = transport.get_extra_info("peername")
+        self.peer_host = str(peer_name[0]) if peer_name else None
+        if self.peer_host is None or not self._server.connection_made(self):
+            transport.close()
+            return
+
+        self.queue = TaggedQueue(_get_peer_tag(peer_name), self._server.queue)
+        pinned_reader_index = self._server.get_pinned_reader_index(self.peer_host)
+        if pinned_reader_index is not None:
+            self._selected_reader = self._readers[pinned_reader_index]
+            self._reader_candidates.clear()
+            self._is_reader_pinned = True
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        if self.peer_host is not None:
+            selected_reader = self.selected_reader
+            self._server.connection_lost(
+                self,
+                self._readers.index(selected_reader) if selected_reader else None,
+            )
+        super().connection_lost(exc)
+
+    def data_received(self, data: bytes | memoryview) -> None:
+        self._bytes_without_message += len(data)
+        super().data_received(data)
+        if (
+            self._is_reader_pinned
+            and self._bytes_without_message > self._server.unpin_reader_after_bytes
+        ):
+            self._unpin_reader()
+
+    def messages_received(self, messages: list[MeterMessageBase]) -> None:
+        if any(message.is_valid for message in messages):
+            self._bytes_without_message = 0
+        super().messages_received(messages)
+
+    def close(self) -> None:
+        """Close the transport of the connection."""
+        if self._transport:
+            self._transport.close()
+
+    def _unpin_reader(self) -> None:
+        """Select among new reader candidates, as the pinned reader fails to read messages."""
+        _LOGGER.info(
+            "No valid message in %d bytes from %s. Select reader again.",
+            self._bytes_without_message,
+            self.peer_host,
+        )
+        self._server.unpin_reader(cast(str, self.peer_host))
+        self._readers = list(self._readers_factory())
+        self._reader_candidates = list(self._readers)
+        self._selected_reader = None
+        self._is_reader_pinned = False
+        self._bytes_without_message = 0
+
+
+def _get_peer_tag(peer_name: Any) -> str:
+    """Return host and port of peer, identifying the connection."""
+    host, port = peer_name[0], peer_name[1]
+    return f"[{host}]:{port}" if ":" in str(host) else f"{host}:{port}"
+
+
+class TcpMeterServer:
+    # limits, connections and pinned readers of all peers
+    # pylint: disable=too-many-instance-attributes
+    """
+    TCP server accepting connections from meters and gateways connecting to us.
+
+    A SmartMeterMessageProtocol is created for each accepted connection, and messages from all
+    connections are put on one queue as (peer, message) tuples, where peer is the host and port
+    of the connection, like "192.168.1.10:50123". The reader selected for the connections from
+    a peer host is pinned, and used for new connections from the same host without selecting
+    among the reader candidates again. The reader is unpinned, and the reader candidates are
+    tried again, when no valid message is read from a connection for unpin reader after bytes.
+
+    New connections are closed when max connections is reached. When a peer host exceeds max
+    connections per peer, the oldest connection from the host is closed, as a new connection
+    usually replaces a stale connection.
+
+    The default queue is bounded by default max queue size, so the delivery policy is applied
+    when messages are not consumed. Pass an unbounded queue to never drop messages.
+    """
+
+    DEFAULT_MAX_CONNECTIONS: int = 10000
+    DEFAULT_MAX_QUEUE_SIZE: int = 10000
+    DEFAULT_UNPIN_READER_AFTER_BYTES: int = 16384
+
+    def __init__(
+        self,
+        queue: SharedTaggedQueue | None = None,
+        readers_factory: Callable[[], Sequence[MeterReaderBase]] | None = None,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_connections_per_peer: int | None = None,
+        delivery_policy: DeliveryPolicy = DeliveryPolicy.DROP_NEWEST,
+    ) -> None:
+        """
+        Initialize TcpMeterServer.
+
+        :param queue: destination queue for (peer, message) tuples. A new queue of default max queue size is created when None.
+        :param readers_factory: factory of reader candidates for each connection. Default is the default readers.
+        :param max_connections: max number of connections.
+        :param max_connections_per_peer: max number of connections from one peer host. None for no limit.
+        :param delivery_policy: policy used when the queue is full.
+        """
+        if max_connections < 1:
+            raise ValueError("Max connections must be positive.")
+        if max_connections_per_peer is not None and max_connections_per_peer < 1:
+            raise ValueError("Max connections per peer must be positive.")
+        self.queue = (
+            queue
+            if queue is not None
+            else SharedTaggedQueue(maxsize=TcpMeterServer.DEFAULT_MAX_QUEUE_SIZE)
+        )
+        self._readers_factory = (
+            readers_factory if readers_factory else create_default_readers
+        )
+        self._max_connections = max_connections
+        self._max_connections_per_peer = max_connections_per_peer
+        self._delivery_policy = delivery_policy
+        self._connections: dict[str, deque[_TcpMeterServerProtocol]] = {}
+        self._connection_count = 0
+        self._pinned_reader_indexes: dict[str, int] = {}
+        self._statistics = TcpMeterServerStatistics()
+        self.server: AbstractServer | None = None
+
+        # number of bytes received without a valid message before the pinned reader is unpinned
+        self.unpin_reader_after_bytes: int = (
+            TcpMeterServer.DEFAULT_UNPIN_READER_AFTER_BYTES
+        )
+
+    @property
+    def connection_count(self) -> int:
+        """Return number of connections."""
+        return self._connection_count
+
+    @property
+    def peer_hosts(self) -> list[str]:
+        """Return hosts of connected peers."""
+        return list(self._connections)
+
+    @property
+    def statistics(self) -> TcpMeterServerStatistics:
+        """Return statistics of accepted connections."""
+        return self._statistics
+
+    def create_protocol(self) -> BaseProtocol:
+        """Create protocol for an accepted connection. Used as protocol factory of loop.create_server."""
+        return cast(
+            BaseProtocol,
+            _TcpMeterServerProtocol(self, self._readers_factory, self._delivery_policy),
+        )
+
+    def get_pinned_reader_index(self, peer_host: str) -> int | None:
+        """Return index in reader candidates of reader pinned for peer host, or None if not pinned."""
+        return self._pinned_reader_indexes.get(peer_host)
+
+    def unpin_reader(self, peer_host: str) -> None:
+        """Unpin reader of peer host, so the reader is selected among the reader candidates again."""
+        if self._pinned_reader_indexes.pop(peer_host, None) is not None:
+            self._statistics.unpinned_readers += 1
+
+    def connection_made(self, protocol: _TcpMeterServerProtocol) -> bool:
+        """Register connection made. Return False if the connection must be closed."""
+        if self._connection_count >= self._max_connections:
+            _LOGGER.warning(
+                "Max connections %d reached. Close connection from %s.",
+                self._max_connections,
+                protocol.peer_host,
+            )
+            self._statistics.rejected_connections += 1
+            return False
+
+        peer_connections = self._connections.setdefault(
+            cast(str, protocol.peer_host), deque()
+        )
+        if (
+            self._max_connections_per_peer is not None
+            and len(peer_connections) >= self._max_connections_per_peer
+        ):
+            _LOGGER.info(
+                "Max connections per peer reached. Close oldest connection from %s.",
+                protocol.peer_host,
+            )
+            self._statistics.replaced_connections += 1
+            oldest = peer_connections.popleft()
+            self._connection_count -= 1
+            oldest.close()
+
+        peer_connections.append(protocol)
+        self._connection_count += 1
+        self._statistics.accepted_connections += 1
+        return True
+
+    def connection_lost(
+        self, protocol: _TcpMeterServerProtocol, reader_index: int | None
+    ) -> None:
+        """Unregister connection, and pin the reader selected for the connection."""
+        peer_host = cast(str, protocol.peer_host)
+        if reader_index is not None:
+            # keep the most recently pinned peer hosts
+            self._pinned_reader_indexes.pop(peer_host, None)
+            if len(self._pinned_reader_indexes) >= _MAX_PINNED_READERS:
+                del self._pinned_reader_indexes[next(iter(self._pinned_reader_indexes))]
+            self._pinned_reader_indexes[peer_host] = reader_index
+        peer_connections = self._connections.get(peer_host)
+        if peer_connections and protocol in peer_connections:
+            peer_connections.remove(protocol)
+            self._connection_count -= 1
+            if not peer_connections:
+                del self._connections[peer_host]
+
+    def close(self) -> None:
+        """Stop accepting connections and close all connections."""
+        if self.server:
+            self.server.close()
+        for peer_connections in list(self._connections.values()):
+            for protocol in list(peer_connections):
+                protocol.close()
+
+    async def wait_closed(self) -> None:
+        """Wait until the server is closed."""
+        if self.server:
+            await self.server.wait_closed()
+
+
+async def create_tcp_meter_server(  # pylint: disable=too-many-arguments
+    queue: SharedTaggedQueue | None,
+    loop: AbstractEventLoop | None,
+    readers_factory: Callable[[], Sequence[MeterReaderBase]] | None,
+    *args: Any,
+    max_connections: int = TcpMeterServer.DEFAULT_MAX_CONNECTIONS,
+    max_connections_per_peer: int | None = None,
+    delivery_policy: DeliveryPolicy = DeliveryPolicy.DROP_NEWEST,
+    **kwargs: Any,
+) -> TcpMeterServer:
+    """
+    Create TCP server accepting connections from meters and gateways.
+
+    :param queue: Queue for (peer, message) tuples, where peer is host and port. A new bounded queue is created when None.
+    :param loop: The event handler
+    :param readers_factory: factory of message reader(s) for each connection. None means default readers.
+    :param max_connections: max number of connections.
+    :param max_connections_per_peer: max number of connections from one peer host. None for no limit.
+    :param delivery_policy: policy used when the queue is full.
+    :param args: Passed to the loop.create_server
+    :param kwargs: Passed to the loop.create_server
+    :return: the server, serving when returned
+    """
+    loop = loop if loop else get_event_loop()
+    meter_server = TcpMeterServer(
+        queue,
+        readers_factory,
+        max_connections,
+        max_connections_per_peer,
+        delivery_policy,
+    )
+    meter_server.server = await loop.create_server(
+        meter_server.create_protocol, *args, **kwargs
+    )
+    return meter_server
@@ -37,5 +37,5 @@ setuptools.setup(
     ],
     python_requires=">=3.7",
     install_requires=["construct"],
-    extras_require={"serial": ["pyserial-asyncio>=0.4"]},
+    extras_require={"serial": ["pyserial-asyncio>=0.4"], "crypto": ["cryptography"]},
 )
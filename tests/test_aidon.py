@@ -3,7 +3,6 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
-from decimal import Decimal
 from pprint import pprint
 
 import construct
@@ -216,19 +215,19 @@ class TestParseAidon:
             parsed_notification_body.list_items[8],
             "1.0.32.7.0.255",
             "long_unsigned",
-            Decimal("230.7"),
+            230.7,
         )
         assert_obis_element(
             parsed_notification_body.list_items[9],
             "1.0.52.7.0.255",
             "long_unsigned",
-            Decimal("249.9"),
+            249.9,
         )
         assert_obis_element(
             parsed_notification_body.list_items[10],
             "1.0.72.7.0.255",
             "long_unsigned",
-            Decimal("230.8"),
+            230.8,
         )
         assert_obis_element(
             parsed_notification_body.list_items[11],
@@ -424,31 +423,31 @@ class TestParseAidon:
             parsed_notification_body.list_items[7],
             "1.0.31.7.0.255",
             "long",
-            Decimal("1.3"),
+            1.3,
         )
         assert_obis_element(
             parsed_notification_body.list_items[8],
             "1.0.71.7.0.255",
             "long",
-            Decimal("0.9"),
+            0.9,
         )
         assert_obis_element(
             parsed_notification_body.list_items[9],
             "1.0.32.7.0.255",
             "long_unsigned",
-            Decimal("227.4"),
+            227.4,
         )
         assert_obis_element(
             parsed_notification_body.list_items[10],
             "1.0.52.7.0.255",
             "long_unsigned",
-            Decimal("230.1"),
+            230.1,
         )
         assert_obis_element(
             parsed_notification_body.list_items[11],
             "1.0.72.7.0.255",
             "long_unsigned",
-            Decimal("230.8"),
+            230.8,
         )
 
     @pytest.mark.parametrize(
@@ -519,31 +518,31 @@ class TestParseAidon:
             parsed_notification_body.list_items[7],
             "1.0.31.7.0.255",
             "long",
-            Decimal("1.3"),
+            1.3,
         )
         assert_obis_element(
             parsed_notification_body.list_items[8],
             "1.0.71.7.0.255",
             "long",
-            Decimal("0.9"),
+            0.9,
         )
         assert_obis_element(
             parsed_notification_body.list_items[9],
             "1.0.32.7.0.255",
             "long_unsigned",
-            Decimal("227.6"),
+            227.6,
         )
         assert_obis_element(
             parsed_notification_body.list_items[10],
             "1.0.52.7.0.255",
             "long_unsigned",
-            Decimal("230.3"),
+            230.3,
         )
         assert_obis_element(
             parsed_notification_body.list_items[11],
             "1.0.72.7.0.255",
             "long_unsigned",
-            Decimal("230.9"),
+            230.9,
         )
         date_time = parsed_notification_body.list_items[12]
         assert isinstance(date_time, construct.Container)
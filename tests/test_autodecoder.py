@@ -5,6 +5,7 @@ import pytest
 
 import tests.test_aidon
 import tests.test_dlde
+import tests.test_generic
 import tests.test_kaifa
 import tests.test_kamstrup
 from han import autodecoder
@@ -106,3 +107,13 @@ def test_decode_message():
         DataReadout(tests.test_dlde.EXAMPLE_DATA_A_LANDISGYR_360)
     )
     assert decoded
+
+
+def test_decode_fallback_generic():
+    """Test AutoDecoder falls back to generic decoder without storing it as success."""
+    decoder = autodecoder.AutoDecoder()
+    decoded = decoder.decode_message_payload(
+        bytes.fromhex(tests.test_generic.NOTIFICATION_BODY_SCALED_ELEMENT)
+    )
+    assert decoded == {"active_power_import": 25.6}
+    assert decoder.previous_success_decoder is None
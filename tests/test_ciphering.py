@@ -0,0 +1,155 @@
+"""General-glo-ciphering tests."""
+# pylint: disable = no-self-use
+from __future__ import annotations
+
+import pytest
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+
+import tests.test_aidon
+from han import aidon, ciphering
+from han.common import DlmsMessage
+
+# Test vector from DLMS UA Green Book (AES-GCM-128, security suite 0)
+ENCRYPTION_KEY = bytes.fromhex("000102030405060708090A0B0C0D0E0F")
+AUTHENTICATION_KEY = bytes.fromhex("D0D1D2D3D4D5D6D7D8D9DADBDCDDDEDF")
+SYSTEM_TITLE = bytes.fromhex("4D4D4D0000BC614E")
+INVOCATION_COUNTER = bytes.fromhex("01234567")
+PLAIN_APDU = bytes.fromhex("C0010000080000010000FF0200")
+CIPHERED_APDU = bytes.fromhex(
+    "db084d4d4d0000bc614e1e"
+    "3001234567"
+    "411312ff935a47566827c467bc"
+    "7d825c3be4a77c3fcc056b6b"
+)
+ENCRYPTED_ONLY_APDU = bytes.fromhex(
+    "db084d4d4d0000bc614e12" "2001234567" "411312ff935a47566827c467bc"
+)
+
+LLC_HEADER = b"\xe6\xe7\x00"
+
+
+def _create_key_store() -> dict[bytes, ciphering.MeterKeys]:
+    return {SYSTEM_TITLE: ciphering.MeterKeys(ENCRYPTION_KEY, AUTHENTICATION_KEY)}
+
+
+def _encrypt(plain_apdu: bytes, security_control: int = 0x30) -> bytes:
+    encryptor = Cipher(
+        algorithms.AES(ENCRYPTION_KEY), modes.GCM(SYSTEM_TITLE + INVOCATION_COUNTER)
+    ).encryptor()
+    encryptor.authenticate_additional_data(
+        bytes((security_control,)) + AUTHENTICATION_KEY
+    )
+    if security_control & 0x20:
+        information = encryptor.update(plain_apdu)
+    else:
+        encryptor.authenticate_additional_data(plain_apdu)
+        information = plain_apdu
+    encryptor.finalize()
+    information += encryptor.tag[:12]
+    length = 1 + len(INVOCATION_COUNTER) + len(information)
+    length_field = (
+        bytes((length,)) if length < 0x80 else b"\x82" + length.to_bytes(2, "big")
+    )
+    return (
+        b"\xdb\x08"
+        + SYSTEM_TITLE
+        + length_field
+        + bytes((security_control,))
+        + INVOCATION_COUNTER
+        + information
+    )
+
+
+class TestGeneralGloCipheringDecrypter:
+    """Test GeneralGloCipheringDecrypter."""
+
+    def test_decrypt_test_vector(self):
+        """Test decrypt authenticated and encrypted APDU."""
+        decrypter = ciphering.GeneralGloCipheringDecrypter(_create_key_store())
+        assert decrypter.decrypt_apdu(CIPHERED_APDU) == PLAIN_APDU
+
+    def test_decrypt_encrypted_only(self):
+        """Test decrypt encrypted APDU without authentication tag."""
+        decrypter = ciphering.GeneralGloCipheringDecrypter(_create_key_store())
+        assert decrypter.decrypt_apdu(ENCRYPTED_ONLY_APDU) == PLAIN_APDU
+
+    def test_decrypt_authenticated_only(self):
+        """Test verify authenticated APDU that is not encrypted."""
+        decrypter = ciphering.GeneralGloCipheringDecrypter(_create_key_store())
+        assert decrypter.decrypt_apdu(_encrypt(PLAIN_APDU, 0x10)) == PLAIN_APDU
+
+    def test_invalid_authentication_tag(self):
+        """Test modified APDU fails authentication."""
+        decrypter = ciphering.GeneralGloCipheringDecrypter(_create_key_store())
+        modified = bytearray(CIPHERED_APDU)
+        modified[20] ^= 0x01
+        with pytest.raises(ValueError):
+            decrypter.decrypt_apdu(bytes(modified))
+
+    @pytest.mark.parametrize(
+        "apdu",
+        [
+            CIPHERED_APDU[:-1],
+            CIPHERED_APDU[:11],
+            b"\xdb\x04" + CIPHERED_APDU[2:],
+            bytes.fromhex("db084d4d4d0000bc614e05") + b"\x00" + INVOCATION_COUNTER,
+            bytes.fromhex("0f0000000100"),
+        ],
+    )
+    def test_invalid_apdu(self, apdu):
+        """Test invalid APDU raises ValueError."""
+        decrypter = ciphering.GeneralGloCipheringDecrypter(_create_key_store())
+        with pytest.raises(ValueError):
+            decrypter.decrypt_apdu(apdu)
+
+    def test_missing_keys(self):
+        """Test APDU from meter without keys raises ValueError."""
+        decrypter = ciphering.GeneralGloCipheringDecrypter({})
+        with pytest.raises(ValueError):
+            decrypter.decrypt_apdu(CIPHERED_APDU)
+
+    def test_changed_keys(self):
+        """Test changed keys in key store are used."""
+        key_store = _create_key_store()
+        decrypter = ciphering.GeneralGloCipheringDecrypter(key_store)
+        assert decrypter.decrypt_apdu(CIPHERED_APDU) == PLAIN_APDU
+
+        key_store[SYSTEM_TITLE] = ciphering.MeterKeys(bytes(16), AUTHENTICATION_KEY)
+        with pytest.raises(ValueError):
+            decrypter.decrypt_apdu(CIPHERED_APDU)
+
+    def test_decrypt_frame_content(self):
+        """Test decrypted frame content can be decoded."""
+        frame_content = tests.test_aidon.no_list_2
+        ciphered = LLC_HEADER + _encrypt(frame_content[3:])
+        decrypter = ciphering.GeneralGloCipheringDecrypter(_create_key_store())
+
+        decrypted = decrypter.decrypt_payload(ciphered)
+
+        assert decrypted == frame_content
+        assert aidon.decode_frame_content(decrypted)
+
+    def test_not_ciphered_payload_is_passed_on(self):
+        """Test payload without ciphered APDU is returned as is."""
+        decrypter = ciphering.GeneralGloCipheringDecrypter(_create_key_store())
+        payload = tests.test_aidon.no_list_1
+        message = DlmsMessage(payload)
+
+        assert decrypter.decrypt_payload(payload) is payload
+        assert decrypter.decrypt_message(message) is message
+
+    def test_decrypt_message(self):
+        """Test decrypt message payload."""
+        decrypter = ciphering.GeneralGloCipheringDecrypter(_create_key_store())
+        decrypted = decrypter.decrypt_message(DlmsMessage(LLC_HEADER + CIPHERED_APDU))
+
+        assert decrypted.payload == LLC_HEADER + PLAIN_APDU
+
+    def test_decrypt_payloads(self):
+        """Test decrypt batch of payloads."""
+        decrypter = ciphering.GeneralGloCipheringDecrypter(_create_key_store())
+        decrypted = decrypter.decrypt_payloads(
+            [CIPHERED_APDU, CIPHERED_APDU[:-1], LLC_HEADER + ENCRYPTED_ONLY_APDU]
+        )
+
+        assert decrypted == [PLAIN_APDU, None, LLC_HEADER + PLAIN_APDU]
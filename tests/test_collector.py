@@ -0,0 +1,234 @@
+"""Collector tests."""
+# pylint: disable = no-self-use
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import queue
+import socket
+import socketserver
+import threading
+import time
+
+import pytest
+
+from han import collector
+from han.common import DlmsMessage
+from han.hdlc import HdlcFrameReader
+from tests.test_streaming import FRAME_NO_LIST_1
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(socket, "SO_REUSEPORT")
+    or "fork" not in multiprocessing.get_all_start_methods(),
+    reason="Requires SO_REUSEPORT and fork",
+)
+
+
+def _get_free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _collect(
+    sharded_collector: collector.ShardedCollector, count: int
+) -> list[collector.CollectorReading]:
+    readings: list[collector.CollectorReading] = []
+    end = time.monotonic() + 10
+    while len(readings) < count and time.monotonic() < end:
+        readings.extend(sharded_collector.get_readings(0.1))
+    return readings
+
+
+class _FailingMessage(DlmsMessage):
+    @property
+    def payload(self) -> bytes | None:
+        raise RuntimeError("Payload failed")
+
+
+class _FrameHandler(socketserver.BaseRequestHandler):
+    def handle(self) -> None:
+        self.request.sendall(FRAME_NO_LIST_1)
+        # keep connection open until client closes it
+        self.request.recv(1)
+
+
+class TestGetShard:
+    """Test get_shard."""
+
+    def test_stable_and_spread(self):
+        """Test shard is stable and keys are spread over shards."""
+        keys = [f"meter-{number}" for number in range(1000)]
+        shards = [collector.get_shard(key, 4) for key in keys]
+
+        assert shards == [collector.get_shard(key, 4) for key in keys]
+        assert all(shards.count(shard) > 150 for shard in range(4))
+
+    def test_consistent(self):
+        """Test only keys moving to the new shard change shard when a shard is added."""
+        keys = [f"meter-{number}" for number in range(1000)]
+        for key in keys:
+            shard = collector.get_shard(key, 5)
+            assert shard in (collector.get_shard(key, 4), 4)
+
+
+class TestShardedCollector:
+    """Test ShardedCollector."""
+
+    def test_listen(self):
+        """Test workers share listening port and readings are aggregated."""
+        port = _get_free_port()
+        sharded_collector = collector.ShardedCollector(
+            2,
+            listen_address=("127.0.0.1", port),
+            mp_context=multiprocessing.get_context("fork"),
+        )
+        sharded_collector.start()
+        sockets = []
+        try:
+            end = time.monotonic() + 10
+            while len(sockets) < 8 and time.monotonic() < end:
+                try:
+                    sock = socket.create_connection(("127.0.0.1", port))
+                except ConnectionRefusedError:
+                    time.sleep(0.05)
+                    continue
+                sock.sendall(FRAME_NO_LIST_1)
+                sockets.append(sock)
+
+            readings = _collect(sharded_collector, 8)
+        finally:
+            for sock in sockets:
+                sock.close()
+            sharded_collector.stop()
+
+        assert len(readings) == 8
+        assert all(source.startswith("127.0.0.1:") for source, _ in readings)
+        assert all(reading["active_power_import"] == 280 for _, reading in readings)
+        assert not sharded_collector.is_running
+
+    def test_targets(self):
+        """Test targets are split between workers by meter id."""
+        with socketserver.ThreadingTCPServer(("127.0.0.1", 0), _FrameHandler) as server:
+            server.daemon_threads = True
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            address = server.server_address
+            targets = {f"meter-{number}": address for number in range(6)}
+            sharded_collector = collector.ShardedCollector(
+                3, targets=targets, mp_context=multiprocessing.get_context("fork")
+            )
+            sharded_collector.start()
+            try:
+                readings = _collect(sharded_collector, 6)
+            finally:
+                sharded_collector.stop()
+                server.shutdown()
+
+        assert sorted(source for source, _ in readings) == sorted(targets)
+        assert sum(
+            len(sharded_collector.get_worker_targets(worker)) for worker in range(3)
+        ) == len(targets)
+
+    def test_readings_cancel(self):
+        """Test waiting for readings can be cancelled without blocking shutdown."""
+        sharded_collector = collector.ShardedCollector(
+            1, listen_address=("127.0.0.1", 0)
+        )
+
+        async def run() -> None:
+            await asyncio.wait_for(sharded_collector.readings().__anext__(), 0.1)
+
+        start = time.monotonic()
+        with pytest.raises(asyncio.TimeoutError):
+            asyncio.run(run())
+
+        assert time.monotonic() - start < 2
+
+    def test_publish_skips_decoder_error(self):
+        """Test messages making the decoder fail are skipped."""
+        # pylint: disable=protected-access
+        output: queue.Queue[list[collector.CollectorReading]] = queue.Queue()
+        (frame,) = HdlcFrameReader().read(FRAME_NO_LIST_1)
+
+        async def run() -> None:
+            message_queue: asyncio.Queue = asyncio.Queue()
+            message_queue.put_nowait(("a", _FailingMessage(b"")))
+            message_queue.put_nowait(("a", frame))
+            publish_task = asyncio.create_task(
+                collector._publish_readings(message_queue, output)
+            )
+            while output.empty():
+                await asyncio.sleep(0.01)
+            publish_task.cancel()
+
+        asyncio.run(asyncio.wait_for(run(), 5))
+
+        ((source, reading),) = output.get_nowait()
+        assert source == "a"
+        assert reading["active_power_import"] == 280
+
+    def test_publish_keeps_decoders_of_recent_sources(self, monkeypatch):
+        """Test the decoder of the least recently used source is forgotten first."""
+        # pylint: disable=protected-access
+        monkeypatch.setattr(collector, "_MAX_DECODERS", 2)
+        created_decoders = []
+
+        class _CountingDecoder(collector.AutoDecoder):
+            def __init__(self) -> None:
+                super().__init__()
+                created_decoders.append(self)
+
+        monkeypatch.setattr(collector, "AutoDecoder", _CountingDecoder)
+        output: queue.Queue[list[collector.CollectorReading]] = queue.Queue()
+        (frame,) = HdlcFrameReader().read(FRAME_NO_LIST_1)
+
+        async def run() -> None:
+            message_queue: asyncio.Queue = asyncio.Queue()
+            for source in ("a", "b", "a", "c", "a"):
+                message_queue.put_nowait((source, frame))
+            publish_task = asyncio.create_task(
+                collector._publish_readings(message_queue, output)
+            )
+            while output.empty():
+                await asyncio.sleep(0.01)
+            publish_task.cancel()
+
+        asyncio.run(asyncio.wait_for(run(), 5))
+
+        assert len(output.get_nowait()) == 5
+        assert len(created_decoders) == 3
+
+    def test_reuse_port_only_with_many_workers(self):
+        """Test the listen port is only shared when there is more than one worker."""
+        # pylint: disable=protected-access
+        for worker_count in (1, 2):
+            sharded_collector = collector.ShardedCollector(
+                worker_count, listen_address=("127.0.0.1", 0)
+            )
+            assert all(
+                config.reuse_port == (worker_count > 1)
+                for config in sharded_collector._worker_configs
+            )
+
+    def test_invalid_max_pending_messages(self):
+        """Test max pending messages must be positive."""
+        with pytest.raises(ValueError):
+            collector.ShardedCollector(
+                2,
+                targets={"a": ("127.0.0.1", 1)},
+                limits=collector.CollectorLimits(max_pending_messages=0),
+            )
+
+    def test_invalid_max_pending_batches(self):
+        """Test max pending batches must be positive."""
+        with pytest.raises(ValueError):
+            collector.ShardedCollector(
+                2,
+                targets={"a": ("127.0.0.1", 1)},
+                limits=collector.CollectorLimits(max_pending_batches=0),
+            )
+
+    def test_missing_listen_address_and_targets(self):
+        """Test listen address or targets must be given."""
+        with pytest.raises(ValueError):
+            collector.ShardedCollector(2)
@@ -0,0 +1,97 @@
+"""COSEM tests."""
+# pylint: disable = no-self-use
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import construct
+import pytest
+
+from han import cosem
+
+
+class TestDateTime:
+    """Test DateTime."""
+
+    def test_parse(self):
+        """Test parse date-time with deviation and clock status."""
+        parsed = cosem.DateTime.parse(bytes.fromhex("0c07e40119060d091e05ffc481"))
+        assert parsed.year == 2020
+        assert parsed.month == 1
+        assert parsed.day_of_month == 25
+        assert parsed.day_of_week == 6
+        assert parsed.hundredths_of_second == 5
+        assert parsed.deviation == -60
+        assert parsed.datetime == datetime(
+            2020, 1, 25, 13, 9, 30, 50000, timezone(timedelta(hours=1))
+        )
+        assert parsed.clock_status == 0x81
+        assert parsed.clock_status.invalid_value == 1
+        assert parsed.clock_status.doubtful_value == 0
+        assert parsed.clock_status.different_clock_base == 0
+        assert parsed.clock_status.invalid_clock_status == 0
+        assert parsed.clock_status.daylight_saving_active == 1
+
+    def test_parse_not_specified(self):
+        """Test parse date-time with not specified fields."""
+        parsed = cosem.DateTime.parse(bytes.fromhex("0c07e3020401173416ff800000"))
+        assert parsed.hundredths_of_second is None
+        assert parsed.deviation is None
+        assert parsed.datetime == datetime(2019, 2, 4, 23, 52, 22)
+        assert parsed.datetime.tzinfo is None
+
+    def test_timezone_is_cached(self):
+        """Test that timezone instance is shared by date-times with same deviation."""
+        first = cosem.DateTime.parse(bytes.fromhex("0c07e40119060d091e00ffc400"))
+        second = cosem.DateTime.parse(bytes.fromhex("0c07e4011a070d091e00ffc400"))
+        assert first.datetime.tzinfo is second.datetime.tzinfo
+
+    def test_build(self):
+        """Test that parsed date-time is built into same bytes."""
+        data = bytes.fromhex("0c07e40119060d091e05ffc481")
+        assert cosem.DateTime.build(cosem.DateTime.parse(data)) == data
+
+    def test_unexpected_length(self):
+        """Test that other length than 12 is rejected."""
+        with pytest.raises(construct.ConstError):
+            cosem.DateTime.parse(bytes.fromhex("0b07e40119060d091e05ffc481"))
+
+
+class TestScaling:
+    """Test scaling of values with scaler exponent."""
+
+    @pytest.mark.parametrize("exponent", [-12, -9, -3, -2, -1, 0, 1, 2, 9, 12])
+    def test_scale_to_float(self, exponent):
+        """Test that scaled value is the exact decimal value converted to float."""
+        for value in (0, 1, 7, 2307, 65535, -32768, 4294967295):
+            expected = float(Decimal(value) * Decimal(10) ** exponent)
+            assert cosem.scale_to_float(value, exponent) == expected
+
+    @pytest.mark.parametrize("exponent", [-12, -9, -2, 0, 1, 9, 12])
+    def test_scale_multiplier(self, exponent):
+        """Test that multiplier is the same as 10**exponent."""
+        multiplier = cosem.scale_multiplier(exponent)
+        assert multiplier == 10**exponent
+        assert type(multiplier) is type(10**exponent)
+
+
+class TestReadAxdrLength:
+    """Test A-XDR length decoding."""
+
+    @pytest.mark.parametrize(
+        "data,position,expected",
+        [
+            ["05", 0, (5, 1)],
+            ["097f", 1, (127, 2)],
+            ["8180", 0, (128, 2)],
+            ["820100", 0, (256, 3)],
+        ],
+    )
+    def test_read_axdr_length(self, data, position, expected):
+        """Test short and long form lengths from bytes and memoryview."""
+        assert cosem.read_axdr_length(bytes.fromhex(data), position) == expected
+        assert (
+            cosem.read_axdr_length(memoryview(bytes.fromhex(data)), position)
+            == expected
+        )
@@ -2,6 +2,8 @@
 from datetime import datetime
 from pprint import pprint
 
+import pytest
+
 from han.dlde import (
     DataReadout,
     DataSet,
@@ -203,6 +205,107 @@ class TestModeDReader:
             address="1-0:41.7.0", values=[DataSetValue(value="0000.350", unit="kW")]
         )
 
+    @pytest.mark.parametrize(
+        "readout_data",
+        [
+            EXAMPLE_DATA_A_LANDISGYR_360 + CRLF,
+            EXAMPLE_DATA_B,
+            EXAMPLE_DATA_C,
+            EXAMPLE_DATA_D_LANDISGYR_360,
+            EXAMPLE_DATA_KAMSTRUP,
+        ],
+    )
+    def test_parse_data_lines_while_reading(self, readout_data):
+        """Test that data lines parsed while reading equals parsing of complete readout."""
+        reader = ModeDReader(parse_data_lines=True)
+        readouts = []
+        for i in range(0, len(readout_data), 7):
+            readouts.extend(reader.read(readout_data[i : i + 7]))
+
+        assert len(readouts) == 1
+        expected = DataReadout(readout_data)
+        assert readouts[0].as_bytes == expected.as_bytes
+        assert (
+            readouts[0]._calculated_crc  # pylint: disable=protected-access
+            == expected._calculated_crc  # pylint: disable=protected-access
+        )
+        assert readouts[0].is_valid
+        assert parse_p1_readout(readouts[0]) == parse_p1_readout_content(
+            expected.payload
+        )
+
+    def test_parse_data_lines_invalid_line(self):
+        """Test that invalid data line is reported when readout is parsed."""
+        reader = ModeDReader(parse_data_lines=True)
+        readouts = reader.read(IDENT + b"1-0:1.8.0(1*k*Wh)\r\n" + END_LINE)
+        assert len(readouts) == 1
+        with pytest.raises(ValueError):
+            parse_p1_readout(readouts[0])
+
+    def test_oversize_readout_is_discarded(self):
+        """Test that only the readout exceeding max readout length is discarded."""
+        reader = ModeDReader(max_line_length=64, max_readout_length=256)
+        oversize = IDENT + CRLF + LINE_WITH_UNIT * 20 + END_LINE
+        valid = IDENT + CRLF + LINE_WITH_UNIT + END_LINE
+
+        readouts = reader.read(b"junk" + oversize + valid)
+
+        assert len(readouts) == 1
+        assert readouts[0].as_bytes == valid
+        assert reader.statistics.oversize_readouts == 1
+        assert reader.statistics.oversize_lines == 0
+        assert reader.statistics.discarded_bytes == len(b"junk" + oversize)
+
+    def test_oversize_line_is_discarded(self):
+        """Test that readout is discarded when a line exceeds max line length."""
+        reader = ModeDReader(max_line_length=64, max_readout_length=256)
+        valid = IDENT + CRLF + LINE_WITH_UNIT + END_LINE
+
+        assert len(reader.read(IDENT + CRLF + b"1-0:1.8.0(" + b"0" * 40)) == 0
+        assert len(reader.read(b"0" * 40)) == 0
+        assert reader.is_in_hunt_mode
+        assert reader.statistics.oversize_lines == 1
+
+        readouts = reader.read(b"*kWh)\r\n" + valid)
+        assert len(readouts) == 1
+        assert readouts[0].as_bytes == valid
+
+    def test_oversize_line_in_one_chunk_is_discarded(self):
+        """Test that complete line exceeding max line length in one chunk is discarded."""
+        reader = ModeDReader(max_line_length=64, max_readout_length=256)
+        oversize = IDENT + CRLF + b"1-0:1.8.0(" + b"0" * 80 + b"*kWh)\r\n" + END_LINE
+        valid = IDENT + CRLF + LINE_WITH_UNIT + END_LINE
+
+        readouts = reader.read(oversize + valid)
+
+        assert len(readouts) == 1
+        assert readouts[0].as_bytes == valid
+        assert reader.statistics.oversize_lines == 1
+        assert reader.statistics.discarded_bytes == len(oversize)
+
+    def test_missing_end_line(self):
+        """Test that readout without end line is discarded when next readout starts."""
+        reader = ModeDReader()
+        incomplete = IDENT + CRLF + LINE_WITH_UNIT
+        valid = IDENT + CRLF + LINE_WITHOUT_UNIT + END_LINE
+
+        readouts = reader.read(incomplete + valid)
+
+        assert len(readouts) == 1
+        assert readouts[0].as_bytes == valid
+        assert reader.statistics.discarded_bytes == len(incomplete)
+
+    def test_invalid_limits(self):
+        """Test that max line length exceeding max readout length is rejected."""
+        with pytest.raises(ValueError):
+            ModeDReader(max_line_length=1024, max_readout_length=512)
+
+    def test_limits(self):
+        """Test that limits of reader are returned."""
+        reader = ModeDReader(max_line_length=512, max_readout_length=1024)
+        assert reader.limits.max_line_length == 512
+        assert reader.limits.max_readout_length == 1024
+
 
 class TestDataReadout:
     """Test DataReadout."""
@@ -410,6 +513,48 @@ class TestParse:
             ),
         ]
 
+    def test_parse_mbus_multi_value_line(self):
+        """Parse M-Bus line with capture time and value."""
+        data_block = b"0-1:24.2.1(180924130000S)(04890.857*m3)\r\n"
+        parsed = parse_p1_readout_content(data_block)
+        assert parsed == [
+            DataSet(
+                address="0-1:24.2.1",
+                values=[
+                    DataSetValue(value="180924130000S", unit=None),
+                    DataSetValue(value="04890.857", unit="m3"),
+                ],
+            ),
+        ]
+
+    def test_parse_address_omitted_line(self):
+        """Parse data set line where address is omitted."""
+        data_block = b"1-0:1.8.0(00000896.020*kWh)\r\n(00000048.792*kWh)\r\n()\r\n"
+        parsed = parse_p1_readout_content(data_block)
+        assert parsed == [
+            DataSet(
+                address="1-0:1.8.0",
+                values=[DataSetValue(value="00000896.020", unit="kWh")],
+            ),
+            DataSet(
+                address=None,
+                values=[DataSetValue(value="00000048.792", unit="kWh")],
+            ),
+            DataSet(address=None, values=[DataSetValue(value="", unit=None)]),
+        ]
+
+    def test_parse_multiple_unit_separators(self):
+        """Assert that value with multiple unit separators is rejected."""
+        with pytest.raises(ValueError):
+            parse_p1_readout_content(b"1-0:1.8.0(00000896.020*k*Wh)\r\n")
+
+    def test_parse_example_b(self):
+        """Parse example data B and compare with parsing of text."""
+        readout = DataReadout(EXAMPLE_DATA_B)
+        parsed = parse_p1_readout(readout)
+        assert len(parsed) == 33
+        assert parsed == DataSet.parse_data_block(readout.payload.decode("ascii"))
+
 
 class TestDecode:
     """Test decode P1 readouts."""
@@ -0,0 +1,175 @@
+"""General-block-transfer tests."""
+# pylint: disable = no-self-use
+from __future__ import annotations
+
+import pytest
+
+import tests.test_aidon
+from han import aidon, gbt
+from han.common import DlmsMessage, MeterMessageBase, MeterReaderBase
+
+LLC_HEADER = b"\xe6\xe7\x00"
+
+
+def _create_block(
+    block_number: int, block_data: bytes, last: bool = False, llc: bool = True
+) -> DlmsMessage:
+    block = bytes((0xE0, 0x80 if last else 0x00))
+    block += block_number.to_bytes(2, "big") + b"\x00\x00"
+    if len(block_data) < 0x80:
+        block += bytes((len(block_data),))
+    else:
+        block += b"\x82" + len(block_data).to_bytes(2, "big")
+    return DlmsMessage((LLC_HEADER if llc else b"") + block + block_data)
+
+
+class _ListReader(MeterReaderBase[MeterMessageBase]):
+    def __init__(self, messages: list[MeterMessageBase]) -> None:
+        self._messages = messages
+
+    @property
+    def is_in_hunt_mode(self) -> bool:
+        return False
+
+    def read(self, data_chunk: bytes | memoryview) -> list[MeterMessageBase]:
+        return [self._messages.pop(0)] if self._messages else []
+
+
+class TestGeneralBlockTransferReassembler:
+    """Test GeneralBlockTransferReassembler."""
+
+    def test_not_block_is_passed_on(self):
+        """Test message without general-block-transfer block is passed on as is."""
+        message = DlmsMessage(tests.test_aidon.no_list_1)
+        reassembler = gbt.GeneralBlockTransferReassembler()
+
+        assert reassembler.add(message) is message
+
+    def test_reassemble_blocks(self):
+        """Test blocks are joined to an APDU that can be decoded."""
+        apdu = tests.test_aidon.no_list_2[3:]
+        reassembler = gbt.GeneralBlockTransferReassembler()
+
+        assert reassembler.add(_create_block(1, apdu[:20])) is None
+        assert reassembler.is_reassembling
+        assert reassembler.add(_create_block(2, apdu[20:200])) is None
+        message = reassembler.add(_create_block(3, apdu[200:], last=True))
+
+        assert message.payload == LLC_HEADER + apdu
+        assert aidon.decode_frame_content(message.payload) == (
+            aidon.decode_frame_content(tests.test_aidon.no_list_2)
+        )
+        assert not reassembler.is_reassembling
+
+    def test_reassemble_blocks_without_llc(self):
+        """Test blocks without LLC header are joined to APDU."""
+        reassembler = gbt.GeneralBlockTransferReassembler()
+
+        assert reassembler.add(_create_block(1, b"\x0f\x01", llc=False)) is None
+        message = reassembler.add(_create_block(2, b"\x02", last=True, llc=False))
+
+        assert message.payload == b"\x0f\x01\x02"
+
+    def test_out_of_order_and_duplicate_blocks(self):
+        """Test blocks are collected by block number."""
+        reassembler = gbt.GeneralBlockTransferReassembler()
+
+        assert reassembler.add(_create_block(1, b"\x0f\x01")) is None
+        assert reassembler.add(_create_block(3, b"\x03", last=True)) is None
+        assert reassembler.add(_create_block(3, b"\x03", last=True)) is None
+        message = reassembler.add(_create_block(2, b"\x02"))
+
+        assert message.payload == LLC_HEADER + b"\x0f\x01\x02\x03"
+        assert reassembler.statistics.out_of_order_blocks == 1
+        assert reassembler.statistics.duplicate_blocks == 1
+
+    def test_gap(self):
+        """Test incomplete APDU is dropped when next APDU starts."""
+        reassembler = gbt.GeneralBlockTransferReassembler()
+
+        assert reassembler.add(_create_block(1, b"\x0f\x01")) is None
+        assert reassembler.add(_create_block(3, b"\x03", last=True)) is None
+        assert reassembler.add(_create_block(1, b"\x0f\x04")) is None
+        message = reassembler.add(_create_block(2, b"\x05", last=True))
+
+        assert message.payload == LLC_HEADER + b"\x0f\x04\x05"
+        assert reassembler.statistics.incomplete_apdus == 1
+        assert reassembler.statistics.dropped_blocks == 2
+
+    def test_timeout(self):
+        """Test incomplete APDU is dropped when next block is late."""
+        now = [0.0]
+        reassembler = gbt.GeneralBlockTransferReassembler(
+            block_timeout_sec=5, clock=lambda: now[0]
+        )
+
+        assert reassembler.add(_create_block(1, b"\x0f\x01")) is None
+        now[0] = 6.0
+        assert reassembler.add(_create_block(2, b"\x02", last=True)) is None
+        assert not reassembler.is_reassembling
+        assert reassembler.statistics.timeouts == 1
+        assert reassembler.statistics.incomplete_apdus == 1
+        assert reassembler.statistics.dropped_blocks == 2
+
+    def test_block_without_first_block_is_dropped(self):
+        """Test blocks are dropped until first block."""
+        reassembler = gbt.GeneralBlockTransferReassembler()
+
+        assert reassembler.add(_create_block(2, b"\x02", last=True)) is None
+        assert reassembler.statistics.dropped_blocks == 1
+
+    def test_oversize_apdu(self):
+        """Test APDU exceeding max length is dropped with remaining blocks."""
+        reassembler = gbt.GeneralBlockTransferReassembler(max_apdu_length=200)
+
+        assert reassembler.add(_create_block(1, bytes(150))) is None
+        assert reassembler.add(_create_block(2, bytes(150))) is None
+        assert reassembler.add(_create_block(3, bytes(10), last=True)) is None
+        assert not reassembler.is_reassembling
+        assert reassembler.statistics.oversize_apdus == 1
+        assert reassembler.statistics.dropped_blocks == 3
+
+    @pytest.mark.parametrize(
+        "payload",
+        [
+            LLC_HEADER + bytes.fromhex("e080000100000502"),
+            LLC_HEADER + bytes.fromhex("e0800000000001aa"),
+            LLC_HEADER + bytes.fromhex("e08000"),
+        ],
+    )
+    def test_invalid_block(self, payload):
+        """Test invalid block is dropped."""
+        reassembler = gbt.GeneralBlockTransferReassembler()
+
+        assert reassembler.add(DlmsMessage(payload)) is None
+        assert reassembler.statistics.dropped_blocks == 1
+
+    def test_invalid_limit(self):
+        """Test invalid max APDU length and block timeout are rejected."""
+        with pytest.raises(ValueError):
+            gbt.GeneralBlockTransferReassembler(0)
+        with pytest.raises(ValueError):
+            gbt.GeneralBlockTransferReassembler(block_timeout_sec=0)
+
+
+class TestGeneralBlockTransferReader:
+    """Test GeneralBlockTransferReader."""
+
+    def test_read(self):
+        """Test blocks read by other reader are reassembled."""
+        not_block = DlmsMessage(tests.test_aidon.no_list_1)
+        reader = gbt.GeneralBlockTransferReader(
+            _ListReader(
+                [
+                    _create_block(1, b"\x0f\x01"),
+                    _create_block(2, b"\x02", last=True),
+                    not_block,
+                ]
+            )
+        )
+
+        assert not reader.is_in_hunt_mode
+        assert reader.read(b"") == []
+        (message,) = reader.read(b"")
+        assert message.payload == LLC_HEADER + b"\x0f\x01\x02"
+        assert reader.read(b"") == [not_block]
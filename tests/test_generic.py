@@ -0,0 +1,105 @@
+"""Generic DLMS decoder tests."""
+from __future__ import annotations
+
+from datetime import datetime
+
+import pytest
+
+import tests.test_aidon
+import tests.test_kaifa
+import tests.test_kamstrup
+from han import aidon, generic, obis_map
+
+# structure of one OBIS element with double-long-unsigned value and scaler-unit (-1, W)
+NOTIFICATION_BODY_SCALED_ELEMENT = (
+    "0201 0203 0906 0100010700ff 06 00000100 0202 0fff 161b".replace(" ", "")
+)
+
+
+def _without_manufacturer(decoded: dict) -> dict:
+    return {k: v for k, v in decoded.items() if k != "meter_manufacturer"}
+
+
+class TestDecodeGeneric:
+    """Test decode generic DLMS data notifications."""
+
+    @pytest.mark.parametrize(
+        "llc_pdu,notification_body",
+        [
+            [tests.test_aidon.no_list_1, tests.test_aidon.NOTIFICATION_BODY_NO_LIST_1],
+            [tests.test_aidon.no_list_2, tests.test_aidon.NOTIFICATION_BODY_NO_LIST_2],
+            [tests.test_aidon.no_list_3, tests.test_aidon.NOTIFICATION_BODY_NO_LIST_3],
+            [tests.test_aidon.se_list, tests.test_aidon.NOTIFICATION_BODY_SE_LIST],
+        ],
+    )
+    def test_decode_same_as_aidon(self, llc_pdu, notification_body):
+        """Aidon lists are fully self-describing and decode as by the Aidon decoder."""
+        assert generic.decode_frame_content(llc_pdu) == _without_manufacturer(
+            aidon.decode_frame_content(llc_pdu)
+        )
+        body = bytes.fromhex(notification_body)
+        assert generic.decode_notification_body(body) == _without_manufacturer(
+            aidon.decode_notification_body(body)
+        )
+
+    def test_decode_kamstrup(self):
+        """Decode Kamstrup list without applying implicit Kamstrup scaling."""
+        decoded = generic.decode_frame_content(
+            tests.test_kamstrup.no_list_2_single_phase_real_sample
+        )
+        assert decoded["list_ver_id"] == "Kamstrup_V0001"
+        assert decoded["meter_id"] == "5705705705705702"
+        assert decoded["meter_type"] == "6861111BN242101040"
+        assert decoded["active_power_import"] == 10050
+        assert decoded["current_l1"] == 4512
+        assert decoded["voltage_l1"] == 223
+        assert decoded["meter_datetime"] == datetime(2021, 11, 24, 0, 0, 25)
+
+    def test_decode_scaler_unit(self):
+        """Decode value with scaler-unit structure."""
+        decoded = generic.decode_notification_body(
+            bytes.fromhex(NOTIFICATION_BODY_SCALED_ELEMENT)
+        )
+        assert decoded == {"active_power_import": 25.6}
+
+    @pytest.mark.parametrize(
+        "notification_body",
+        [
+            tests.test_kaifa.NOTIFICATION_BODY_NO_LIST_2,
+            "0203090600010700ff",
+            "ff",
+            "",
+        ],
+    )
+    def test_decode_invalid(self, notification_body):
+        """Data without OBIS code and value pairs raises ValueError."""
+        with pytest.raises(ValueError):
+            generic.decode_notification_body(bytes.fromhex(notification_body))
+
+    def test_decode_apdu_not_data_notification(self):
+        """Other APDUs than data-notification raises ValueError."""
+        with pytest.raises(ValueError):
+            generic.decode_apdu(bytes.fromhex("c001c100070100010700ff02"))
+
+    def test_decode_deeply_nested(self):
+        """Data nested deeper than max depth raises ValueError."""
+        with pytest.raises(ValueError):
+            generic.decode_notification_body(bytes.fromhex("0201" * 10000 + "00"))
+
+    def test_unknown_element_name_not_cached(self):
+        """Element names of OBIS codes not in the OBIS map are not cached."""
+        # pylint: disable=protected-access
+        decoded = generic.decode_notification_body(
+            bytes.fromhex("0202" "09060101636363ff" "1200ff")
+        )
+
+        assert decoded == {"99.99.99": 255}
+        assert bytes.fromhex("0101636363ff") not in obis_map._element_names
+
+    def test_decode_octet_string_of_date_time_length(self):
+        """Octet-string of date-time length that is not a date-time is kept as string."""
+        decoded = generic.decode_notification_body(
+            bytes.fromhex("0202" "09060101600101ff" "090c") + b"6841131BN243"
+        )
+
+        assert decoded == {"meter_type": "6841131BN243"}
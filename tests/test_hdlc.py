@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import pytest
 from han import hdlc
+from han.fastframecheck import FastFrameCheckSequence16
 
 FLAG_SEQUENCE = "7e"
 CONTROL_ESCAPE = "7d"
@@ -17,6 +18,35 @@ FRAME_WITH_FLAG_SEQUENCE_CHARACTER_IN_INFO = (
 STUFFED_FRAME_SHORT_INFO = "a00d0102011063ab7d5e7d5d7d23932D"
 
 
+def _create_frame(
+    information: bytes, segmented: bool = False, source_address: int = 0x01
+) -> bytes:
+    """Create frame data (without flag sequences) with header and frame check sequences."""
+    frame_length = 9 + len(information)
+    frame_format = 0xA000 | (0x0800 if segmented else 0) | frame_length
+    header = frame_format.to_bytes(2, "big") + bytes((0x41, source_address, 0x13))
+    header += FastFrameCheckSequence16.compute_checksum(
+        header, 0, len(header)
+    ).to_bytes(2, "little")
+    frame = header + information
+    return frame + FastFrameCheckSequence16.compute_checksum(
+        frame, 0, len(frame)
+    ).to_bytes(2, "little")
+
+
+def _read_frames(*frames: bytes) -> list[hdlc.HdlcFrame]:
+    frame_reader = hdlc.HdlcFrameReader(False)
+    return frame_reader.read(b"".join(b"\x7e" + frame + b"\x7e" for frame in frames))
+
+
+class _TestClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
 class TestHdlcFrameReader:
     """Test HdlcFrameReader."""
 
@@ -534,3 +564,149 @@ class TestHdlcFrame:
         assert frame.frame_check_sequence == int(FRAME_SHORT_INFO[-4:], 16)
         assert frame.is_good_ffc
         assert frame.is_expected_length
+
+
+class TestHdlcSegmentReassembler:
+    """Test HdlcSegmentReassembler."""
+
+    def test_not_segmented_frame_is_passed_on(self):
+        """Test frame without segmentation is passed on as is."""
+        (frame,) = _read_frames(_create_frame(b"\xe6\xe7\x00\x0f"))
+        reassembler = hdlc.HdlcSegmentReassembler()
+
+        assert reassembler.add(frame) is frame
+        assert not reassembler.is_reassembling
+
+    def test_reassemble_segments(self):
+        """Test information fields of segments are joined."""
+        frames = _read_frames(
+            _create_frame(b"\xe6\xe7\x00\x0f\x01", segmented=True),
+            _create_frame(b"\x02\x03", segmented=True),
+            _create_frame(b"\x04"),
+        )
+        reassembler = hdlc.HdlcSegmentReassembler()
+
+        assert reassembler.add(frames[0]) is None
+        assert reassembler.is_reassembling
+        assert reassembler.add(frames[1]) is None
+        message = reassembler.add(frames[2])
+
+        assert isinstance(message, hdlc.HdlcSegmentedMessage)
+        assert message.is_valid
+        assert message.payload == b"\xe6\xe7\x00\x0f\x01\x02\x03\x04"
+        assert message.frames == frames
+        assert message.as_bytes == b"".join(frame.as_bytes for frame in frames)
+        assert not reassembler.is_reassembling
+
+    def test_segment_timeout(self):
+        """Test incomplete message is discarded when next segment is late."""
+        frames = _read_frames(
+            _create_frame(b"\x01", segmented=True),
+            _create_frame(b"\x02", segmented=True),
+            _create_frame(b"\x03"),
+        )
+        clock = _TestClock()
+        reassembler = hdlc.HdlcSegmentReassembler(segment_timeout_sec=1, clock=clock)
+
+        assert reassembler.add(frames[0]) is None
+        clock.now = 2.0
+        assert reassembler.add(frames[1]) is None
+        message = reassembler.add(frames[2])
+
+        assert message.payload == b"\x02\x03"
+        assert reassembler.statistics.timeouts == 1
+        assert reassembler.statistics.discarded_segments == 1
+
+    def test_check_timeout(self):
+        """Test incomplete message is discarded by check_timeout when next segment is late."""
+        (frame,) = _read_frames(_create_frame(b"\x01", segmented=True))
+        clock = _TestClock()
+        reassembler = hdlc.HdlcSegmentReassembler(segment_timeout_sec=1, clock=clock)
+
+        assert reassembler.add(frame) is None
+        reassembler.check_timeout()
+        assert reassembler.is_reassembling
+        clock.now = 2.0
+        reassembler.check_timeout()
+
+        assert not reassembler.is_reassembling
+        assert reassembler.statistics.timeouts == 1
+        assert reassembler.statistics.discarded_segments == 1
+
+    def test_oversize_message(self):
+        """Test remaining segments are discarded when max message length is exceeded."""
+        frames = _read_frames(
+            _create_frame(b"\x01\x02", segmented=True),
+            _create_frame(b"\x03\x04", segmented=True),
+            _create_frame(b"\x05"),
+            _create_frame(b"\x06"),
+        )
+        reassembler = hdlc.HdlcSegmentReassembler(max_message_length=3)
+
+        assert reassembler.add(frames[0]) is None
+        assert reassembler.add(frames[1]) is None
+        assert reassembler.add(frames[2]) is None
+        assert reassembler.add(frames[3]) is frames[3]
+        assert reassembler.statistics.oversize_messages == 1
+        assert reassembler.statistics.discarded_segments == 3
+
+    def test_frame_from_other_address_interrupts_message(self):
+        """Test incomplete message is discarded when frame from other address is received."""
+        frames = _read_frames(
+            _create_frame(b"\x01", segmented=True),
+            _create_frame(b"\x02", source_address=0x03),
+        )
+        reassembler = hdlc.HdlcSegmentReassembler()
+
+        assert reassembler.add(frames[0]) is None
+        assert reassembler.add(frames[1]) is frames[1]
+        assert reassembler.statistics.interrupted_messages == 1
+
+    @pytest.mark.parametrize(
+        "max_message_length,segment_timeout_sec", [[0, 1.0], [10, 0]]
+    )
+    def test_invalid_limits(self, max_message_length, segment_timeout_sec):
+        """Test invalid limits are rejected."""
+        with pytest.raises(ValueError):
+            hdlc.HdlcSegmentReassembler(max_message_length, segment_timeout_sec)
+
+
+class TestHdlcSegmentReassemblingReader:
+    """Test HdlcSegmentReassemblingReader."""
+
+    def test_read_segmented_and_not_segmented(self):
+        """Test reading segmented frames split across chunks."""
+        data_feed = b"".join(
+            b"\x7e" + frame + b"\x7e"
+            for frame in [
+                _create_frame(b"\x01\x02", segmented=True),
+                _create_frame(b"\x03"),
+                bytes.fromhex(FRAME_SHORT_INFO),
+            ]
+        )
+        reader = hdlc.HdlcSegmentReassemblingReader()
+
+        messages = reader.read(data_feed[:10])
+        assert messages == []
+        assert not reader.is_in_hunt_mode
+        messages = reader.read(data_feed[10:])
+
+        assert len(messages) == 2
+        assert isinstance(messages[0], hdlc.HdlcSegmentedMessage)
+        assert messages[0].payload == b"\x01\x02\x03"
+        assert isinstance(messages[1], hdlc.HdlcFrame)
+        assert messages[1].payload == bytes.fromhex(FRAME_SHORT_INFO)[-4:-2]
+
+    def test_idle_discards_late_message(self):
+        """Test incomplete message is discarded at idle gap when next segment is late."""
+        clock = _TestClock()
+        reassembler = hdlc.HdlcSegmentReassembler(segment_timeout_sec=1, clock=clock)
+        reader = hdlc.HdlcSegmentReassemblingReader(reassembler=reassembler)
+
+        data_feed = b"\x7e" + _create_frame(b"\x01", segmented=True) + b"\x7e"
+        assert reader.read(data_feed) == []
+        clock.now = 2.0
+
+        assert reader.idle() == []
+        assert not reassembler.is_reassembling
+        assert reassembler.statistics.timeouts == 1
@@ -0,0 +1,130 @@
+"""Idle gap tests."""
+# pylint: disable = no-self-use
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+import tests.test_aidon
+from han import idle_gap
+from han.common import MeterMessageBase
+from han.hdlc import HdlcFrame, HdlcFrameReader
+from han.meter_connection import SmartMeterMessageProtocol
+from tests.test_streaming import FRAME_NO_LIST_1
+
+
+def test_get_idle_gap_sec():
+    """Test idle gap from character times."""
+    assert idle_gap.get_idle_gap_sec(2400, 3.5) == pytest.approx(3.5 * 11 / 2400)
+    assert idle_gap.get_idle_gap_sec(9600, 2, 10) == pytest.approx(2 * 10 / 9600)
+
+
+class TestIdleGapReader:
+    """Test IdleGapReader."""
+
+    def test_read_until_idle(self):
+        """Test bytes are collected until idle."""
+        reader = idle_gap.IdleGapReader()
+        assert reader.is_in_hunt_mode
+        assert reader.read(b"\x01\x02") == []
+        assert reader.read(b"\x03") == []
+        assert not reader.is_in_hunt_mode
+
+        (message,) = reader.idle()
+
+        assert message.payload == b"\x01\x02\x03"
+        assert reader.is_in_hunt_mode
+        assert reader.idle() == []
+
+    def test_oversize_message(self):
+        """Test message exceeding max length is discarded until idle."""
+        reader = idle_gap.IdleGapReader(max_message_length=4)
+        reader.read(b"\x01\x02\x03")
+        reader.read(b"\x04\x05")
+        reader.read(b"\x06")
+
+        assert reader.idle() == []
+        assert reader.statistics.oversize_messages == 1
+
+        reader.read(b"\x07")
+        assert reader.idle()[0].payload == b"\x07"
+
+    def test_invalid_limit(self):
+        """Test invalid max message length is rejected."""
+        with pytest.raises(ValueError):
+            idle_gap.IdleGapReader(0)
+
+
+class TestIdleGapProtocol:
+    """Test SmartMeterBaseProtocol with idle gap."""
+
+    def test_message_ends_at_idle_gap(self):
+        """Test message is delivered when no data is received for idle gap."""
+        payload = tests.test_aidon.no_list_1[3:]
+
+        async def receive() -> list[MeterMessageBase]:
+            queue: asyncio.Queue[MeterMessageBase] = asyncio.Queue()
+            protocol = SmartMeterMessageProtocol(
+                queue, [HdlcFrameReader(), idle_gap.IdleGapReader()], 0.2
+            )
+            for i in range(0, len(payload), 10):
+                protocol.data_received(payload[i : i + 10])
+                await asyncio.sleep(0.01)
+            assert queue.empty()
+
+            await asyncio.sleep(0.3)
+            protocol.data_received(payload)
+            await asyncio.sleep(0.3)
+
+            return [queue.get_nowait() for _ in range(queue.qsize())]
+
+        messages = asyncio.run(receive())
+
+        # the first burst may start mid message and is discarded
+        assert [message.payload for message in messages] == [payload]
+
+    def test_first_burst_of_only_reader_is_delivered(self):
+        """Test first message is delivered when idle gap reader is the only reader."""
+        payload = tests.test_aidon.no_list_1[3:]
+
+        async def receive() -> list[MeterMessageBase]:
+            queue: asyncio.Queue[MeterMessageBase] = asyncio.Queue()
+            protocol = SmartMeterMessageProtocol(queue, [idle_gap.IdleGapReader()], 0.1)
+            protocol.data_received(payload)
+            await asyncio.sleep(0.2)
+            return [queue.get_nowait() for _ in range(queue.qsize())]
+
+        messages = asyncio.run(receive())
+
+        assert [message.payload for message in messages] == [payload]
+
+    def test_partial_first_frame_does_not_select_idle_gap_reader(self):
+        """Test frame reader is selected when connection starts in the middle of a frame."""
+        frame = FRAME_NO_LIST_1
+
+        async def receive() -> tuple[SmartMeterMessageProtocol, list[MeterMessageBase]]:
+            queue: asyncio.Queue[MeterMessageBase] = asyncio.Queue()
+            protocol = SmartMeterMessageProtocol(
+                queue, [HdlcFrameReader(), idle_gap.IdleGapReader()], 0.1
+            )
+            protocol.data_received(frame[20:])
+            await asyncio.sleep(0.2)
+            protocol.data_received(frame)
+            await asyncio.sleep(0.2)
+            return protocol, [queue.get_nowait() for _ in range(queue.qsize())]
+
+        protocol, messages = asyncio.run(receive())
+
+        assert isinstance(protocol.selected_reader, HdlcFrameReader)
+        assert len(messages) == 1
+        assert isinstance(messages[0], HdlcFrame)
+
+    def test_invalid_idle_gap(self):
+        """Test invalid idle gap is rejected."""
+
+        async def create() -> None:
+            SmartMeterMessageProtocol(asyncio.Queue(), [], 0)
+
+        with pytest.raises(ValueError):
+            asyncio.run(create())
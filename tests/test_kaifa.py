@@ -382,6 +382,28 @@ class TestParseKaifa:
         assert parsed_notification_body.list_items[17].index == 17
         assert parsed_notification_body.list_items[17].value == 3210932
 
+    @pytest.mark.parametrize(
+        "notification_body,body_type",
+        [
+            # first element is an OBIS code octet-string
+            [NOTIFICATION_BODY_SE_LIST, kaifa.KaifaBodyType.OBIS_ELEMENTS],
+            # first element is an octet-string not of OBIS code length
+            [NOTIFICATION_BODY_NO_LIST_2, kaifa.KaifaBodyType.VALUE_ELEMENTS],
+            # first element is not an octet-string
+            [NOTIFICATION_BODY_NO_LIST_1, kaifa.KaifaBodyType.VALUE_ELEMENTS],
+        ],
+    )
+    def test_parse_body_type_from_first_element(self, notification_body, body_type):
+        """Test body type is selected from the first element of the body."""
+        parsed = kaifa.NotificationBody.parse(bytes.fromhex(notification_body))
+        assert parsed.type == body_type
+
+    @pytest.mark.parametrize("notification_body", ["02", "0201", "020109"])
+    def test_parse_truncated_body(self, notification_body):
+        """Test body of fewer than 4 bytes is not parsed."""
+        with pytest.raises(construct.ConstructError):
+            kaifa.NotificationBody.parse(bytes.fromhex(notification_body))
+
 
 class TestDecodeKaifa:
     """Test decode Kaifa frames."""
@@ -530,3 +552,10 @@ class TestDecodeKaifa:
         assert decoded["voltage_l1"] == 219.3
         assert decoded["voltage_l2"] == 0.0
         assert decoded["voltage_l3"] == 220.5
+
+    def test_decode_unexpected_number_of_elements(self):
+        """Decode value elements list of unknown layout."""
+        with pytest.raises(ValueError):
+            kaifa.decode_notification_body(
+                bytes.fromhex("0202" "06000016dc" "06000016dc")
+            )
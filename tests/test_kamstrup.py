@@ -632,6 +632,57 @@ class TestParseKamstrup:
         assert parsed_notification_body.length == 35
         assert isinstance(parsed_notification_body.list_items, construct.ListContainer)
 
+    def test_parse_stops_at_field_count(self):
+        """Parse elements until the number of fields of the structure is read."""
+        notification_body = (
+            "0204"
+            "0a0e 4b616d73747275705f5630303031"  # OBIS List version identifier
+            "00"  # null-data
+            "0906 0101010700ff  0600000768"  # 1.1.1.7.0.255 (P14)
+            "0906 0101020700ff  0600000000"  # not part of structure
+        ).replace(" ", "")
+        parsed = kamstrup.NotificationBody.parse(bytes.fromhex(notification_body))
+        assert len(parsed.list_items) == 2
+        assert parsed.list_items[1].obis == "1.1.1.7.0.255"
+        assert parsed.list_items[1].value == 0x768
+
+    def test_parse_element_crossing_field_count(self):
+        """Parse element crossing the number of fields of the structure."""
+        notification_body = (
+            "0202"
+            "0a0e 4b616d73747275705f5630303031"  # OBIS List version identifier
+            "0906 0101010700ff  0600000768"  # 1.1.1.7.0.255 (P14)
+        ).replace(" ", "")
+        with pytest.raises(construct.ValidationError):
+            kamstrup.NotificationBody.parse(bytes.fromhex(notification_body))
+
+    def test_parse_missing_elements(self):
+        """Parse structure with fewer fields than the number of fields of the structure."""
+        notification_body = (
+            "0205"
+            "0a0e 4b616d73747275705f5630303031"  # OBIS List version identifier
+            "0906 0101010700ff  0600000768"  # 1.1.1.7.0.255 (P14)
+        ).replace(" ", "")
+        with pytest.raises(construct.StreamError):
+            kamstrup.NotificationBody.parse(bytes.fromhex(notification_body))
+
+    def test_build_round_trip(self):
+        """Build parsed structure elements back to the same bytes."""
+        notification_body = bytes.fromhex(
+            (
+                "0204"
+                "0906 0001010000ff  090c 07e50b1803000019ff800000"  # 0.1.1.0.0.255
+                "0906 0001010000ff  090c 07e50b1803000119ff800000"  # 0.1.1.0.0.255
+            ).replace(" ", "")
+        )
+        parsed = kamstrup.NotificationBody.parse(notification_body)
+        assert kamstrup.NotificationBody.build(parsed) == notification_body
+
+    def test_sizeof(self):
+        """Size of structure elements is not known before parsing."""
+        with pytest.raises(construct.SizeofError):
+            kamstrup.NotificationBody.sizeof()
+
 
 class TestDecodeKamstrup:
     """Test decode Kamstrup frames."""
@@ -856,3 +907,50 @@ class TestDecodeKamstrup:
         assert decoded["meter_manufacturer"] == "Kamstrup"
         assert decoded["meter_type"] == "000000000000000000"
         assert decoded["voltage_l1"] == 0
+
+
+class TestDecodingContext:
+    """Test Kamstrup decoding context."""
+
+    CT_METER_BODY = NOTIFICATION_BODY_NO_LIST_1_SINGLE_PHASE_REAL_SAMPLE.replace(
+        "36383631313131424e323432313031303430", "36383531313131424e323432313031303430"
+    )
+
+    BODY_WITHOUT_METER_TYPE = (
+        NOTIFICATION_BODY_NO_LIST_1_SINGLE_PHASE_REAL_SAMPLE.replace(
+            "0219", "0217"
+        ).replace("0906 0101600101ff  0a12 36383631313131424e323432313031303430", "")
+    )
+
+    def test_standard_meter(self):
+        """Decode standard meter current scaling."""
+        context = kamstrup.DecodingContext()
+        decoded = context.decode_notification_body(
+            bytes.fromhex(NOTIFICATION_BODY_NO_LIST_1_SINGLE_PHASE_REAL_SAMPLE)
+        )
+        assert not context.is_ct_meter
+        assert context.meter_type == "6861111BN242101040"
+        assert decoded["current_l1"] == 8.96
+
+    def test_ct_meter(self):
+        """Decode CT meter current scaling."""
+        context = kamstrup.DecodingContext()
+        decoded = context.decode_notification_body(bytes.fromhex(self.CT_METER_BODY))
+        assert context.is_ct_meter
+        assert decoded["current_l1"] == 0.896
+
+    def test_ct_meter_scaling_without_meter_type(self):
+        """Decode frame without meter type using meter type from previous frame."""
+        context = kamstrup.DecodingContext()
+
+        decoded = context.decode_notification_body(
+            bytes.fromhex(self.BODY_WITHOUT_METER_TYPE)
+        )
+        assert decoded["current_l1"] == 8.96
+        assert "meter_type" not in decoded
+
+        context.decode_notification_body(bytes.fromhex(self.CT_METER_BODY))
+        decoded = context.decode_notification_body(
+            bytes.fromhex(self.BODY_WITHOUT_METER_TYPE)
+        )
+        assert decoded["current_l1"] == 0.896
@@ -0,0 +1,98 @@
+"""M-Bus tests."""
+# pylint: disable = no-self-use
+from __future__ import annotations
+
+import asyncio
+
+import tests.test_aidon
+from han import aidon, hdlc, mbus
+from han.common import MeterMessageBase, MeterMessageType
+from han.meter_connection import SmartMeterMessageProtocol
+
+
+def _create_frame(user_data: bytes, checksum_offset: int = 0) -> bytes:
+    """Create M-Bus long frame with control 0x53, address 0xff and control information 0x00."""
+    body = b"\x53\xff\x00" + user_data
+    checksum = (sum(body) + checksum_offset) & 0xFF
+    return bytes((0x68, len(body), len(body), 0x68)) + body + bytes((checksum, 0x16))
+
+
+FRAME_NO_LIST_1 = _create_frame(tests.test_aidon.no_list_1[3:])
+
+
+class TestMBusFrameReader:
+    """Test MBusFrameReader."""
+
+    def test_read_frame(self):
+        """Test read frame."""
+        reader = mbus.MBusFrameReader()
+        frames = reader.read(FRAME_NO_LIST_1)
+
+        assert len(frames) == 1
+        frame = frames[0]
+        assert frame.is_valid
+        assert frame.message_type == MeterMessageType.MBUS
+        assert frame.as_bytes == FRAME_NO_LIST_1
+        assert frame.length == len(FRAME_NO_LIST_1) - 6
+        assert frame.control == 0x53
+        assert frame.address == 0xFF
+        assert frame.control_information == 0x00
+        assert frame.payload == tests.test_aidon.no_list_1[3:]
+        assert aidon.decode_notification_body(frame.payload[6:])
+        assert reader.is_in_hunt_mode
+
+    def test_read_frame_in_chunks(self):
+        """Test read frame one byte at a time with data before and between frames."""
+        data_feed = b"\x00\x68\x01" + FRAME_NO_LIST_1 + b"\xe5" + FRAME_NO_LIST_1
+        reader = mbus.MBusFrameReader()
+
+        frames = []
+        for i in range(len(data_feed)):
+            frames.extend(reader.read(data_feed[i : i + 1]))
+            if i == 10:
+                assert not reader.is_in_hunt_mode
+
+        assert len(frames) == 2
+        assert all(frame.as_bytes == FRAME_NO_LIST_1 for frame in frames)
+        assert reader.statistics.discarded_bytes == 4
+
+    def test_bad_checksum(self):
+        """Test frame with bad checksum is returned as invalid."""
+        reader = mbus.MBusFrameReader()
+        frames = reader.read(_create_frame(b"\x01\x02", checksum_offset=1))
+
+        assert len(frames) == 1
+        assert not frames[0].is_valid
+
+    def test_missing_stop(self):
+        """Test header without stop character at end of frame is skipped."""
+        reader = mbus.MBusFrameReader()
+        frames = reader.read(
+            bytes.fromhex("6805056853ff000102") + b"\x00\x00" + FRAME_NO_LIST_1
+        )
+
+        assert len(frames) == 1
+        assert frames[0].as_bytes == FRAME_NO_LIST_1
+        assert reader.statistics.discarded_bytes == 11
+
+    def test_reader_auto_selection(self):
+        """Test reader is selected by SmartMeterBaseProtocol."""
+
+        async def receive() -> tuple[SmartMeterMessageProtocol, list]:
+            queue: asyncio.Queue[MeterMessageBase] = asyncio.Queue()
+            reader = mbus.MBusFrameReader()
+            protocol = SmartMeterMessageProtocol(
+                queue, [hdlc.HdlcFrameReader(), reader]
+            )
+            protocol.data_received(FRAME_NO_LIST_1)
+            protocol.data_received(FRAME_NO_LIST_1)
+            messages = []
+            while not queue.empty():
+                messages.append(queue.get_nowait())
+            return reader, messages
+
+        reader, messages = asyncio.run(receive())
+
+        assert len(messages) == 2
+        assert all(isinstance(message, mbus.MBusFrame) for message in messages)
+        assert reader.statistics.discarded_bytes == 0
@@ -0,0 +1,1075 @@
+"""Meter connection tests."""
+# pylint: disable = no-self-use
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import tracemalloc
+from asyncio import BaseTransport, Future, Queue, QueueEmpty
+from typing import Any
+
+import pytest
+
+import tests.test_hdlc
+from han.common import MeterMessageBase
+from han.dlde import ModeDReader
+from han.hdlc import HdlcFrameReader
+from han.idle_gap import IdleGapReader
+from han.tcp_connection_factory import create_tcp_message_payload_connection
+from han.meter_connection import (
+    BackOffStrategy,
+    ConnectionManager,
+    ConnectionState,
+    ConnectionWatchdog,
+    DecorrelatedJitterBackOff,
+    DeliveryPolicy,
+    FullJitterBackOff,
+    MeterHub,
+    get_message_batches,
+    MeterTransportProtocol,
+    ReconnectRateLimiter,
+    SharedTaggedQueue,
+    SmartMeterBufferedMessageProtocol,
+    SmartMeterMessageBatchProtocol,
+    SmartMeterMessagePayloadProtocol,
+    SmartMeterMessageProtocol,
+    TaggedQueue,
+    create_default_readers,
+)
+
+HDLC_FRAME = bytes.fromhex("7e" + tests.test_hdlc.FRAME_SHORT_INFO + "7e")
+
+
+class _FakeTransport(BaseTransport):
+    """Transport that signals connection lost to protocol when closed."""
+
+    def __init__(self, protocol: SmartMeterMessageProtocol) -> None:
+        super().__init__()
+        self._protocol = protocol
+        self._is_closing = False
+
+    def close(self) -> None:
+        if not self._is_closing:
+            self._is_closing = True
+            asyncio.get_running_loop().call_soon(self._protocol.connection_lost, None)
+
+    def is_closing(self) -> bool:
+        return self._is_closing
+
+
+class _NoBackOff(BackOffStrategy):
+    def failure(self) -> None:
+        pass
+
+    def reset(self) -> None:
+        pass
+
+    @property
+    def current_delay_sec(self) -> int:
+        return 0
+
+
+class _FakeMeters:
+    """Connection factory creating fake connections."""
+
+    def __init__(self, failures: int = 0) -> None:
+        self.connections: dict[str, list[MeterTransportProtocol]] = {}
+        self._failures = failures
+
+    def factory(self, meter_id: str):
+        async def create(queue: Queue[Any] | None = None) -> MeterTransportProtocol:
+            if self._failures > 0:
+                self._failures -= 1
+                raise OSError("connect failed")
+            protocol = SmartMeterMessageProtocol(
+                queue if queue is not None else Queue(), [HdlcFrameReader()]
+            )
+            transport = _FakeTransport(protocol)
+            protocol.connection_made(transport)
+            self.connections.setdefault(meter_id, []).append((transport, protocol))
+            return transport, protocol
+
+        return create
+
+
+async def _wait_for(condition, timeout_sec: float = 2.0) -> None:
+    loop = asyncio.get_running_loop()
+    end = loop.time() + timeout_sec
+    while not condition():
+        assert loop.time() < end, "Timeout waiting for condition"
+        await asyncio.sleep(0.001)
+
+
+class TestMeterHub:
+    """Test MeterHub."""
+
+    def test_aggregated_messages(self):
+        """Test messages from all meters are put on hub queue tagged with meter id."""
+
+        async def run() -> list[tuple[str, Any]]:
+            meters = _FakeMeters()
+            hub = MeterHub()
+            for meter_id in ("a", "b"):
+                hub.add_meter(meter_id, meters.factory(meter_id))
+            hub_task = asyncio.create_task(hub.run())
+            await _wait_for(lambda: hub.connected_count == 2)
+
+            for meter_id in ("a", "b"):
+                _, protocol = meters.connections[meter_id][0]
+                protocol.data_received(HDLC_FRAME)
+
+            hub.close()
+            await hub_task
+            return [hub.queue.get_nowait() for _ in range(hub.queue.qsize())]
+
+        messages = asyncio.run(run())
+
+        assert [meter_id for meter_id, _ in messages] == ["a", "b"]
+        assert all(message.is_valid for _, message in messages)
+
+    def test_reconnect_lost_connection(self):
+        """Test lost connection is reconnected."""
+
+        async def run() -> int:
+            meters = _FakeMeters()
+            hub = MeterHub()
+            hub.add_meter("a", meters.factory("a"))
+            hub_task = asyncio.create_task(hub.run())
+            await _wait_for(lambda: hub.connected_count == 1)
+
+            transport, _ = meters.connections["a"][0]
+            transport.close()
+            await _wait_for(lambda: len(meters.connections["a"]) == 2)
+            await _wait_for(lambda: hub.get_state("a") == ConnectionState.CONNECTED)
+
+            hub.close()
+            await hub_task
+            return len(meters.connections["a"])
+
+        assert asyncio.run(run()) == 2
+
+    def test_close_cancels_connect(self):
+        """Test connection attempts in progress are cancelled when hub is closed."""
+
+        async def run() -> bool:
+            connect_started = asyncio.Event()
+            connect_cancelled = asyncio.Event()
+
+            async def connect_forever(_: Any) -> Any:
+                connect_started.set()
+                try:
+                    await asyncio.Event().wait()
+                except asyncio.CancelledError:
+                    connect_cancelled.set()
+                    raise
+
+            hub = MeterHub()
+            hub.add_meter("a", connect_forever)
+            hub_task = asyncio.create_task(hub.run())
+            await connect_started.wait()
+
+            hub.close()
+            await asyncio.wait_for(hub_task, 1)
+            return connect_cancelled.is_set()
+
+        assert asyncio.run(run())
+
+    def test_retry_connect_error(self):
+        """Test connect is retried after error."""
+
+        async def run() -> ConnectionState:
+            meters = _FakeMeters(failures=3)
+            hub = MeterHub(back_off_factory=_NoBackOff)
+            hub.add_meter("a", meters.factory("a"))
+            hub_task = asyncio.create_task(hub.run())
+            await _wait_for(lambda: hub.connected_count == 1)
+            state = hub.get_state("a")
+            hub.close()
+            await hub_task
+            return state
+
+        assert asyncio.run(run()) == ConnectionState.CONNECTED
+
+    def test_remove_meter(self):
+        """Test removed meter is closed and not reconnected."""
+
+        async def run() -> tuple[list[str], int]:
+            meters = _FakeMeters()
+            hub = MeterHub()
+            hub.add_meter("a", meters.factory("a"))
+            hub.add_meter("b", meters.factory("b"))
+            hub_task = asyncio.create_task(hub.run())
+            await _wait_for(lambda: hub.connected_count == 2)
+
+            hub.remove_meter("a")
+            await asyncio.sleep(0.01)
+            meter_ids = hub.meter_ids
+            connections = len(meters.connections["a"])
+            hub.close()
+            await hub_task
+            return meter_ids, connections
+
+        assert asyncio.run(run()) == (["b"], 1)
+
+    def test_no_tasks_for_connected_meters(self):
+        """Test connected meters do not use tasks."""
+
+        async def run() -> int:
+            meters = _FakeMeters()
+            hub = MeterHub()
+            for i in range(500):
+                hub.add_meter(str(i), meters.factory(str(i)))
+            hub_task = asyncio.create_task(hub.run())
+            await _wait_for(lambda: hub.connected_count == 500)
+            await asyncio.sleep(0)
+
+            task_count = len(asyncio.all_tasks())
+            hub.close()
+            await hub_task
+            return task_count
+
+        # main and hub scheduler task
+        assert asyncio.run(run()) == 2
+
+    def test_add_meter_before_running(self):
+        """Test meters added before hub is running are connected when started."""
+        meters = _FakeMeters()
+        hub = MeterHub()
+        hub.add_meter("a", meters.factory("a"))
+        assert hub.get_state("a") == ConnectionState.BACKING_OFF
+
+        async def run() -> None:
+            hub_task = asyncio.create_task(hub.run())
+            await _wait_for(lambda: hub.connected_count == 1)
+            hub.close()
+            await hub_task
+
+        asyncio.run(run())
+
+    def test_close_before_running(self):
+        """Test hub closed before it is running returns at once, and can be run again."""
+        meters = _FakeMeters()
+        hub = MeterHub()
+        hub.add_meter("a", meters.factory("a"))
+        hub.close()
+
+        async def run() -> None:
+            await asyncio.wait_for(hub.run(), 1)
+            assert hub.connected_count == 0
+
+            hub_task = asyncio.create_task(hub.run())
+            await _wait_for(lambda: hub.connected_count == 1)
+            hub.close()
+            await hub_task
+
+        asyncio.run(run())
+
+    def test_invalid_arguments(self):
+        """Test invalid arguments are rejected."""
+        with pytest.raises(ValueError):
+            MeterHub(max_concurrent_connects=0)
+
+        async def add_twice() -> None:
+            hub = MeterHub()
+            hub.add_meter("a", _FakeMeters().factory("a"))
+            hub.add_meter("a", _FakeMeters().factory("a"))
+
+        with pytest.raises(ValueError):
+            asyncio.run(add_twice())
+
+
+class _DoneProtocol:
+    """Protocol with connection lost as soon as connected."""
+
+    def __init__(self) -> None:
+        self.done: Future[None] = asyncio.get_running_loop().create_future()
+        asyncio.get_running_loop().call_soon(self.done.set_result, None)
+
+
+class _ClosableTransport:
+    def close(self) -> None:
+        pass
+
+
+class TestConnectionManager:
+    """Test ConnectionManager."""
+
+    def test_connect_and_close(self):
+        """Test connect and close connection."""
+
+        async def run() -> tuple[ConnectionState, ConnectionState, bool]:
+            meters = _FakeMeters()
+            manager = ConnectionManager(meters.factory("a"))
+            loop_task = asyncio.create_task(manager.connect_loop())
+            await _wait_for(lambda: manager.state == ConnectionState.CONNECTED)
+            connected_state = manager.state
+
+            manager.close()
+            await loop_task
+            transport, _ = meters.connections["a"][0]
+            return connected_state, manager.state, transport.is_closing()
+
+        assert asyncio.run(run()) == (
+            ConnectionState.CONNECTED,
+            ConnectionState.CLOSING,
+            True,
+        )
+
+    def test_reconnect_lost_connection(self):
+        """Test lost connection is reconnected."""
+
+        async def run() -> int:
+            meters = _FakeMeters()
+            manager = ConnectionManager(meters.factory("a"))
+            loop_task = asyncio.create_task(manager.connect_loop())
+            await _wait_for(lambda: manager.state == ConnectionState.CONNECTED)
+
+            transport, _ = meters.connections["a"][0]
+            transport.close()
+            await _wait_for(lambda: len(meters.connections["a"]) == 2)
+
+            manager.close()
+            await loop_task
+            return len(meters.connections["a"])
+
+        assert asyncio.run(run()) == 2
+
+    def test_retry_connect_error(self):
+        """Test connect is retried after error."""
+
+        async def run() -> ConnectionState:
+            meters = _FakeMeters(failures=3)
+            manager = ConnectionManager(meters.factory("a"))
+            manager.back_off_connect_error = _NoBackOff()
+            loop_task = asyncio.create_task(manager.connect_loop())
+            await _wait_for(lambda: manager.state == ConnectionState.CONNECTED)
+            state = manager.state
+            manager.close()
+            await loop_task
+            return state
+
+        assert asyncio.run(run()) == ConnectionState.CONNECTED
+
+    def test_close_while_connecting(self):
+        """Test close cancels pending connect."""
+
+        async def run() -> tuple[bool, int]:
+            connect_started = asyncio.Event()
+
+            async def never_connect() -> MeterTransportProtocol:
+                connect_started.set()
+                await asyncio.sleep(3600)
+                raise AssertionError()
+
+            manager = ConnectionManager(never_connect)
+            loop_task = asyncio.create_task(manager.connect_loop())
+            await connect_started.wait()
+
+            manager.close()
+            await loop_task
+            return loop_task.done(), len(asyncio.all_tasks())
+
+        assert asyncio.run(run()) == (True, 1)
+
+    def test_close_while_backing_off(self):
+        """Test close stops back-off."""
+
+        async def run() -> ConnectionState:
+            meters = _FakeMeters(failures=1)
+            manager = ConnectionManager(meters.factory("a"))
+            loop_task = asyncio.create_task(manager.connect_loop())
+            await _wait_for(
+                lambda: manager.back_off_connect_error.current_delay_sec > 0
+            )
+            await asyncio.sleep(0)
+            state = manager.state
+
+            manager.close()
+            await asyncio.wait_for(loop_task, 1)
+            return state
+
+        assert asyncio.run(run()) == ConnectionState.BACKING_OFF
+
+    def test_soak_reconnect(self, caplog):
+        """Test task count and memory stay flat over 100k reconnects."""
+        caplog.set_level(logging.ERROR, logger="han.meter_connection")
+        reconnects = 100_000
+        # memory is traced for the last reconnects only, as tracing is slow
+        trace_start = reconnects - 10_000
+        connect_count = 0
+        max_task_count = 0
+        memory_usage: list[int] = []
+
+        async def run() -> None:
+            manager: ConnectionManager
+
+            async def connect():
+                nonlocal connect_count, max_task_count
+                connect_count += 1
+                max_task_count = max(max_task_count, len(asyncio.all_tasks()))
+                if connect_count == trace_start:
+                    tracemalloc.start()
+                if connect_count in (trace_start + 1_000, reconnects):
+                    memory_usage.append(tracemalloc.get_traced_memory()[0])
+                if connect_count == reconnects:
+                    manager.close()
+                return _ClosableTransport(), _DoneProtocol()
+
+            manager = ConnectionManager(connect)
+            manager.connection_lost_back_off_threshold = 0
+            await manager.connect_loop()
+
+        try:
+            asyncio.run(run())
+        finally:
+            tracemalloc.stop()
+
+        assert connect_count == reconnects
+        # connect loop and connect task
+        assert max_task_count == 2
+        assert memory_usage[1] - memory_usage[0] < 64 * 1024
+
+
+def _payload_frames(*payloads: bytes) -> bytes:
+    # pylint: disable=protected-access
+    return b"".join(
+        b"\x7e" + tests.test_hdlc._create_frame(payload) + b"\x7e"
+        for payload in payloads
+    )
+
+
+class _PausableTransport(_FakeTransport):
+    """Transport recording pause and resume of reading."""
+
+    def __init__(self, protocol: SmartMeterMessagePayloadProtocol) -> None:
+        super().__init__(protocol)  # type: ignore
+        self.pause_count = 0
+        self.is_reading = True
+
+    def pause_reading(self) -> None:
+        assert self.is_reading
+        self.is_reading = False
+        self.pause_count += 1
+
+    def resume_reading(self) -> None:
+        assert not self.is_reading
+        self.is_reading = True
+
+
+def _create_payload_protocol(
+    queue: Queue[bytes], delivery_policy: DeliveryPolicy
+) -> tuple[_PausableTransport, SmartMeterMessagePayloadProtocol]:
+    protocol = SmartMeterMessagePayloadProtocol(
+        queue, [HdlcFrameReader()], delivery_policy=delivery_policy
+    )
+    transport = _PausableTransport(protocol)
+    protocol.connection_made(transport)
+    return transport, protocol
+
+
+def _get_all(queue: Queue[Any]) -> list[Any]:
+    return [queue.get_nowait() for _ in range(queue.qsize())]
+
+
+class TestCreateDefaultReaders:
+    """Test default readers of the connection factories."""
+
+    def test_default_readers(self):
+        """Test P1 data lines are parsed and no idle gap reader is used by default."""
+        readers = create_default_readers()
+        assert not any(isinstance(reader, IdleGapReader) for reader in readers)
+        mode_d_reader = next(
+            reader for reader in readers if isinstance(reader, ModeDReader)
+        )
+        (readout,) = mode_d_reader.read(b"/AAA5MTR\r\n\r\n1.8.0(1)\r\n!\r\n")
+        assert readout.data_lines
+
+    def test_idle_gap_reader(self):
+        """Test idle gap reader is added last."""
+        readers = create_default_readers(parse_data_lines=False, use_idle_gap=True)
+        assert isinstance(readers[-1], IdleGapReader)
+        assert len(readers) == len(create_default_readers()) + 1
+
+
+class TestDeliveryPolicy:
+    """Test delivery policies of protocols with bounded queue."""
+
+    def test_unbounded_queue(self):
+        """Test all messages are delivered to unbounded queue."""
+
+        async def run() -> tuple[SmartMeterMessagePayloadProtocol, list[bytes]]:
+            queue: Queue[bytes] = Queue()
+            _, protocol = _create_payload_protocol(queue, DeliveryPolicy.DROP_NEWEST)
+            protocol.data_received(_payload_frames(b"1", b"2", b"3"))
+            return protocol, _get_all(queue)
+
+        protocol, payloads = asyncio.run(run())
+
+        assert payloads == [b"1", b"2", b"3"]
+        assert protocol.delivery_statistics.delivered_messages == 3
+        assert protocol.delivery_statistics.dropped_messages == 0
+
+    def test_drop_newest(self):
+        """Test messages received when queue is full are dropped."""
+
+        async def run() -> tuple[SmartMeterMessagePayloadProtocol, list[bytes]]:
+            queue: Queue[bytes] = Queue(maxsize=2)
+            _, protocol = _create_payload_protocol(queue, DeliveryPolicy.DROP_NEWEST)
+            protocol.data_received(_payload_frames(b"1", b"2", b"3", b"4"))
+            return protocol, _get_all(queue)
+
+        protocol, payloads = asyncio.run(run())
+
+        assert payloads == [b"1", b"2"]
+        assert protocol.delivery_statistics.delivered_messages == 2
+        assert protocol.delivery_statistics.dropped_messages == 2
+
+    def test_drop_oldest(self):
+        """Test oldest messages are removed from full queue."""
+
+        async def run() -> tuple[SmartMeterMessagePayloadProtocol, list[bytes]]:
+            queue: Queue[bytes] = Queue(maxsize=2)
+            _, protocol = _create_payload_protocol(queue, DeliveryPolicy.DROP_OLDEST)
+            protocol.data_received(_payload_frames(b"1", b"2", b"3", b"4"))
+            payloads = _get_all(queue)
+            for _ in payloads:
+                queue.task_done()
+            # removed messages must not be waited for by join()
+            await asyncio.wait_for(queue.join(), 1)
+            return protocol, payloads
+
+        protocol, payloads = asyncio.run(run())
+
+        assert payloads == [b"3", b"4"]
+        assert protocol.delivery_statistics.delivered_messages == 4
+        assert protocol.delivery_statistics.dropped_messages == 2
+
+    def test_drop_oldest_of_tagged_queue(self):
+        """Test only oldest messages of the same tag are removed from full shared queue."""
+
+        async def run() -> tuple[SmartMeterMessagePayloadProtocol, list[Any]]:
+            shared_queue = SharedTaggedQueue(maxsize=3)
+            shared_queue.put_nowait(("other", b"a"))
+            _, protocol = _create_payload_protocol(
+                TaggedQueue("meter", shared_queue), DeliveryPolicy.DROP_OLDEST
+            )
+            protocol.data_received(_payload_frames(b"1", b"2", b"3", b"4"))
+            items = _get_all(shared_queue)
+            for _ in items:
+                shared_queue.task_done()
+            # removed messages must not be waited for by join()
+            await asyncio.wait_for(shared_queue.join(), 1)
+            return protocol, items
+
+        protocol, items = asyncio.run(run())
+
+        assert items == [("other", b"a"), ("meter", b"3"), ("meter", b"4")]
+        assert protocol.delivery_statistics.delivered_messages == 4
+        assert protocol.delivery_statistics.dropped_messages == 2
+
+    def test_drop_oldest_of_tagged_queue_without_messages_of_tag(self):
+        """Test received message is dropped when full shared queue has no message of the tag."""
+
+        async def run() -> tuple[SmartMeterMessagePayloadProtocol, list[Any]]:
+            shared_queue = SharedTaggedQueue(maxsize=1)
+            shared_queue.put_nowait(("other", b"a"))
+            _, protocol = _create_payload_protocol(
+                TaggedQueue("meter", shared_queue), DeliveryPolicy.DROP_OLDEST
+            )
+            protocol.data_received(_payload_frames(b"1"))
+            return protocol, _get_all(shared_queue)
+
+        protocol, items = asyncio.run(run())
+
+        assert items == [("other", b"a")]
+        assert protocol.delivery_statistics.delivered_messages == 0
+        assert protocol.delivery_statistics.dropped_messages == 1
+
+    def test_coalesce_latest(self):
+        """Test only latest message is kept until queue has room."""
+
+        async def run() -> tuple[SmartMeterMessagePayloadProtocol, list[bytes]]:
+            queue: Queue[bytes] = Queue(maxsize=1)
+            _, protocol = _create_payload_protocol(
+                queue, DeliveryPolicy.COALESCE_LATEST
+            )
+            protocol.data_received(_payload_frames(b"1", b"2", b"3", b"4"))
+            payloads = [await queue.get()]
+            payloads.append(await queue.get())
+            # messages received while pending message is delivered are not reordered
+            protocol.data_received(_payload_frames(b"5"))
+            payloads.append(await queue.get())
+            await asyncio.sleep(0)
+            return protocol, payloads
+
+        protocol, payloads = asyncio.run(run())
+
+        assert payloads == [b"1", b"4", b"5"]
+        assert protocol.delivery_statistics.delivered_messages == 3
+        assert protocol.delivery_statistics.dropped_messages == 2
+
+    def test_coalesce_latest_replaces_message_waiting_for_room(self):
+        """Test message waiting for room in queue is replaced by latest message."""
+
+        async def run() -> tuple[SmartMeterMessagePayloadProtocol, list[bytes]]:
+            queue: Queue[bytes] = Queue(maxsize=1)
+            _, protocol = _create_payload_protocol(
+                queue, DeliveryPolicy.COALESCE_LATEST
+            )
+            protocol.data_received(_payload_frames(b"1", b"2"))
+            # let the delivery task wait for room for message 2
+            await asyncio.sleep(0)
+            protocol.data_received(_payload_frames(b"3"))
+            payloads = [await queue.get(), await queue.get()]
+            await asyncio.sleep(0)
+            return protocol, payloads
+
+        protocol, payloads = asyncio.run(run())
+
+        assert payloads == [b"1", b"3"]
+        assert protocol.delivery_statistics.delivered_messages == 2
+        assert protocol.delivery_statistics.dropped_messages == 1
+
+    def test_pause_reading(self):
+        """Test reading is paused until queue has room for all received messages."""
+
+        async def run() -> tuple[
+            _PausableTransport, SmartMeterMessagePayloadProtocol, list[bytes]
+        ]:
+            queue: Queue[bytes] = Queue(maxsize=1)
+            transport, protocol = _create_payload_protocol(
+                queue, DeliveryPolicy.PAUSE_READING
+            )
+            protocol.data_received(_payload_frames(b"1", b"2", b"3"))
+            assert not transport.is_reading
+            payloads = [await queue.get() for _ in range(3)]
+            await _wait_for(lambda: transport.is_reading)
+            return transport, protocol, payloads
+
+        transport, protocol, payloads = asyncio.run(run())
+
+        assert payloads == [b"1", b"2", b"3"]
+        assert transport.pause_count == 1
+        assert protocol.delivery_statistics.delivered_messages == 3
+        assert protocol.delivery_statistics.dropped_messages == 0
+        assert protocol.delivery_statistics.paused_reading == 1
+
+    def test_pending_messages_dropped_when_connection_lost(self):
+        """Test messages waiting for room in queue are dropped when connection is lost."""
+
+        async def run() -> SmartMeterMessagePayloadProtocol:
+            queue: Queue[bytes] = Queue(maxsize=1)
+            transport, protocol = _create_payload_protocol(
+                queue, DeliveryPolicy.PAUSE_READING
+            )
+            protocol.data_received(_payload_frames(b"1", b"2", b"3"))
+            transport.close()
+            await protocol.done
+            return protocol
+
+        protocol = asyncio.run(run())
+
+        assert protocol.delivery_statistics.delivered_messages == 1
+        assert protocol.delivery_statistics.dropped_messages == 2
+
+    def test_meter_hub_queue(self):
+        """Test delivery policy is applied to bounded hub queue."""
+
+        async def run() -> list[tuple[str, Any]]:
+            meters = _FakeMeters()
+            hub = MeterHub(SharedTaggedQueue(maxsize=1))
+            hub.add_meter("a", meters.factory("a"))
+            hub_task = asyncio.create_task(hub.run())
+            await _wait_for(lambda: hub.connected_count == 1)
+
+            _, protocol = meters.connections["a"][0]
+            protocol.data_received(HDLC_FRAME * 3)
+
+            hub.close()
+            await hub_task
+            return _get_all(hub.queue)
+
+        messages = asyncio.run(run())
+
+        assert len(messages) == 1
+        assert messages[0][0] == "a"
+
+
+class TestSharedTaggedQueue:
+    """Test SharedTaggedQueue and TaggedQueue."""
+
+    def test_remove_oldest(self):
+        """Test oldest item of tag is removed and items of other tags are kept in order."""
+        shared_queue = SharedTaggedQueue()
+        for tagged_item in [("a", 1), ("b", 2), ("a", 3), ("b", 4)]:
+            shared_queue.put_nowait(tagged_item)
+
+        assert shared_queue.remove_oldest("b") == 2
+        assert shared_queue.qsize() == 3
+        assert _get_all(shared_queue) == [("a", 1), ("a", 3), ("b", 4)]
+        assert shared_queue.empty()
+        with pytest.raises(QueueEmpty):
+            shared_queue.remove_oldest("a")
+
+    def test_removed_items_are_compacted(self):
+        """Test removed items do not accumulate when items of one tag are replaced."""
+        # pylint: disable=protected-access
+        shared_queue = SharedTaggedQueue(maxsize=2)
+        shared_queue.put_nowait(("other", 0))
+        shared_queue.put_nowait(("meter", 0))
+        for item in range(1, 100):
+            shared_queue.remove_oldest("meter")
+            shared_queue.put_nowait(("meter", item))
+
+        assert len(shared_queue._queue) <= 2 * shared_queue.maxsize
+        assert _get_all(shared_queue) == [("other", 0), ("meter", 99)]
+
+    def test_tagged_queue_size_of_shared_queue(self):
+        """Test size of tagged queue is the size of the shared queue."""
+        shared_queue = SharedTaggedQueue(maxsize=2)
+        tagged_queue = TaggedQueue("meter", shared_queue)
+        assert tagged_queue.empty()
+
+        shared_queue.put_nowait(("other", 1))
+        tagged_queue.put_nowait(2)
+
+        assert not tagged_queue.empty()
+        assert tagged_queue.qsize() == 2
+        assert tagged_queue.full()
+        assert tagged_queue.get_nowait() == 2
+        assert _get_all(shared_queue) == [("other", 1)]
+
+
+class TestSmartMeterMessageBatchProtocol:
+    """Test SmartMeterMessageBatchProtocol."""
+
+    def test_one_batch_per_data_received(self):
+        """Test messages read from one chunk of data are put on the queue as one batch."""
+
+        async def run() -> list[list[MeterMessageBase]]:
+            queue: Queue[list[MeterMessageBase]] = Queue()
+            protocol = SmartMeterMessageBatchProtocol(queue, [HdlcFrameReader()])
+            protocol.data_received(_payload_frames(b"1", b"2", b"3"))
+            protocol.data_received(_payload_frames(b"4")[:-5])
+            protocol.data_received(_payload_frames(b"4")[-5:])
+            return _get_all(queue)
+
+        batches = asyncio.run(run())
+
+        assert [[message.payload for message in batch] for batch in batches] == [
+            [b"1", b"2", b"3"],
+            [b"4"],
+        ]
+
+    def test_get_message_batches(self):
+        """Test messages of all available batches are returned."""
+
+        async def run() -> tuple[list[bytes], list[bytes]]:
+            queue: Queue[list[MeterMessageBase]] = Queue()
+            protocol = SmartMeterMessageBatchProtocol(queue, [HdlcFrameReader()])
+            consumer = asyncio.create_task(get_message_batches(queue))
+            await asyncio.sleep(0)
+            protocol.data_received(_payload_frames(b"1", b"2"))
+            first = await consumer
+
+            protocol.data_received(_payload_frames(b"3"))
+            protocol.data_received(_payload_frames(b"4", b"5"))
+            second = await get_message_batches(queue)
+            return (
+                [message.payload for message in first],
+                [message.payload for message in second],
+            )
+
+        first, second = asyncio.run(run())
+
+        assert first == [b"1", b"2"]
+        assert second == [b"3", b"4", b"5"]
+
+    def test_batch_delivery_policy(self):
+        """Test delivery policy is applied to batches."""
+
+        async def run() -> tuple[SmartMeterMessageBatchProtocol, list[bytes]]:
+            queue: Queue[list[MeterMessageBase]] = Queue(maxsize=1)
+            protocol = SmartMeterMessageBatchProtocol(
+                queue, [HdlcFrameReader()], delivery_policy=DeliveryPolicy.DROP_OLDEST
+            )
+            protocol.data_received(_payload_frames(b"1", b"2"))
+            protocol.data_received(_payload_frames(b"3", b"4"))
+            messages = await get_message_batches(queue)
+            return protocol, [message.payload for message in messages]
+
+        protocol, payloads = asyncio.run(run())
+
+        assert payloads == [b"3", b"4"]
+        assert protocol.delivery_statistics.dropped_messages == 1
+
+
+class TestBufferedProtocol:
+    """Test protocols receiving data into preallocated buffer."""
+
+    def test_buffer_reused(self):
+        """Test messages are read from the reused receive buffer."""
+
+        async def run() -> tuple[bool, list[bytes]]:
+            queue: Queue[MeterMessageBase] = Queue()
+            protocol = SmartMeterBufferedMessageProtocol(queue, [HdlcFrameReader()])
+            data = _payload_frames(b"1", b"2")
+
+            buffers = []
+            for chunk in (data[:7], data[7:]):
+                buffer = protocol.get_buffer(-1)
+                buffer[: len(chunk)] = chunk
+                protocol.buffer_updated(len(chunk))
+                buffers.append(buffer)
+
+            return buffers[0] is buffers[1], [
+                message.payload for message in _get_all(queue)
+            ]
+
+        is_reused, payloads = asyncio.run(run())
+
+        assert is_reused
+        assert payloads == [b"1", b"2"]
+
+    def test_eof_received(self):
+        """Test eof_received of SmartMeterBaseProtocol is not hidden by BufferedProtocol."""
+
+        async def run() -> bool | None:
+            protocol = SmartMeterBufferedMessageProtocol(Queue(), [HdlcFrameReader()])
+            return protocol.eof_received()
+
+        assert asyncio.run(run()) is False
+
+    def test_tcp_connection(self):
+        """Test buffered protocol created by TCP connection factory."""
+
+        async def run() -> tuple[MeterTransportProtocol, list[bytes]]:
+            data = _payload_frames(*expected)
+
+            def send(_, writer: asyncio.StreamWriter) -> None:
+                writer.write(data)
+                writer.close()
+
+            server = await asyncio.start_server(send, "127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            queue: Queue[bytes] = Queue()
+            transport, protocol = await create_tcp_message_payload_connection(
+                queue, None, None, "127.0.0.1", port, buffered=True
+            )
+            await protocol.done
+            server.close()
+            await server.wait_closed()
+            return (transport, protocol), _get_all(queue)
+
+        # frames without flag or control escape in frame check sequence, as octet stuffing is not used
+        expected = [
+            payload
+            for payload in (bytes((i,)) * 100 for i in range(100))
+            if not set(_payload_frames(payload)[1:-1]) & {0x7D, 0x7E}
+        ]
+        (_, protocol), payloads = asyncio.run(run())
+
+        assert isinstance(protocol, asyncio.BufferedProtocol)
+        assert payloads == expected
+
+
+class TestJitterBackOff:
+    """Test back-off strategies with jitter."""
+
+    def test_full_jitter(self):
+        """Test delay is between zero and exponential delay, and spread out."""
+        delays = []
+        for seed in range(100):
+            back_off = FullJitterBackOff(1.0, 10.0, random.Random(seed))
+            for failures in range(1, 7):
+                back_off.failure()
+                assert 0 <= back_off.current_delay_sec <= min(10.0, 2 ** (failures - 1))
+            delays.append(back_off.current_delay_sec)
+            back_off.reset()
+            assert back_off.current_delay_sec == 0
+
+        assert len(set(delays)) == 100
+        assert max(delays) - min(delays) > 5
+
+    def test_decorrelated_jitter(self):
+        """Test delay is between base delay and three times previous delay."""
+        back_off = DecorrelatedJitterBackOff(0.5, 30.0, random.Random(1))
+        previous_delay = 0.5
+        for _ in range(20):
+            back_off.failure()
+            delay = back_off.current_delay_sec
+            assert 0.5 <= delay <= min(30.0, previous_delay * 3)
+            previous_delay = delay
+
+        back_off.reset()
+        assert back_off.current_delay_sec == 0
+
+
+class _TestClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestReconnectRateLimiter:
+    """Test ReconnectRateLimiter."""
+
+    def test_burst_then_rate(self):
+        """Test burst of attempts is allowed before attempts are spread by rate."""
+        clock = _TestClock()
+        limiter = ReconnectRateLimiter(rate_per_sec=10, burst=3, clock=clock)
+
+        delays = [limiter.reserve() for _ in range(6)]
+
+        assert delays == pytest.approx([0, 0, 0, 0.1, 0.2, 0.3])
+
+    def test_refill(self):
+        """Test bucket is refilled over time."""
+        clock = _TestClock()
+        limiter = ReconnectRateLimiter(rate_per_sec=10, burst=2, clock=clock)
+        assert [limiter.reserve() for _ in range(3)] == pytest.approx([0, 0, 0.1])
+
+        clock.now += 1
+        assert [limiter.reserve() for _ in range(3)] == pytest.approx([0, 0, 0.1])
+
+    def test_reserve_with_delay(self):
+        """Test token is reserved at time of delayed attempt."""
+        clock = _TestClock()
+        limiter = ReconnectRateLimiter(rate_per_sec=1, clock=clock)
+
+        assert limiter.reserve(5) == pytest.approx(5)
+        assert limiter.reserve(5) == pytest.approx(6)
+        # tokens are reserved in order of reservation
+        assert limiter.reserve() == pytest.approx(7)
+
+    def test_connection_manager(self):
+        """Test connection managers sharing limiter connect at limited rate."""
+
+        async def run() -> list[float]:
+            loop = asyncio.get_running_loop()
+            limiter = ReconnectRateLimiter(rate_per_sec=100, burst=2)
+            connect_times: list[float] = []
+            managers = []
+            for _ in range(6):
+                meters = _FakeMeters()
+                factory = meters.factory("a")
+
+                async def create(factory=factory) -> MeterTransportProtocol:
+                    connect_times.append(loop.time())
+                    return await factory()
+
+                manager = ConnectionManager(create)
+                manager.reconnect_rate_limiter = limiter
+                managers.append(manager)
+
+            tasks = [
+                asyncio.create_task(manager.connect_loop()) for manager in managers
+            ]
+            await _wait_for(lambda: len(connect_times) == 6)
+            for manager in managers:
+                manager.close()
+            await asyncio.wait(tasks)
+            return sorted(connect_times)
+
+        connect_times = asyncio.run(run())
+
+        assert connect_times[-1] - connect_times[0] >= 0.04 - 0.005
+
+    def test_meter_hub(self):
+        """Test meter hub connects meters at limited rate."""
+
+        async def run() -> list[float]:
+            loop = asyncio.get_running_loop()
+            meters = _FakeMeters()
+            hub = MeterHub(reconnect_rate_limiter=ReconnectRateLimiter(100, burst=2))
+            connect_times: list[float] = []
+            for meter_id in range(6):
+                factory = meters.factory(str(meter_id))
+
+                async def create(queue, factory=factory) -> MeterTransportProtocol:
+                    connect_times.append(loop.time())
+                    return await factory(queue)
+
+                hub.add_meter(str(meter_id), create)
+
+            hub_task = asyncio.create_task(hub.run())
+            await _wait_for(lambda: hub.connected_count == 6)
+            hub.close()
+            await hub_task
+            return sorted(connect_times)
+
+        connect_times = asyncio.run(run())
+
+        assert len(connect_times) == 6
+        assert connect_times[-1] - connect_times[0] >= 0.04 - 0.005
+
+
+class TestConnectionWatchdog:
+    """Test ConnectionWatchdog."""
+
+    def test_close_silent_connection(self):
+        """Test connection without messages is closed after initial timeout."""
+
+        async def run() -> tuple[ConnectionWatchdog, float]:
+            loop = asyncio.get_running_loop()
+            watchdog = ConnectionWatchdog(initial_timeout_sec=0.05)
+            connection = await _FakeMeters().factory("a")()
+            start = loop.time()
+            watchdog.watch(connection)
+            await connection[1].done
+            return watchdog, loop.time() - start
+
+        watchdog, elapsed = asyncio.run(run())
+
+        assert elapsed >= 0.05
+        assert watchdog.statistics.timeouts == 1
+        assert watchdog.watched_count == 0
+
+    def test_learned_message_interval(self):
+        """Test timeout is learned from interval between messages."""
+
+        async def run() -> tuple[ConnectionWatchdog, list[float], float]:
+            loop = asyncio.get_running_loop()
+            watchdog = ConnectionWatchdog(
+                timeout_multiple=3, min_timeout_sec=0.001, initial_timeout_sec=0.5
+            )
+            connections = [await _FakeMeters().factory("a")() for _ in range(3)]
+            for connection in connections:
+                watchdog.watch(connection)
+
+            for _ in range(10):
+                for _, protocol in connections:
+                    protocol.data_received(HDLC_FRAME)
+                await asyncio.sleep(0.02)
+            assert all(not protocol.done.done() for _, protocol in connections)
+            time_since_last_message = [
+                protocol.time_since_last_message_sec for _, protocol in connections
+            ]
+
+            start = loop.time()
+            await asyncio.wait([protocol.done for _, protocol in connections])
+            return watchdog, time_since_last_message, loop.time() - start
+
+        watchdog, time_since_last_message, elapsed = asyncio.run(run())
+
+        assert all(0.02 <= time < 0.1 for time in time_since_last_message)
+        assert 0.02 < elapsed < 0.4
+        assert watchdog.statistics.timeouts == 3
+
+    def test_connection_manager_reconnects(self):
+        """Test connection manager reconnects connection closed by watchdog."""
+
+        async def run() -> int:
+            meters = _FakeMeters()
+            manager = ConnectionManager(meters.factory("a"))
+            manager.watchdog = ConnectionWatchdog(initial_timeout_sec=0.01)
+            task = asyncio.create_task(manager.connect_loop())
+            await _wait_for(lambda: len(meters.connections.get("a", [])) >= 2)
+            manager.close()
+            await task
+            return manager.watchdog.statistics.timeouts
+
+        assert asyncio.run(run()) >= 1
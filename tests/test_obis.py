@@ -1,11 +1,13 @@
 """Test obis module."""
 from __future__ import annotations
+from han import obis_map
 from han.obis import OBIS_CODES, Obis, to_obis_tupple
 from han.obis_map import (
     FIELD_METER_DATETIME,
     FIELD_METER_ID,
     FIELD_METER_TYPE,
     FIELD_OBIS_LIST_VER_ID,
+    get_element_name,
     name_obis_map,
 )
 
@@ -42,6 +44,24 @@ class TestObis:
             assert code in defined
 
 
+class TestGetElementName:
+    """Test element name lookup of OBIS codes."""
+
+    def test_known_obis_code(self):
+        """Test name of known OBIS code as string and bytes."""
+        assert get_element_name("1.0.1.7.0.255") == "active_power_import"
+        assert get_element_name(bytes.fromhex("0100010700ff")) == "active_power_import"
+
+    def test_unknown_obis_code_not_cached(self):
+        """Test unknown OBIS code gets group C, D and E as name, and is not cached."""
+        # pylint: disable=protected-access
+        get_element_name("1.1.1.7.0.255")
+
+        assert get_element_name("1.1.99.99.99.255") == "99.99.99"
+        assert "1.1.1.7.0.255" in obis_map._element_names
+        assert "1.1.99.99.99.255" not in obis_map._element_names
+
+
 class TestToTupple:
     """Test obis-to-tupple parsing."""
 
@@ -0,0 +1,130 @@
+"""Streaming tests."""
+# pylint: disable = no-self-use
+from __future__ import annotations
+
+import asyncio
+from asyncio import Queue
+from typing import Any
+
+import pytest
+
+import han
+import tests.test_aidon
+import tests.test_hdlc
+from han.autodecoder import AutoDecoder
+from han.hdlc import HdlcFrameReader
+from han.meter_connection import (
+    MeterTransportProtocol,
+    SmartMeterMessagePayloadProtocol,
+    SmartMeterMessageProtocol,
+)
+from tests.test_meter_connection import _FakeTransport
+
+# pylint: disable=protected-access
+FRAME_NO_LIST_1 = (
+    b"\x7e" + tests.test_hdlc._create_frame(tests.test_aidon.no_list_1) + b"\x7e"
+)
+
+
+class _FakeMeter:
+    """Connection factory creating connections that receive frames and then are lost."""
+
+    def __init__(self, data: bytes, use_payload_protocol: bool = True) -> None:
+        self.connection_count = 0
+        self._data = data
+        self._use_payload_protocol = use_payload_protocol
+
+    async def create(self, queue: Queue[Any]) -> MeterTransportProtocol:
+        self.connection_count += 1
+        protocol_class = (
+            SmartMeterMessagePayloadProtocol
+            if self._use_payload_protocol
+            else SmartMeterMessageProtocol
+        )
+        protocol = protocol_class(queue, [HdlcFrameReader()])
+        transport = _FakeTransport(protocol)
+        protocol.connection_made(transport)
+        loop = asyncio.get_running_loop()
+        loop.call_soon(protocol.data_received, self._data)
+        loop.call_soon(transport.close)
+        return transport, protocol
+
+
+class _FailingOnceDecoder(AutoDecoder):
+    """Decoder failing on first message."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.call_count = 0
+
+    def decode_message_payload(self, payload: bytes) -> Any:
+        self.call_count += 1
+        if self.call_count == 1:
+            raise RuntimeError("Decoder failed")
+        return super().decode_message_payload(payload)
+
+
+async def _take(
+    meter: _FakeMeter, count: int, decoder: AutoDecoder | None = None
+) -> list[dict]:
+    readings = []
+    reading_stream = han.stream(meter.create, decoder)
+    async for reading in reading_stream:
+        readings.append(reading)
+        if len(readings) == count:
+            break
+    await reading_stream.aclose()  # type: ignore
+    return readings
+
+
+class TestStream:
+    """Test stream."""
+
+    @pytest.mark.parametrize("use_payload_protocol", [True, False])
+    def test_decoded_readings(self, use_payload_protocol: bool):
+        """Test readings are decoded from messages or payloads."""
+        meter = _FakeMeter(FRAME_NO_LIST_1 * 2, use_payload_protocol)
+
+        readings = asyncio.run(_take(meter, 2))
+
+        assert len(readings) == 2
+        assert readings[0]["active_power_import"] == 280
+
+    def test_reconnect(self):
+        """Test readings continue after connection is lost."""
+        meter = _FakeMeter(FRAME_NO_LIST_1)
+
+        readings = asyncio.run(_take(meter, 2))
+
+        assert len(readings) == 2
+        assert meter.connection_count == 2
+
+    def test_skip_not_decoded(self):
+        """Test messages that cannot be decoded are skipped."""
+        # pylint: disable=protected-access
+        not_decodable = b"\x7e" + tests.test_hdlc._create_frame(b"\x01\x02") + b"\x7e"
+        meter = _FakeMeter(not_decodable + FRAME_NO_LIST_1)
+
+        readings = asyncio.run(_take(meter, 1))
+
+        assert readings[0]["active_power_import"] == 280
+
+    def test_skip_decoder_error(self):
+        """Test messages making the decoder fail are skipped."""
+        meter = _FakeMeter(FRAME_NO_LIST_1 * 2)
+        decoder = _FailingOnceDecoder()
+
+        readings = asyncio.run(_take(meter, 1, decoder))
+
+        assert readings[0]["active_power_import"] == 280
+        assert decoder.call_count == 2
+
+    def test_invalid_max_pending_messages(self):
+        """Test max pending messages must be positive."""
+
+        async def run() -> None:
+            async for _ in han.stream(_FakeMeter(b"").create, max_pending_messages=0):
+                pass
+
+        with pytest.raises(ValueError):
+            asyncio.run(run())
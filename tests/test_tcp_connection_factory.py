@@ -0,0 +1,202 @@
+"""TCP connection factory tests."""
+# pylint: disable = no-self-use
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+from typing import Any, cast
+
+from han import tcp_connection_factory
+from han.dlde import DataReadout
+from han.hdlc import HdlcFrame
+from han.tcp_connection_factory import TcpMeterServer, create_tcp_meter_server
+from tests.test_meter_connection import HDLC_FRAME, _wait_for
+
+
+async def _create_server(**kwargs: Any) -> tuple[TcpMeterServer, int]:
+    server = await create_tcp_meter_server(None, None, None, "127.0.0.1", 0, **kwargs)
+    port = server.server.sockets[0].getsockname()[1]  # type: ignore
+    return server, port
+
+
+async def _is_closed_by_server(reader: asyncio.StreamReader) -> bool:
+    return await asyncio.wait_for(reader.read(), 2) == b""
+
+
+class TestTcpMeterServer:
+    """Test TcpMeterServer."""
+
+    def test_receive_tagged_messages(self):
+        """Test messages from connections are put on queue tagged with peer host and port."""
+
+        async def run() -> tuple[TcpMeterServer, list[tuple[str, Any]]]:
+            server, port = await _create_server()
+            writers = []
+            for _ in range(3):
+                _, writer = await asyncio.open_connection("127.0.0.1", port)
+                writer.write(HDLC_FRAME * 2)
+                writers.append(writer)
+            await _wait_for(lambda: server.queue.qsize() == 6)
+            assert server.connection_count == 3
+
+            for writer in writers:
+                writer.close()
+            await _wait_for(lambda: server.connection_count == 0)
+            server.close()
+            await server.wait_closed()
+            return server, [server.queue.get_nowait() for _ in range(6)]
+
+        server, messages = asyncio.run(run())
+
+        assert all(peer.startswith("127.0.0.1:") for peer, _ in messages)
+        assert len({peer for peer, _ in messages}) == 3
+        assert all(isinstance(message, HdlcFrame) for _, message in messages)
+        assert server.statistics.accepted_connections == 3
+        assert server.peer_hosts == []
+
+    def test_max_connections(self):
+        """Test new connections are closed when max connections is reached."""
+
+        async def run() -> TcpMeterServer:
+            server, port = await _create_server(max_connections=2)
+            connections = [
+                await asyncio.open_connection("127.0.0.1", port) for _ in range(3)
+            ]
+            assert await _is_closed_by_server(connections[2][0])
+            assert server.connection_count == 2
+
+            server.close()
+            for reader, _ in connections[:2]:
+                assert await _is_closed_by_server(reader)
+            await server.wait_closed()
+            return server
+
+        server = asyncio.run(run())
+
+        assert server.statistics.accepted_connections == 2
+        assert server.statistics.rejected_connections == 1
+
+    def test_max_connections_per_peer(self):
+        """Test oldest connection from peer is closed when peer exceeds max connections."""
+
+        async def run() -> TcpMeterServer:
+            server, port = await _create_server(max_connections_per_peer=1)
+            old_reader, _ = await asyncio.open_connection("127.0.0.1", port)
+            await _wait_for(lambda: server.connection_count == 1)
+            _, new_writer = await asyncio.open_connection("127.0.0.1", port)
+            assert await _is_closed_by_server(old_reader)
+
+            new_writer.write(HDLC_FRAME)
+            await _wait_for(lambda: server.queue.qsize() == 1)
+            assert server.connection_count == 1
+
+            server.close()
+            await server.wait_closed()
+            return server
+
+        server = asyncio.run(run())
+
+        assert server.statistics.accepted_connections == 2
+        assert server.statistics.replaced_connections == 1
+
+    def test_pinned_reader(self):
+        """Test reader selected for peer is used for new connections from peer."""
+
+        async def run() -> tuple[int | None, int | None]:
+            server, port = await _create_server()
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(HDLC_FRAME)
+            await _wait_for(lambda: server.queue.qsize() == 1)
+            writer.close()
+            await _wait_for(lambda: server.connection_count == 0)
+            pinned_reader_index = server.get_pinned_reader_index("127.0.0.1")
+
+            # data not valid for the pinned reader is not used to select another reader
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(b"/ELL5\\253833635_A\r\n\r\n!7945\r\n")
+            writer.write(HDLC_FRAME)
+            await _wait_for(lambda: server.queue.qsize() == 2)
+            server.close()
+            await server.wait_closed()
+            return pinned_reader_index, server.get_pinned_reader_index("127.0.0.1")
+
+        pinned_reader_index, pinned_reader_index_after = asyncio.run(run())
+
+        assert pinned_reader_index == 0
+        assert pinned_reader_index_after == 0
+
+    def test_unpin_reader(self):
+        """Test reader is selected again when pinned reader does not read valid messages."""
+        readout = b"/LGF5E360\r\n\r\n0-0:1.0.0(210106160710W)\r\n!\r\n"
+
+        async def run() -> tuple[TcpMeterServer, int | None, list[tuple[str, Any]]]:
+            server, port = await _create_server()
+            server.unpin_reader_after_bytes = len(readout)
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(HDLC_FRAME)
+            await _wait_for(lambda: server.queue.qsize() == 1)
+            writer.close()
+            await _wait_for(lambda: server.connection_count == 0)
+
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(readout * 2)
+            await _wait_for(lambda: server.statistics.unpinned_readers == 1)
+            writer.write(readout)
+            await _wait_for(lambda: server.queue.qsize() == 2)
+            writer.close()
+            await _wait_for(lambda: server.connection_count == 0)
+            server.close()
+            await server.wait_closed()
+            return (
+                server,
+                server.get_pinned_reader_index("127.0.0.1"),
+                [server.queue.get_nowait() for _ in range(2)],
+            )
+
+        server, pinned_reader_index, messages = asyncio.run(run())
+
+        assert pinned_reader_index == 1
+        assert isinstance(messages[0][1], HdlcFrame)
+        assert isinstance(messages[1][1], DataReadout)
+        assert server.statistics.unpinned_readers == 1
+
+    def test_many_connections(self):
+        """Test many concurrent connections."""
+
+        async def run() -> TcpMeterServer:
+            server, port = await _create_server()
+            connections = await asyncio.gather(
+                *(asyncio.open_connection("127.0.0.1", port) for _ in range(200))
+            )
+            for _, writer in connections:
+                writer.write(HDLC_FRAME)
+            await _wait_for(lambda: server.queue.qsize() == 200, 5)
+            assert server.connection_count == 200
+
+            server.close()
+            await server.wait_closed()
+            for _, writer in connections:
+                writer.close()
+            return server
+
+        server = asyncio.run(run())
+
+        assert server.statistics.accepted_connections == 200
+
+    def test_default_queue_is_bounded(self):
+        """Test default queue is bounded, so the delivery policy can take effect."""
+        server = TcpMeterServer()
+        assert server.queue.maxsize == TcpMeterServer.DEFAULT_MAX_QUEUE_SIZE
+
+    def test_pinned_readers_bounded(self, monkeypatch):
+        """Test reader is only pinned for the most recent peer hosts."""
+        monkeypatch.setattr(tcp_connection_factory, "_MAX_PINNED_READERS", 2)
+        server = TcpMeterServer()
+        for peer_host in ("10.0.0.1", "10.0.0.2", "10.0.0.1", "10.0.0.3"):
+            server.connection_lost(
+                cast(Any, SimpleNamespace(peer_host=peer_host)), reader_index=0
+            )
+
+        assert server.get_pinned_reader_index("10.0.0.1") == 0
+        assert server.get_pinned_reader_index("10.0.0.2") is None
+        assert server.get_pinned_reader_index("10.0.0.3") == 0